@@ -1,42 +1,295 @@
 import requests
 import json
 import logging
-from typing import Dict, Any, Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, Iterable, List, Optional, Union
+from urllib.parse import urlencode, urlparse
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from compression import DEFAULT_MAX_DECODED_BYTES, available_encodings
+from deadline import DeadlineExceeded, DeadlineRetry, current_deadline, propagate
+from hedging import HedgingPolicy
+from json_stream import ListStream
+from telemetry import Telemetry, default_telemetry
+from transports import SnapshotTransport, build_transport
 
 class APIClient:
-    def __init__(self, base_url: str, timeout: int = 30, retry_count: int = 3):
+    def __init__(self, base_url: str, timeout: int = 30, retry_count: int = 3,
+                 hedging: Optional[Dict[str, Any]] = None, circuit_breaker: Optional[Dict[str, Any]] = None,
+                 transport: Union[str, Any] = "requests", transport_options: Optional[Dict[str, Any]] = None,
+                 telemetry: Optional[Telemetry] = None, compression: Optional[Dict[str, Any]] = None,
+                 concurrency: Optional[Dict[str, Any]] = None):
         self.base_url = base_url.rstrip('/')
+        self.base_path = urlparse(self.base_url).path
         self.timeout = timeout
-        self.session = requests.Session()
+        self.host = urlparse(self.base_url).netloc
+        self.telemetry = telemetry or default_telemetry
         
-        # Setup retry strategy
-        retry_strategy = Retry(
+        # Setup circuit breaker shared by all clients of the host (opt-in)
+        self.circuit_breaker = None
+        fail_fast = False
+        if circuit_breaker and circuit_breaker.get("enabled"):
+            fail_fast = circuit_breaker.get("fail_fast", False)
+            self.circuit_breaker = CircuitBreaker.for_host(
+                self.host,
+                failure_threshold=1 if fail_fast else circuit_breaker.get("failure_threshold", 3),
+                reset_timeout=circuit_breaker.get("reset_timeout", 30.0)
+            )
+        
+        # Setup retry strategy; fail-fast mode does not retry connection errors and
+        # no retry is attempted without time left in the active deadline
+        retry_strategy = DeadlineRetry(
             total=retry_count,
+            connect=0 if fail_fast else None,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        
+        # Setup compression negotiation (opt-in); only encodings we can decode are offered
+        self.compression = None
+        if compression and compression.get("enabled"):
+            self.compression = {
+                "encodings": available_encodings(compression.get("encodings")),
+                "max_decoded_bytes": compression.get("max_decoded_bytes", DEFAULT_MAX_DECODED_BYTES)
+            }
+        
+        # Setup concurrent mode (opt-in): one session per thread over a shared connection pool
+        self.thread_local = bool(concurrency and concurrency.get("enabled"))
+        self.workers = (concurrency or {}).get("workers", 8)
+        
+        # Setup transport; a name from config.json or a ready-made transport object
+        if isinstance(transport, str):
+            transport = build_transport(transport, retry_strategy, compression=self.compression,
+                                        thread_local=self.thread_local, **(transport_options or {}))
+        self.transport = transport
+        
+        # Setup hedging for idempotent GETs (opt-in)
+        self.hedging = None
+        if hedging and hedging.get("enabled"):
+            self.hedging = {key: value for key, value in hedging.items() if key != "enabled"}
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
     
+    @staticmethod
+    def options_from_config(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build APIClient keyword arguments from a loaded config.json"""
+        transport = config.get("transport", "requests")
+        transport_options = config.get("transport_options")
+        # The snapshot transport reads the store the snapshot tool writes unless told otherwise
+        if transport == SnapshotTransport.name and "path" in config.get("snapshot", {}):
+            transport_options = {"path": config["snapshot"]["path"], **(transport_options or {})}
+        return {
+            "base_url": config["base_url"],
+            "timeout": config["timeout"],
+            "retry_count": config["retry_count"],
+            "hedging": config.get("hedging"),
+            "circuit_breaker": config.get("circuit_breaker"),
+            "transport": transport,
+            "transport_options": transport_options,
+            "compression": config.get("compression"),
+            "concurrency": config.get("concurrency")
+        }
+    
+    @property
+    def session(self) -> Optional[requests.Session]:
+        """The calling thread's requests.Session, if the transport has one"""
+        return getattr(self.transport, "session", None)
+    
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any], workers: Optional[int] = None) -> List[Any]:
+        """Call fn on every item from a thread pool and return the results in order.
+        
+        fn may use this client freely; in concurrent mode every worker thread
+        gets its own session. The first exception raised by fn is re-raised.
+        """
+        items = list(items)
+        self.telemetry.increment("concurrent.tasks", len(items))
+        with ThreadPoolExecutor(max_workers=workers or self.workers, thread_name_prefix="api-client") as executor:
+            return list(executor.map(propagate(fn), items))
+    
     def get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
+        return self.get_url(f"{self.base_url}{endpoint}", params=params)
+    
+    def get_url(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """GET an absolute URL, e.g. a link taken from a response payload"""
         self.logger.info(f"GET request to: {url}")
         
-        response = self.session.get(url, params=params, timeout=self.timeout)
+        response = self._send("GET", url, params=params)
+        self.logger.info(f"Response status: {response.status_code}")
+        return response
+    
+    def get_stream(self, endpoint: str, params: Optional[Dict] = None, items_key: str = "results") -> ListStream:
+        return self.stream_url(f"{self.base_url}{endpoint}", params=params, items_key=items_key)
+    
+    def stream_url(self, url: str, params: Optional[Dict] = None, items_key: str = "results") -> ListStream:
+        """GET a JSON list and parse its items as the body arrives instead of buffering it"""
+        self.logger.info(f"GET (streamed) request to: {url}")
+        
+        response = self._send("GET", url, stream=True, params=params)
         self.logger.info(f"Response status: {response.status_code}")
+        return ListStream(response, response.body_chunks, items_key,
+                          on_complete=lambda decoded_bytes: self._record_bytes(url, response, decoded_bytes))
+    
+    def close(self):
+        """Release the transport's connections"""
+        self.transport.close()
+    
+    def circuit_open_reason(self) -> Optional[str]:
+        """Return why requests to this client's host fail fast, or None"""
+        return CircuitBreaker.open_reason(self.host)
+    
+    def _send(self, method: str, url: str, stream: bool = False, **kwargs) -> requests.Response:
+        """Send a request, tracking the outcome in the host's circuit breaker"""
+        # Shrink the timeout to the time left in the active deadline; a spent deadline is
+        # refused before the circuit breaker hands this request its half-open probe
+        timeout = self.timeout
+        deadline = current_deadline()
+        if deadline:
+            try:
+                timeout = deadline.timeout(self.timeout)
+            except DeadlineExceeded:
+                self.telemetry.increment("deadline.exceeded")
+                raise
+        
+        probe = False
+        if self.circuit_breaker:
+            try:
+                probe = self.circuit_breaker.before_request()
+            except CircuitOpenError:
+                self.telemetry.increment("circuit.rejected")
+                raise
+        
+        # A half-open probe that ends in any other exception must not keep the host's circuit wedged
+        try:
+            return self._send_tracked(method, url, stream, timeout, **kwargs)
+        finally:
+            if probe:
+                self.circuit_breaker.release_probe()
+    
+    def _send_tracked(self, method: str, url: str, stream: bool, timeout: float, **kwargs) -> requests.Response:
+        """Send a request once the circuit breaker let it through and record its outcome"""
+        self.telemetry.increment("requests")
+        if method == "GET":
+            path = self.relative_path(url, kwargs.get("params"))
+            if path:
+                self.telemetry.record_path(path)
+        try:
+            if stream:
+                response = self._open_stream(method, url, timeout, **kwargs)
+            elif method == "GET" and self.hedging:
+                response = self._hedged_get(url, kwargs.get("params"), timeout)
+            else:
+                response = self.transport.request(method, url, timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException as e:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(f"{type(e).__name__}: {e}")
+                self.telemetry.increment("circuit.failures")
+            raise
+        
+        if self.circuit_breaker:
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure(f"HTTP {response.status_code}")
+                self.telemetry.increment("circuit.failures")
+            else:
+                self.circuit_breaker.record_success()
+        if not stream:
+            self._record_bytes(url, response)
+        return response
+    
+    def _open_stream(self, method: str, url: str, timeout: float, **kwargs):
+        """Send a request whose body is read later from response.body_chunks"""
+        if hasattr(self.transport, "stream"):
+            response, chunks = self.transport.stream(method, url, timeout=timeout, **kwargs)
+        else:
+            # Transports without streaming deliver the whole body as one chunk
+            response = self.transport.request(method, url, timeout=timeout, **kwargs)
+            chunks = [response.content]
+        response.body_chunks = chunks
         return response
     
+    def endpoint_key(self, url: str) -> str:
+        """Telemetry key for a URL: the resource path with the ID or name collapsed"""
+        path = urlparse(url).path
+        if path.startswith(self.base_path):
+            path = path[len(self.base_path):]
+        segments = [segment for segment in path.split("/") if segment]
+        return "/" + "/".join("{id}" if index == 1 else segment for index, segment in enumerate(segments))
+    
+    def relative_path(self, url: str, params: Optional[Dict] = None) -> Optional[str]:
+        """Path and query of a URL under this client's base URL, or None for other hosts"""
+        if not url.startswith(self.base_url):
+            return None
+        path = url[len(self.base_url):] or "/"
+        if params:
+            path += ("&" if "?" in path else "?") + urlencode(params)
+        return path
+    
+    def _record_bytes(self, url: str, response: requests.Response, decoded_bytes: Optional[int] = None):
+        """Record body bytes on the wire and after decoding for the endpoint"""
+        if decoded_bytes is None:
+            decoded_bytes = len(response.content)
+        wire_bytes = getattr(response, "wire_bytes", None)
+        values = {"decoded_bytes": decoded_bytes}
+        self.telemetry.increment("bytes.decoded", decoded_bytes)
+        if wire_bytes is not None:
+            values["wire_bytes"] = wire_bytes
+            self.telemetry.increment("bytes.wire", wire_bytes)
+            encoding = response.headers.get("Content-Encoding") or "identity"
+            self.telemetry.increment(f"encoding.{encoding}")
+        self.telemetry.record(self.endpoint_key(url), **values)
+    
+    def hedging_policy(self, url: str) -> HedgingPolicy:
+        """Hedging policy for the endpoint a URL belongs to, shared across clients"""
+        return HedgingPolicy.for_endpoint(self.host, self.endpoint_key(url), **self.hedging)
+    
+    def _hedged_get(self, url: str, params: Optional[Dict], timeout: float) -> requests.Response:
+        """Send a GET and fire one identical hedge if it outlives the tail latency"""
+        executor = HedgingPolicy.executor()
+        policy = self.hedging_policy(url)
+        delay = policy.delay()
+        start_time = time.perf_counter()
+        send = propagate(self.transport.request)
+        
+        primary = executor.submit(send, "GET", url, timeout=timeout, params=params)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            response = primary.result()
+        else:
+            self.logger.info(f"Hedging GET {url} after {delay:.3f}s")
+            self.telemetry.increment("hedge.fired")
+            hedge = executor.submit(send, "GET", url, timeout=timeout, params=params)
+            done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+            winner = primary if primary in done else hedge
+            loser = hedge if winner is primary else primary
+            
+            # A failed attempt only wins if the other one fails as well
+            if winner.exception() is not None:
+                wait([loser])
+                if loser.exception() is None:
+                    winner, loser = loser, winner
+            
+            if winner is hedge:
+                self.telemetry.increment("hedge.won")
+            if loser.cancel():
+                self.telemetry.increment("hedge.cancelled")
+            else:
+                loser.add_done_callback(self._discard_response)
+            response = winner.result()
+        
+        policy.observe(time.perf_counter() - start_time)
+        return response
+    
+    @staticmethod
+    def _discard_response(future):
+        """Release the connection held by the losing attempt"""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+    
     def post(self, endpoint: str, data: Optional[Dict] = None, json_data: Optional[Dict] = None) -> requests.Response:
         url = f"{self.base_url}{endpoint}"
         self.logger.info(f"POST request to: {url}")
         
-        response = self.session.post(url, data=data, json=json_data, timeout=self.timeout)
+        response = self._send("POST", url, data=data, json=json_data)
         self.logger.info(f"Response status: {response.status_code}")
         return response
     
@@ -44,7 +297,7 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
         self.logger.info(f"PUT request to: {url}")
         
-        response = self.session.put(url, data=data, json=json_data, timeout=self.timeout)
+        response = self._send("PUT", url, data=data, json=json_data)
         self.logger.info(f"Response status: {response.status_code}")
         return response
     
@@ -52,6 +305,6 @@ class APIClient:
         url = f"{self.base_url}{endpoint}"
         self.logger.info(f"DELETE request to: {url}")
         
-        response = self.session.delete(url, timeout=self.timeout)
+        response = self._send("DELETE", url)
         self.logger.info(f"Response status: {response.status_code}")
         return response
\ No newline at end of file
@@ -1,19 +1,28 @@
 from api_client import APIClient
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 class PokemonAPICollection:
-    def __init__(self, config_path: str = "config.json"):
+    _shared: Dict[Tuple[str, Optional[str]], "PokemonAPICollection"] = {}
+    
+    def __init__(self, config_path: str = "config.json", base_url: Optional[str] = None):
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        self.client = APIClient(
-            base_url=self.config["base_url"],
-            timeout=self.config["timeout"],
-            retry_count=self.config["retry_count"]
-        )
+        # base_url points the client elsewhere (e.g. a fault proxy); config keeps the real target
+        options = APIClient.options_from_config(self.config)
+        options["base_url"] = base_url or options["base_url"]
+        self.client = APIClient(**options)
         self.endpoints = self.config["endpoints"]
     
+    @classmethod
+    def shared(cls, config_path: str = "config.json", base_url: Optional[str] = None) -> "PokemonAPICollection":
+        """Collection reused by every page object, keeping its connection pool warm"""
+        key = (config_path, base_url)
+        if key not in cls._shared:
+            cls._shared[key] = cls(config_path, base_url)
+        return cls._shared[key]
+    
     def get_pokemon_by_id(self, pokemon_id: int):
         """Get Pokemon by ID"""
         endpoint = f"{self.endpoints['pokemon']}{pokemon_id}"
@@ -24,10 +33,12 @@ class PokemonAPICollection:
         endpoint = f"{self.endpoints['pokemon']}{pokemon_name}"
         return self.client.get(endpoint)
     
-    def get_pokemon_list(self, limit: int = 20, offset: int = 0):
-        """Get Pokemon list with pagination"""
+    def get_pokemon_list(self, limit: int = 20, offset: int = 0, stream: bool = False):
+        """Get Pokemon list with pagination; stream=True returns a ListStream of the results"""
         endpoint = self.endpoints['pokemon']
         params = {"limit": limit, "offset": offset}
+        if stream:
+            return self.client.get_stream(endpoint, params=params)
         return self.client.get(endpoint, params=params)
     
     def get_ability(self, identifier: str):
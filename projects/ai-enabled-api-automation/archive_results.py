@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test Results Archive
+Compacts each run's results into one columnar file and queries many runs at once
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from results_archive import ArchivedRun, archive_paths, collect_run, query, write_parquet, write_rcol
+
+def export(args):
+    """Archive the current run"""
+    columns, info = collect_run(args.results, args.metrics, args.pytest_report, args.test_cases,
+                                whole_directory=args.all)
+    if not info["rows"]:
+        print("❌ No results found for this run")
+        return 1
+    
+    run = args.run_id or datetime.fromtimestamp(info["started"]).strftime("%Y%m%d-%H%M%S")
+    os.makedirs(args.archive_dir, exist_ok=True)
+    path = os.path.join(args.archive_dir, f"{run}.{args.format}")
+    if args.format == "parquet":
+        write_parquet(path, columns, run)
+    else:
+        write_rcol(path, columns, run)
+    print(f"📦 Archived {info['rows']} results of run {run} to {path} ({os.path.getsize(path):,} bytes)")
+    return 0
+
+def select_runs(args):
+    """Archive files chosen by --run and --last"""
+    paths = archive_paths(args.archive_dir)
+    if args.run:
+        wanted = set(args.run)
+        paths = [path for path in paths if os.path.splitext(os.path.basename(path))[0] in wanted]
+    if args.last:
+        paths = paths[-args.last:]
+    return paths
+
+def format_value(value):
+    if isinstance(value, float):
+        return f"{value:.0f}" if value.is_integer() else f"{value:.4g}"
+    return "-" if value is None else str(value)
+
+def print_table(rows, columns):
+    """Print rows as aligned columns"""
+    cells = [[format_value(row.get(column)) for column in columns] for row in rows]
+    widths = [max([len(column)] + [len(line[index]) for line in cells]) for index, column in enumerate(columns)]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for line in cells:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)))
+
+def run_query(args):
+    """Filter and aggregate rows across the selected runs"""
+    paths = select_runs(args)
+    if not paths:
+        print(f"❌ No archived runs in {args.archive_dir}")
+        return 1
+    
+    group_by = [name for name in (args.group_by or "").split(",") if name]
+    aggregates = args.agg or ["count"]
+    start_time = time.time()
+    rows = query(paths, args.where or [], group_by, aggregates)
+    elapsed = time.time() - start_time
+    
+    if args.sort:
+        rows.sort(key=lambda row: (row.get(args.sort) is None, row.get(args.sort)), reverse=args.desc)
+    elif group_by:
+        rows.sort(key=lambda row: [str(row[name]) for name in group_by])
+    if args.limit:
+        rows = rows[:args.limit]
+    
+    columns = group_by + aggregates
+    if args.output == "json":
+        print(json.dumps(rows, indent=2))
+    elif args.output == "csv":
+        writer = csv.DictWriter(sys.stdout, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print_table(rows, columns)
+        print(f"\n🔎 {len(paths)} runs queried in {elapsed:.2f}s")
+    return 0
+
+def list_runs(args):
+    """List archived runs (reads only file headers)"""
+    paths = select_runs(args)
+    for path in paths:
+        run = ArchivedRun(path)
+        created = datetime.fromtimestamp(run.created).strftime("%Y-%m-%d %H:%M")
+        print(f"   {run.run:<20} {run.rows:>8,} rows  {os.path.getsize(path):>10,} bytes  archived {created}")
+    print(f"📊 {len(paths)} runs in {args.archive_dir}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar archive of test results")
+    parser.add_argument("--archive-dir", default="reports/archive", help="Where archived runs are kept")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    exporter = commands.add_parser("export", help="Archive the results of the last run")
+    exporter.add_argument("--results", default="reports/allure-results", help="Allure results directory")
+    exporter.add_argument("--test-cases", help="Read an Allure report's data/test-cases directory instead")
+    exporter.add_argument("--pytest-report", default="reports/report.json", help="pytest-json-report file")
+    exporter.add_argument("--metrics", default="reports/test_metrics.json", help="Run metrics from environment.py")
+    exporter.add_argument("--all", action="store_true",
+                          help="Take every Allure result, not only those inside the run's time window")
+    exporter.add_argument("--run-id", help="Run name (default: the run's start time)")
+    exporter.add_argument("--format", choices=["rcol", "parquet"], default="rcol",
+                          help="Archive format (parquet needs pyarrow)")
+    
+    for name, help_text in (("query", "Filter and aggregate archived runs"), ("runs", "List archived runs")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--run", action="append", help="Only this run (repeatable)")
+        command.add_argument("--last", type=int, help="Only the last N runs")
+        if name == "query":
+            command.add_argument("--where", action="append",
+                                 help="Filter like status=failed, duration>1.5 or tags~smoke (repeatable)")
+            command.add_argument("--group-by", help="Comma-separated columns, e.g. run,feature")
+            command.add_argument("--agg", action="append",
+                                 help="count or function:column with sum, mean, min, max, p50, p95... (repeatable)")
+            command.add_argument("--sort", help="Column to sort by, e.g. count or p95:duration")
+            command.add_argument("--desc", action="store_true", help="Sort in descending order")
+            command.add_argument("--limit", type=int, help="Show at most N rows")
+            command.add_argument("--output", choices=["table", "json", "csv"], default="table")
+    
+    args = parser.parse_args()
+    if args.command == "export":
+        return export(args)
+    if args.command == "runs":
+        return list_runs(args)
+    return run_query(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Framework Micro-Benchmarks
+Times the framework's own hot paths against recorded payloads, without network
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from reusable_functions import ReusableFunctions
+from schemas import POKEMON_SCHEMA, ABILITY_SCHEMA, POKEMON_LIST_SCHEMA
+from test_utils import TestUtils
+from utils.bdd_utils import BDDUtils
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+POKEMON_SIZES = ["small", "medium", "large"]
+
+def load_fixture(name):
+    """Raw bytes of a recorded payload"""
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+def make_response(body, status_code=200):
+    """Build a requests.Response around a recorded body"""
+    response = requests.Response()
+    response._content = body
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json; charset=utf-8"
+    response.elapsed = datetime.timedelta(milliseconds=120)
+    return response
+
+def make_metrics(scenarios):
+    """Metrics in the shape features/environment.py collects them"""
+    return {
+        "scenarios": [
+            {"name": f"Scenario {i}", "status": "passed", "duration": 0.25,
+             "tags": ["smoke", "validation"], "feature": "Pokemon API Testing"}
+            for i in range(scenarios)
+        ],
+        "performance_data": [
+            {"scenario": f"Scenario {i}", "response_time": 0.12, "status_code": 200}
+            for i in range(scenarios)
+        ],
+        "start_time": 0.0,
+        "end_time": 1.0
+    }
+
+def build_benchmarks(metrics_dir):
+    """Return (name, size label, payload bytes, callable) for every benchmark"""
+    bdd_utils = BDDUtils()
+    bdd_utils.logger.disabled = True
+    required_fields = ["id", "name", "height", "weight", "types", "abilities", "stats"]
+    benchmarks = []
+    
+    for size in POKEMON_SIZES:
+        body = load_fixture(f"pokemon_{size}.json")
+        data = json.loads(body)
+        response = make_response(body)
+        benchmarks += [
+            ("json.loads", size, len(body), lambda body=body: json.loads(body)),
+            ("response.json", size, len(body), lambda body=body: make_response(body).json()),
+            ("TestUtils.validate_json_schema", size, len(body),
+             lambda data=data: TestUtils.validate_json_schema(data, POKEMON_SCHEMA)),
+            ("TestUtils.validate_required_fields", size, len(body),
+             lambda data=data: TestUtils.validate_required_fields(data, required_fields)),
+            ("TestUtils.extract_field_value", size, len(body),
+             lambda data=data: TestUtils.extract_field_value(data, "sprites.other.official-artwork.front_default")),
+            ("BDDUtils.validate_schema", size, len(body),
+             lambda data=data: bdd_utils.validate_schema(data, POKEMON_SCHEMA)),
+            ("BDDUtils.validate_json_structure", size, len(body),
+             lambda body=body: bdd_utils.validate_json_structure(make_response(body))),
+            ("BDDUtils.log_response_details", size, len(body),
+             lambda response=response: bdd_utils.log_response_details(response, "pokemon/25")),
+            ("ReusableFunctions.format_pokemon_data", size, len(body),
+             lambda data=data: ReusableFunctions.format_pokemon_data(data)),
+            ("ReusableFunctions.extract_nested_value", size, len(body),
+             lambda data=data: ReusableFunctions.extract_nested_value(data, "species.name")),
+            ("BDDUtils.build_response_attachments", size, len(body),
+             lambda body=body: BDDUtils.build_response_attachments(make_response(body))),
+        ]
+    
+    for name, schema in (("pokemon_list", POKEMON_LIST_SCHEMA), ("ability", ABILITY_SCHEMA)):
+        body = load_fixture(f"{name}.json")
+        data = json.loads(body)
+        benchmarks.append(("TestUtils.validate_json_schema", name, len(body),
+                           lambda data=data, schema=schema: TestUtils.validate_json_schema(data, schema)))
+    
+    for scenarios in (10, 100, 1000):
+        metrics = make_metrics(scenarios)
+        metrics_file = os.path.join(metrics_dir, f"metrics_{scenarios}.json")
+        benchmarks.append(("BDDUtils.save_metrics", f"{scenarios} scenarios", len(json.dumps(metrics)),
+                           lambda metrics=metrics, path=metrics_file: BDDUtils.save_metrics(metrics, path)))
+    return benchmarks
+
+def time_benchmark(func, repeat=5, min_time=0.2):
+    """Per-call timings in seconds: autorange the loop count, then keep each repeat"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    timings = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"min": min(timings), "median": statistics.median(timings), "loops": number}
+
+def compare(results, baseline, threshold):
+    """Return the benchmarks whose best time regressed past the threshold"""
+    previous = {(row["name"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["name"], row["size"]))
+        if old:
+            row["change"] = row["min"] / old["min"] - 1
+            if row["change"] > threshold:
+                regressions.append(row)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark the framework's hot paths offline")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per repeat")
+    parser.add_argument("--output", default="reports/benchmarks/micro_benchmarks.json", help="JSON results file")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                       help="Allowed slowdown against the baseline before failing (0.15 = 15%%)")
+    
+    args = parser.parse_args()
+    
+    results = []
+    with tempfile.TemporaryDirectory() as metrics_dir:
+        for name, size, payload_bytes, func in build_benchmarks(metrics_dir):
+            if args.filter and args.filter not in name:
+                continue
+            timing = time_benchmark(func, args.repeat, args.min_time)
+            results.append({"name": name, "size": size, "bytes": payload_bytes, **timing})
+            print(f"   {name:<40} {size:<16} {timing['min'] * 1e6:>12,.1f} µs")
+    
+    regressions = []
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        print(f"\n📊 Compared with {args.compare}:")
+        for row in results:
+            if "change" in row:
+                marker = "❌" if row in regressions else "✅"
+                print(f"   {marker} {row['name']:<40} {row['size']:<16} {row['change']:+7.1%}")
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({
+            "timestamp": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results
+        }, f, indent=2)
+    print(f"\n📁 Results saved to {args.output}")
+    
+    if regressions:
+        print(f"❌ {len(regressions)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Transport Benchmark
+Compares the HTTP/1.1 requests transport with the HTTP/2 transport under concurrency
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api_client import APIClient
+from telemetry import Telemetry
+
+def count_open_sockets():
+    """Count sockets held by this process (Linux only, None elsewhere)"""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return None
+    count = 0
+    for fd in os.listdir(fd_dir):
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+def percentile(values, pct):
+    """Return the pct-th percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+def run_transport(transport, config, endpoints, total_requests, concurrency):
+    """Fire total_requests GETs through one transport and collect latency stats"""
+    options = APIClient.options_from_config(config)
+    options.update(transport=transport, hedging=None, telemetry=Telemetry())
+    client = APIClient(**options)
+    sockets_before = count_open_sockets()
+    peak_sockets = [0]
+    
+    def fetch(index):
+        start_time = time.perf_counter()
+        response = client.get(endpoints[index % len(endpoints)])
+        latency = time.perf_counter() - start_time
+        if sockets_before is not None:
+            peak_sockets[0] = max(peak_sockets[0], count_open_sockets() - sockets_before)
+        return response.status_code, latency
+    
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, range(total_requests)))
+    wall_time = time.perf_counter() - start_time
+    client.close()
+    
+    latencies = [latency for _, latency in results]
+    return {
+        "transport": transport,
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for status, _ in results if status >= 400),
+        "wall_time": wall_time,
+        "throughput_rps": total_requests / wall_time,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "peak_sockets": None if sockets_before is None else peak_sockets[0]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/1.1 vs HTTP/2 transport benchmark")
+    parser.add_argument("--config", default="config.json", help="Config file with base_url and endpoints")
+    parser.add_argument("--base-url", help="Override base_url (e.g. a local stand-in of the API)")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests per transport")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent requests in flight")
+    parser.add_argument("--transports", nargs="+", default=["requests", "http2"], help="Transports to compare")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    
+    args = parser.parse_args()
+    
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    if args.base_url:
+        config["base_url"] = args.base_url
+    
+    endpoints = [f"{config['endpoints']['pokemon']}{pokemon_id}" for pokemon_id in range(1, 21)]
+    
+    print(f"⚡ Benchmarking {args.requests} requests x {args.concurrency} concurrent against {config['base_url']}")
+    results = []
+    for transport in args.transports:
+        try:
+            result = run_transport(transport, config, endpoints, args.requests, args.concurrency)
+        except ImportError as e:
+            print(f"⚠️ Skipping {transport}: {e}")
+            continue
+        results.append(result)
+        print(f"   {transport:<10} {result['throughput_rps']:8.1f} req/s  "
+              f"p50 {result['p50'] * 1000:7.1f}ms  p99 {result['p99'] * 1000:7.1f}ms  "
+              f"peak sockets {result['peak_sockets']}  errors {result['errors']}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Native HTML Report Builder
+Builds a static report from Allure results, JUnit files and test metrics without the Allure CLI
+"""
+
+import argparse
+import os
+import sys
+import time
+import webbrowser
+from native_report import default_junit_paths, update_report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the HTML report without the Allure CLI")
+    parser.add_argument("--results", default="reports/allure-results", help="Allure results directory")
+    parser.add_argument("--junit", action="append",
+                        help="JUnit XML file (repeatable, default: reports/*.xml and reports/junit/)")
+    parser.add_argument("--metrics", default="reports/test_metrics.json", help="Run metrics from environment.py")
+    parser.add_argument("--output", default="reports/native-report", help="Report directory")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-read every result file instead of only new or changed ones")
+    parser.add_argument("--open", action="store_true", help="Open the report in the default browser")
+    
+    args = parser.parse_args(argv)
+    
+    print("📈 Building native HTML report...")
+    start_time = time.time()
+    index_path, data = update_report(args.results, args.junit or default_junit_paths(), args.metrics, args.output,
+                                     full=args.full)
+    changes = data.changes
+    print(f"   {changes['new']} new, {changes['changed']} changed, {changes['removed']} removed result files; "
+          f"{changes['pages']} feature pages rewritten")
+    print(f"✅ Report written to {index_path} in {time.time() - start_time:.2f}s")
+    
+    if args.open:
+        webbrowser.open(f"file://{os.path.abspath(index_path)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,153 @@
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from jsonschema import Draft7Validator
+from schemas import SCHEMAS
+
+# (schema name, payload key, raw JSON body)
+Payload = Tuple[str, str, bytes]
+
+# Built once per worker process by _init_worker
+_validators: Dict[str, Draft7Validator] = {}
+
+
+def _init_worker():
+    """Pre-build one validator per schema in each worker process"""
+    global _validators
+    _validators = {name: Draft7Validator(schema) for name, schema in SCHEMAS.items()}
+
+
+def _validate_chunk(chunk: List[Payload]) -> Tuple[int, List[Tuple[str, str, str, str]]]:
+    """Decode and validate a chunk, returning (count, [(schema, schema path, key, message)])"""
+    errors = []
+    for schema_name, key, body in chunk:
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            errors.append((schema_name, "<json>", key, f"Invalid JSON: {e}"))
+            continue
+        for error in _validators[schema_name].iter_errors(data):
+            schema_path = "/".join(str(part) for part in error.absolute_schema_path) or "<root>"
+            errors.append((schema_name, schema_path, key, error.message))
+    return len(chunk), errors
+
+
+class BulkValidationReport:
+    """Every validation error of a run, grouped by schema and schema path.
+    
+    Payloads that could not be fetched (non-200 responses) are counted by
+    status apart from schema errors, since an error body says nothing about
+    whether the resource matches its schema.
+    """
+    
+    def __init__(self, max_examples: int = 3):
+        self.max_examples = max_examples
+        self.validated = 0
+        self.invalid_payloads = set()
+        self.counts = Counter()
+        self.examples: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+        self.fetch_errors = Counter()
+        self.fetch_examples: Dict[int, List[str]] = {}
+    
+    def add(self, validated: int, errors: Iterable[Tuple[str, str, str, str]]):
+        self.validated += validated
+        for schema_name, schema_path, key, message in errors:
+            group = (schema_name, schema_path)
+            self.counts[group] += 1
+            self.invalid_payloads.add(key)
+            examples = self.examples.setdefault(group, [])
+            if len(examples) < self.max_examples:
+                examples.append({"payload": key, "message": message})
+    
+    def add_fetch_error(self, key: str, status_code: int):
+        """Record a payload that was not validated because its fetch failed"""
+        self.fetch_errors[status_code] += 1
+        examples = self.fetch_examples.setdefault(status_code, [])
+        if len(examples) < self.max_examples:
+            examples.append(key)
+    
+    @property
+    def passed(self) -> bool:
+        return not self.counts and not self.fetch_errors
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "validated": self.validated,
+            "invalid_payloads": len(self.invalid_payloads),
+            "errors": [
+                {"schema": schema_name, "schema_path": schema_path, "count": count,
+                 "examples": self.examples[(schema_name, schema_path)]}
+                for (schema_name, schema_path), count in self.counts.most_common()
+            ],
+            "fetch_errors": [
+                {"status": status_code, "count": count, "examples": self.fetch_examples[status_code]}
+                for status_code, count in self.fetch_errors.most_common()
+            ]
+        }
+
+
+def validate_payloads(payloads: Iterable[Payload], workers: Optional[int] = None, chunk_size: int = 200,
+                      report: Optional[BulkValidationReport] = None) -> BulkValidationReport:
+    """Validate a stream of payloads across a process pool and aggregate every error.
+    
+    At most two chunks per worker are in flight, so the stream is never
+    materialized and memory stays flat however many payloads there are.
+    """
+    workers = workers or os.cpu_count() or 1
+    report = report or BulkValidationReport()
+    payloads = iter(payloads)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        in_flight = set()
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(payloads, chunk_size))
+                if not chunk:
+                    break
+                in_flight.add(pool.submit(_validate_chunk, chunk))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                report.add(*future.result())
+    return report
+
+
+def payloads_from_jsonl(path: str, schema_name: str) -> Iterator[Payload]:
+    """Stream payloads from a JSON-lines file, one document per line"""
+    with open(path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield schema_name, f"{path}:{line_number}", line
+
+
+def payloads_from_directory(directory: str, schema_name: str) -> Iterator[Payload]:
+    """Stream payloads from every *.json file in a directory"""
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith(".json"):
+            path = os.path.join(directory, file_name)
+            with open(path, 'rb') as f:
+                yield schema_name, path, f.read()
+
+
+def payloads_from_snapshot(store, resources: Optional[Iterable[str]] = None) -> Iterator[Payload]:
+    """Stream every snapshot resource that has a schema"""
+    resources = set(resources or SCHEMAS)
+    for resource, resource_id, body in store.iter_bodies():
+        schema_name = resource.replace("-", "_")
+        if schema_name in resources and schema_name in SCHEMAS:
+            yield schema_name, f"{resource}/{resource_id}", body
+
+
+def payloads_from_client(client, entries: Iterable[Any], schema_name: str,
+                         report: Optional[BulkValidationReport] = None) -> Iterator[Payload]:
+    """Stream payloads fetched live for catalog entries, recording non-200 responses on report"""
+    for entry in entries:
+        response = client.get_url(entry.url)
+        if response.status_code != 200:
+            if report is not None:
+                report.add_fetch_error(entry.url, response.status_code)
+            continue
+        yield schema_name, entry.url, response.content
\ No newline at end of file
@@ -0,0 +1,140 @@
+import os
+import random
+import zlib
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional
+
+# Outside features/ so full and per-feature behave runs never pick generated scenarios up
+CATALOG_FEATURE = "generated/catalog_pokemon.feature"
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    name: str
+    url: str
+
+
+class CatalogSource:
+    """Streams every entry of a paginated resource listing, one page at a time.
+    
+    With stream each page's results are parsed as the body arrives, so a
+    large page_size pulls the whole collection in one request without
+    buffering it.
+    """
+    
+    def __init__(self, client, endpoint: str, page_size: int = 200, stream: bool = False):
+        self.client = client
+        self.endpoint = endpoint
+        self.page_size = page_size
+        self.stream = stream
+    
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        if self.stream:
+            yield from self._streamed()
+            return
+        response = self.client.get(self.endpoint, params={"limit": self.page_size, "offset": 0})
+        while True:
+            response.raise_for_status()
+            data = response.json()
+            for result in data["results"]:
+                yield self._entry(result)
+            if not data.get("next"):
+                return
+            response = self.client.get_url(data["next"])
+    
+    def _streamed(self) -> Iterator[CatalogEntry]:
+        listing = self.client.get_stream(self.endpoint, params={"limit": self.page_size, "offset": 0})
+        while True:
+            listing.response.raise_for_status()
+            try:
+                for result in listing:
+                    yield self._entry(result)
+            finally:
+                listing.close()
+            if not listing.next:
+                return
+            listing = self.client.stream_url(listing.next)
+    
+    @staticmethod
+    def _entry(result: Dict[str, Any]) -> CatalogEntry:
+        resource_id = int(result["url"].rstrip('/').split('/')[-1])
+        return CatalogEntry(resource_id, result["name"], result["url"])
+
+
+def shard(entries: Iterable[CatalogEntry], index: int, count: int) -> Iterator[CatalogEntry]:
+    """Keep the entries owned by one worker; stable across processes and runs"""
+    for entry in entries:
+        if count <= 1 or zlib.crc32(str(entry.id).encode()) % count == index:
+            yield entry
+
+
+def stratified_sample(entries: Iterable[CatalogEntry], per_stratum: int,
+                      stratum: Callable[[CatalogEntry], Any], seed: int = 0) -> Iterator[CatalogEntry]:
+    """Reservoir-sample up to per_stratum entries from each stratum in a single pass"""
+    rng = random.Random(seed)
+    reservoirs: Dict[Any, list] = {}
+    seen: Dict[Any, int] = {}
+    for entry in entries:
+        key = stratum(entry)
+        seen[key] = seen.get(key, 0) + 1
+        reservoir = reservoirs.setdefault(key, [])
+        if len(reservoir) < per_stratum:
+            reservoir.append(entry)
+        else:
+            slot = rng.randrange(seen[key])
+            if slot < per_stratum:
+                reservoir[slot] = entry
+    for key in sorted(reservoirs):
+        yield from sorted(reservoirs[key])
+
+
+def catalog_cases(client, config: Dict[str, Any], shard_index: Optional[int] = None,
+                  shard_count: Optional[int] = None, sample_per_stratum: Optional[int] = None,
+                  max_cases: Optional[int] = None) -> Iterator[CatalogEntry]:
+    """Lazily build the catalog cases for this worker from config.json["catalog"].
+    
+    Arguments override config; the shard also falls back to the
+    CATALOG_SHARD_INDEX / CATALOG_SHARD_COUNT environment variables.
+    """
+    catalog_config = config.get("catalog", {})
+    endpoint = config["endpoints"][catalog_config.get("endpoint", "pokemon")]
+    if shard_index is None:
+        shard_index = int(os.environ.get("CATALOG_SHARD_INDEX", 0))
+    if shard_count is None:
+        shard_count = int(os.environ.get("CATALOG_SHARD_COUNT", 1))
+    if sample_per_stratum is None:
+        sample_per_stratum = catalog_config.get("sample_per_stratum")
+    if max_cases is None:
+        max_cases = catalog_config.get("max_cases")
+    
+    source = CatalogSource(client, endpoint, catalog_config.get("page_size", 200), stream=catalog_config.get("stream", False))
+    entries = shard(source, shard_index, shard_count)
+    if sample_per_stratum:
+        stratum_size = catalog_config.get("stratum_size", 100)
+        entries = stratified_sample(entries, sample_per_stratum, lambda entry: entry.id // stratum_size,
+                                    seed=catalog_config.get("seed", 0))
+    if max_cases:
+        entries = islice(entries, max_cases)
+    return entries
+
+
+def write_examples(template_path: str, output_path: str, entries: Iterable[CatalogEntry]) -> int:
+    """Stream a feature template to disk, appending one Examples row per entry.
+    
+    The rows go after the first Examples header row of the template.
+    """
+    rows = 0
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(template_path, 'r') as template, open(output_path, 'w') as output:
+        in_examples = False
+        for line in template:
+            output.write(line)
+            if line.strip() == "Examples:":
+                in_examples = True
+            elif in_examples and line.strip().startswith("|"):
+                indent = line[:len(line) - len(line.lstrip())]
+                for entry in entries:
+                    output.write(f"{indent}| {entry.id} | {entry.name} |\n")
+                    rows += 1
+                in_examples = False
+    return rows
\ No newline at end of file
@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker with closed, open and half-open states.
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests fail immediately. Once ``reset_timeout`` seconds have passed a
+    single probe is let through (half-open); its outcome closes or re-opens
+    the circuit. A probe that ends without an outcome (e.g. the caller raised
+    before a response arrived) must be handed back with release_probe().
+    """
+    
+    _breakers: Dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, host: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.clock = clock
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.last_failure = None
+        self.opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_host(cls, host: str, **options) -> "CircuitBreaker":
+        """Return the breaker shared by all clients talking to a host"""
+        with cls._registry_lock:
+            if host not in cls._breakers:
+                cls._breakers[host] = cls(host, **options)
+            return cls._breakers[host]
+    
+    @classmethod
+    def open_reason(cls, host: str) -> Optional[str]:
+        """Return why the host's circuit is open, or None if requests may proceed"""
+        with cls._registry_lock:
+            breaker = cls._breakers.get(host)
+        if breaker is None or breaker.state != OPEN:
+            return None
+        return breaker.reason()
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the reset timeout passes"""
+        if self.opened_at is None:
+            return CLOSED
+        if self._probe_in_flight or self.clock() - self.opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+    
+    def reason(self) -> str:
+        """Human readable explanation of an open circuit"""
+        retry_in = max(0.0, self.reset_timeout - (self.clock() - (self.opened_at or 0)))
+        return (f"Circuit open for {self.host} after {self.failures} consecutive failure(s) "
+                f"(last: {self.last_failure}); next probe in {retry_in:.0f}s")
+    
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError unless a request may be sent now; True if it is the half-open probe"""
+        with self._lock:
+            state = self.state
+            if state == CLOSED:
+                return False
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            raise CircuitOpenError(self.reason())
+    
+    def release_probe(self):
+        """Hand back a probe slot whose request ended without a success or failure being recorded"""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+    
+    def record_failure(self, reason: str):
+        """Count a failed request and open the circuit once the threshold is hit"""
+        with self._lock:
+            self.failures += 1
+            self.last_failure = reason
+            if self._probe_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._probe_in_flight = False
\ No newline at end of file
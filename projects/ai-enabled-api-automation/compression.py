@@ -0,0 +1,204 @@
+import zlib
+from typing import Iterator, List, Optional, Sequence, Tuple
+import requests
+
+# Encodings in order of preference; br and zstd are only offered when their
+# optional decoders are installed (brotli or brotlicffi 1.2+, zstandard)
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+DEFAULT_MAX_DECODED_BYTES = 50 * 1024 * 1024
+
+# Largest piece of brotli or zstd output produced before the size limit is checked again
+DECODE_CHUNK_SIZE = 64 * 1024
+
+
+class DecodedSizeExceeded(requests.exceptions.ContentDecodingError):
+    """Raised when a response body decodes to more than the allowed size"""
+
+
+def _brotli_module():
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+    # Releases before 1.2 cannot bound a decompressor's output, so they are treated as missing
+    if not hasattr(brotli.Decompressor(), "can_accept_more_data"):
+        return None
+    return brotli
+
+
+def _zstd_module():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def available_encodings(preferred: Optional[Sequence[str]] = None) -> List[str]:
+    """Preferred encodings this process can actually decode"""
+    supported = {"gzip", "deflate"}
+    if _brotli_module():
+        supported.add("br")
+    if _zstd_module():
+        supported.add("zstd")
+    return [encoding for encoding in (preferred or PREFERRED_ENCODINGS) if encoding in supported]
+
+
+def accept_encoding(encodings: Sequence[str]) -> str:
+    """Accept-Encoding header value ranking the encodings in the given order"""
+    values = []
+    for index, encoding in enumerate(encodings):
+        quality = round(1 - index * 0.1, 1)
+        values.append(encoding if quality >= 1 else f"{encoding};q={max(quality, 0.1)}")
+    return ", ".join(values) or "identity"
+
+
+def encode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    """Compress a decoded body with one Content-Encoding, e.g. after rewriting it"""
+    encoding = (encoding or "identity").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    if encoding == "deflate":
+        return zlib.compress(body)
+    if encoding == "br" and _brotli_module():
+        return _brotli_module().compress(body)
+    if encoding == "zstd" and _zstd_module():
+        return _zstd_module().ZstdCompressor().compress(body)
+    if encoding == "identity":
+        return body
+    raise ValueError(f"Cannot encode a body as '{encoding}'")
+
+
+class StreamingDecoder:
+    """Incrementally decodes one Content-Encoding, refusing to grow past max_bytes.
+    
+    Each chunk is decoded into bounded pieces (zlib's max_length, brotli's
+    output_buffer_limit, zstandard's stream_writer write_size) and the limit
+    is checked after every piece, so a small compressed body that expands to
+    gigabytes fails just past max_bytes instead of exhausting memory.
+    """
+    
+    def __init__(self, encoding: str, max_bytes: int = DEFAULT_MAX_DECODED_BYTES):
+        self.encoding = (encoding or "identity").strip().lower()
+        self.max_bytes = max_bytes
+        self.decoded_bytes = 0
+        self._chunks: List[bytes] = []
+        self._zlib = None
+        self._brotli = None
+        self._zstd = None
+        self._errors: Tuple = (zlib.error,)
+        
+        if self.encoding in ("gzip", "x-gzip"):
+            self._zlib = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            # Servers send either zlib-wrapped or raw deflate; the first chunk decides
+            self._zlib = None
+        elif self.encoding == "br":
+            brotli = _brotli_module()
+            if brotli is None:
+                raise requests.exceptions.ContentDecodingError("Response is brotli encoded but brotli 1.2+ is not installed")
+            self._brotli = brotli.Decompressor()
+            self._errors += (brotli.error,)
+        elif self.encoding == "zstd":
+            zstandard = _zstd_module()
+            if zstandard is None:
+                raise requests.exceptions.ContentDecodingError("Response is zstd encoded but zstandard is not installed")
+            # The writer hands decoded output to this decoder in write_size pieces as it is produced
+            self._zstd = zstandard.ZstdDecompressor().stream_writer(self, write_size=DECODE_CHUNK_SIZE)
+            self._errors += (zstandard.ZstdError,)
+        elif self.encoding != "identity":
+            raise requests.exceptions.ContentDecodingError(f"Unsupported Content-Encoding '{encoding}'")
+    
+    def _append(self, data: bytes):
+        self.decoded_bytes += len(data)
+        if self.decoded_bytes > self.max_bytes:
+            raise DecodedSizeExceeded(f"Decoded body exceeds {self.max_bytes} bytes ({self.encoding})")
+        self._chunks.append(data)
+    
+    def write(self, data: bytes) -> int:
+        """Output sink for the zstd stream writer"""
+        self._append(bytes(data))
+        return len(data)
+    
+    def _room(self) -> int:
+        # Never decode more than one byte past the limit at a time
+        return self.max_bytes - self.decoded_bytes + 1
+    
+    def _feed_brotli(self, data: bytes):
+        # The buffer limit is soft (the buffer grows in blocks), so it is kept to one chunk;
+        # output held back by the limit is drained with empty input
+        output = self._brotli.process(data, output_buffer_limit=min(self._room(), DECODE_CHUNK_SIZE))
+        while output:
+            self._append(output)
+            if self._brotli.is_finished():
+                return
+            output = self._brotli.process(b"", output_buffer_limit=min(self._room(), DECODE_CHUNK_SIZE))
+    
+    def _feed_zlib(self, data: bytes):
+        while data:
+            self._append(self._zlib.decompress(data, self._room()))
+            data = self._zlib.unconsumed_tail
+    
+    def feed(self, data: bytes):
+        """Decode the next chunk of the body"""
+        if not data:
+            return
+        if self.encoding == "deflate" and self._zlib is None:
+            self._zlib = zlib.decompressobj(zlib.MAX_WBITS if data[0] & 0x0F == 8 else -zlib.MAX_WBITS)
+        try:
+            if self._zlib is not None:
+                self._feed_zlib(data)
+            elif self._brotli is not None:
+                self._feed_brotli(data)
+            elif self._zstd is not None:
+                self._zstd.write(data)
+            else:
+                self._append(data)
+        except self._errors as e:
+            raise requests.exceptions.ContentDecodingError(f"Failed to decode {self.encoding} body: {e}") from e
+    
+    def drain(self) -> bytes:
+        """Return and forget the bytes decoded so far, for callers that consume the body as it arrives"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+    
+    def finish(self) -> bytes:
+        """Flush the decoder and return the decoded body (the part not yet drained)"""
+        if self._zlib is not None:
+            self._append(self._zlib.flush())
+        return self.drain()
+
+
+def decode_stream(chunks, encoding: str, max_bytes: int = DEFAULT_MAX_DECODED_BYTES) -> Tuple[bytes, int]:
+    """Decode an iterable of raw body chunks, returning (body, wire bytes)"""
+    decoder = StreamingDecoder(encoding, max_bytes)
+    wire_bytes = 0
+    for chunk in chunks:
+        wire_bytes += len(chunk)
+        decoder.feed(chunk)
+    return decoder.finish(), wire_bytes
+
+
+def iter_decoded(response, chunks, max_bytes: int = DEFAULT_MAX_DECODED_BYTES) -> Iterator[bytes]:
+    """Decode raw body chunks as they arrive, setting response.wire_bytes once the body ends"""
+    decoder = StreamingDecoder(response.headers.get("Content-Encoding"), max_bytes)
+    wire_bytes = 0
+    try:
+        for chunk in chunks:
+            wire_bytes += len(chunk)
+            decoder.feed(chunk)
+            data = decoder.drain()
+            if data:
+                yield data
+        data = decoder.finish()
+        if data:
+            yield data
+        response.wire_bytes = wire_bytes
+    finally:
+        response.close()
\ No newline at end of file
@@ -0,0 +1,154 @@
+import json
+import os
+import pytest
+from _pytest.runner import runtestprotocol
+from urllib.parse import urlparse
+from catalog import catalog_cases
+from circuit_breaker import CircuitBreaker
+from deadline import deadline_scope
+from pokeapi_client import PokeAPIClient
+from profiling import ScenarioProfiler
+from run_history import HistoryScheduler, is_latency_test
+
+_scheduler = None
+
+# Set to 1 to generate the catalog tests without --catalog
+CATALOG_ENV = "CATALOG_TESTS"
+
+def pytest_addoption(parser):
+    """Options for catalog-driven parametrization"""
+    group = parser.getgroup("catalog")
+    group.addoption("--catalog", action="store_true",
+                    help=f"Fetch the catalog and generate its tests (default: {CATALOG_ENV}=1)")
+    group.addoption("--catalog-shard-index", type=int, help="This worker's catalog shard (default: CATALOG_SHARD_INDEX or 0)")
+    group.addoption("--catalog-shard-count", type=int, help="Total catalog shards (default: CATALOG_SHARD_COUNT or 1)")
+    group.addoption("--catalog-sample", type=int, help="Stratified sample size per ID range")
+    group.addoption("--catalog-max-cases", type=int, help="Catalog cases to generate (0 for the whole catalog)")
+
+def pytest_generate_tests(metafunc):
+    """Parametrize catalog_pokemon from the streamed, sharded catalog listing"""
+    if "catalog_pokemon" not in metafunc.fixturenames:
+        return
+    
+    # Collection must not depend on the API being reachable, so the catalog is only fetched on request
+    if not (metafunc.config.getoption("--catalog") or os.environ.get(CATALOG_ENV) == "1"):
+        reason = f"Catalog tests are opt-in: run with --catalog or {CATALOG_ENV}=1"
+        metafunc.parametrize("catalog_pokemon", [pytest.param(None, marks=pytest.mark.skip(reason=reason))],
+                             ids=["catalog-disabled"])
+        return
+    
+    client = PokeAPIClient()
+    try:
+        entries = catalog_cases(
+            client, client.config,
+            shard_index=metafunc.config.getoption("--catalog-shard-index"),
+            shard_count=metafunc.config.getoption("--catalog-shard-count"),
+            sample_per_stratum=metafunc.config.getoption("--catalog-sample"),
+            max_cases=metafunc.config.getoption("--catalog-max-cases")
+        )
+        cases = list(entries)
+    except Exception as e:
+        reason = f"Catalog unavailable: {type(e).__name__}: {e}"
+        metafunc.parametrize("catalog_pokemon", [pytest.param(None, marks=pytest.mark.skip(reason=reason))],
+                             ids=["catalog-unavailable"])
+        return
+    finally:
+        client.close()
+    metafunc.parametrize("catalog_pokemon", cases, ids=[f"{entry.id}-{entry.name}" for entry in cases])
+
+@pytest.fixture(autouse=True)
+def circuit_breaker_guard():
+    """Skip or fail tests immediately while the API host's circuit is open"""
+    with open("config.json", 'r') as f:
+        config = json.load(f)
+    
+    breaker_config = config.get("circuit_breaker") or {}
+    reason = CircuitBreaker.open_reason(urlparse(config["base_url"].rstrip('/')).netloc)
+    if reason:
+        if breaker_config.get("on_open") == "skip":
+            pytest.skip(reason)
+        pytest.fail(reason, pytrace=False)
+    yield
+
+@pytest.fixture(autouse=True)
+def time_budget(request):
+    """Run the test under its @pytest.mark.budget(seconds) or the configured scenario budget"""
+    with open("config.json", 'r') as f:
+        budgets = json.load(f).get("budgets") or {}
+    
+    marker = request.node.get_closest_marker("budget")
+    budget = marker.args[0] if marker else budgets.get("scenario")
+    with deadline_scope(budget, request.node.nodeid) as deadline:
+        yield deadline
+    if deadline is not None:
+        request.node.user_properties.append(("budget", deadline.usage()))
+
+def pytest_configure(config):
+    """Register the framework's markers and profile each test when run with --profile"""
+    # pytest.ini's [tool:pytest] section is not read by pytest, so its markers are registered here
+    config.addinivalue_line("markers", "catalog: Data-driven tests generated from the full catalog")
+    config.addinivalue_line("markers", "budget(seconds): Time budget for every API call in the test")
+    config.addinivalue_line("markers", "latency: Asserts on response time; retried and quarantined when flaky")
+    config._framework_profiler = ScenarioProfiler.from_env()
+    config._framework_scheduler = HistoryScheduler.from_config()
+    # pytest_runtest_logreport gets no config, so it records through this reference
+    global _scheduler
+    _scheduler = config._framework_scheduler
+
+def pytest_collection_modifyitems(config, items):
+    """Run previously failed tests first and skip quarantined ones"""
+    scheduler = config._framework_scheduler
+    scheduler.order(items, lambda item: [item.nodeid])
+    for item in items:
+        reason = scheduler.skip_reason(item.nodeid)
+        if reason:
+            item.add_marker(pytest.mark.skip(reason=reason))
+
+def pytest_runtest_protocol(item, nextitem):
+    """Retry flaky latency tests, reporting only the last attempt"""
+    attempts = item.config._framework_scheduler.attempts_for(item.nodeid, is_latency_test(item.nodeid, item.keywords))
+    if attempts == 1:
+        return None
+    
+    item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+    for _ in range(attempts):
+        reports = runtestprotocol(item, nextitem=nextitem, log=False)
+        if not any(report.failed for report in reports):
+            break
+    for report in reports:
+        item.ihook.pytest_runtest_logreport(report=report)
+    item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+    return True
+
+def pytest_runtest_logreport(report):
+    """Record each test's outcome in the run history"""
+    if report.when == "call" or (report.when == "setup" and report.failed):
+        _scheduler.record(report.nodeid, report.outcome, report.duration, location=report.nodeid,
+                          latency_check=is_latency_test(report.nodeid, report.keywords))
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    profiler = item.config._framework_profiler
+    if profiler:
+        profiler.start(item.nodeid)
+    yield
+    if profiler:
+        profiler.stop()
+
+def pytest_sessionfinish(session):
+    session.config._framework_scheduler.save()
+
+def pytest_terminal_summary(terminalreporter, config):
+    summary = config._framework_scheduler.summary()
+    if summary:
+        terminalreporter.section("flaky tests")
+        for line in summary:
+            terminalreporter.write_line(line)
+    
+    profiler = config._framework_profiler
+    if profiler and profiler.results:
+        slowest = sorted(profiler.results, key=lambda result: result["duration"], reverse=True)[:3]
+        terminalreporter.section("profile")
+        for result in slowest:
+            terminalreporter.write_line(ScenarioProfiler.format_table(result, rows=5))
+        terminalreporter.write_line(f"Profiles saved to {profiler.write_summary()}")
\ No newline at end of file
@@ -0,0 +1,136 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional
+import requests
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+# Tags like @budget_5s, @budget_1.5s, @budget_500ms or @budget_2m
+BUDGET_TAG = re.compile(r"^budget_(\d+(?:\.\d+)?)(ms|s|m)$")
+UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised instead of sending a request once the active time budget is spent"""
+
+
+class Deadline:
+    """A time budget for a suite, scenario or test.
+    
+    While active (see ``activate``), every APIClient call uses the time left
+    as its timeout and is refused once none is left. A deadline nested inside
+    another never outlives it.
+    """
+    
+    def __init__(self, budget: float, name: str = "", parent: Optional["Deadline"] = None):
+        self.budget = budget
+        self.name = name
+        self.parent = parent
+        self.started = time.monotonic()
+        self.expires_at = self.started + budget
+        if parent is not None:
+            self.expires_at = min(self.expires_at, parent.expires_at)
+        self.calls = 0
+        self.shortened = 0
+    
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+    
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def timeout(self, default: float) -> float:
+        """The timeout for the next call: the client's default capped by the time left"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Time budget of {self.budget:g}s for {self.name or 'this call'} is spent")
+        deadline = self
+        while deadline is not None:
+            deadline.calls += 1
+            deadline = deadline.parent
+        if remaining < default:
+            self.shortened += 1
+            return remaining
+        return default
+    
+    def usage(self) -> Dict[str, Any]:
+        """Budget, time used and call counts for reports"""
+        used = time.monotonic() - self.started
+        return {
+            "budget": self.budget,
+            "used": round(used, 3),
+            "used_percent": round(100 * used / self.budget, 1) if self.budget else None,
+            "exceeded": used > self.budget,
+            "calls": self.calls,
+            "shortened_timeouts": self.shortened
+        }
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def activate(budget: float, name: str = ""):
+    """Start a deadline nested in the current one; pass the returned token to deactivate()"""
+    deadline = Deadline(budget, name, parent=_current.get())
+    return deadline, _current.set(deadline)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def deadline_scope(budget: Optional[float], name: str = ""):
+    """Run a block under a deadline (or under the current one when budget is None)"""
+    if budget is None:
+        yield current_deadline()
+        return
+    deadline, token = activate(budget, name)
+    try:
+        yield deadline
+    finally:
+        deactivate(token)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Wrap fn so it runs under the caller's deadline, e.g. in pool threads"""
+    deadline = _current.get()
+    if deadline is None:
+        return fn
+    
+    def run(*args, **kwargs):
+        token = _current.set(deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+
+def budget_from_tags(tags: Iterable[str]) -> Optional[float]:
+    """The smallest budget among @budget_<n><unit> tags, in seconds"""
+    budgets = [float(match.group(1)) * UNITS[match.group(2)]
+               for match in (BUDGET_TAG.match(tag) for tag in tags) if match]
+    return min(budgets) if budgets else None
+
+
+class DeadlineRetry(Retry):
+    """urllib3 Retry that gives up once the active deadline leaves no time for another attempt"""
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        deadline = current_deadline()
+        if deadline is not None:
+            wait = retry.get_backoff_time()
+            if response is not None and self.respect_retry_after_header:
+                wait = max(wait, retry.get_retry_after(response) or 0)
+            if deadline.remaining() <= wait:
+                reason = error or ResponseError(f"time budget of {deadline.budget:g}s spent, retries suppressed")
+                raise MaxRetryError(_pool, url, reason)
+        return retry
\ No newline at end of file
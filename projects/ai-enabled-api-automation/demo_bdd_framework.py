@@ -4,10 +4,11 @@ BDD Framework Demo Script
 Demonstrates the PokéAPI BDD automation framework capabilities
 """
 
-import subprocess
-import sys
+import contextlib
+import io
 import os
 from datetime import datetime
+from run_suites import SUITES, run_suites, generate_report
 
 def print_header():
     """Print demo header"""
@@ -17,17 +18,13 @@ def print_header():
     print(f"    Demo started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*62)
 
-def demo_smoke_tests():
+def demo_smoke_tests(passed):
     """Demo smoke tests"""
     print("\n🔥 DEMO 1: Smoke Tests")
     print("-" * 30)
     print("Testing basic Pokemon and Ability retrieval...")
     
-    result = subprocess.run([
-        sys.executable, "run_bdd_tests.py", "--suite", "smoke"
-    ], capture_output=True, text=True)
-    
-    if result.returncode == 0:
+    if passed:
         print("✅ Smoke tests PASSED")
         print("   - Pokemon retrieval by ID and name")
         print("   - Ability retrieval by identifier")
@@ -35,17 +32,13 @@ def demo_smoke_tests():
     else:
         print("❌ Smoke tests FAILED")
 
-def demo_negative_tests():
+def demo_negative_tests(passed):
     """Demo negative tests"""
     print("\n❌ DEMO 2: Negative Tests")
     print("-" * 30)
     print("Testing error handling with invalid inputs...")
     
-    result = subprocess.run([
-        sys.executable, "run_bdd_tests.py", "--suite", "negative"
-    ], capture_output=True, text=True)
-    
-    if result.returncode == 0:
+    if passed:
         print("✅ Negative tests PASSED")
         print("   - Invalid Pokemon IDs return 404")
         print("   - Invalid Pokemon names return 404")
@@ -53,17 +46,13 @@ def demo_negative_tests():
     else:
         print("❌ Negative tests FAILED")
 
-def demo_validation_tests():
+def demo_validation_tests(passed):
     """Demo validation tests"""
     print("\n🔍 DEMO 3: Validation Tests")
     print("-" * 30)
     print("Testing response structure and schema validation...")
     
-    result = subprocess.run([
-        sys.executable, "run_bdd_tests.py", "--suite", "validation"
-    ], capture_output=True, text=True)
-    
-    if result.returncode == 0:
+    if passed:
         print("✅ Validation tests PASSED")
         print("   - JSON schema validation")
         print("   - Required fields verification")
@@ -71,17 +60,13 @@ def demo_validation_tests():
     else:
         print("❌ Validation tests FAILED")
 
-def demo_performance_tests():
+def demo_performance_tests(passed):
     """Demo performance tests"""
     print("\n⚡ DEMO 4: Performance Tests")
     print("-" * 30)
     print("Testing API response times...")
     
-    result = subprocess.run([
-        sys.executable, "run_bdd_tests.py", "--suite", "performance"
-    ], capture_output=True, text=True)
-    
-    if result.returncode == 0:
+    if passed:
         print("✅ Performance tests PASSED")
         print("   - Response times under acceptable limits")
         print("   - Multiple endpoint performance validated")
@@ -126,11 +111,16 @@ def main():
     """Main demo function"""
     print_header()
     
-    # Run demo test suites
-    demo_smoke_tests()
-    demo_negative_tests()
-    demo_validation_tests()
-    demo_performance_tests()
+    # Run every demo suite in this process, quietly, with one report at the end
+    suites = ["smoke", "negative", "validation", "performance"]
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        results = run_suites([(suite, SUITES[suite]) for suite in suites])
+        generate_report()
+    
+    demo_smoke_tests(results["smoke"][0])
+    demo_negative_tests(results["negative"][0])
+    demo_validation_tests(results["validation"][0])
+    demo_performance_tests(results["performance"][0])
     
     # Show reports and features
     show_reports()
@@ -144,6 +134,7 @@ def main():
     print("   python3 run_bdd_tests.py --suite validation")
     print("   python3 run_bdd_tests.py --suite performance")
     print("   python3 run_bdd_tests.py --suite all")
+    print("   python3 run_suites.py --suites smoke negative validation performance")
     print("="*62)
 
 if __name__ == "__main__":
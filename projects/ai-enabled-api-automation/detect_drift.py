@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Drift Detection
+Compares current API responses with stored structural-hash snapshots
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from response_snapshots import ResponseSnapshots
+
+def iter_documents(args):
+    """Yield (resource, key, data) from the selected source"""
+    if args.snapshot:
+        from snapshot_store import SnapshotStore
+        store = SnapshotStore(args.snapshot)
+        for resource, resource_id, body in store.iter_bodies(args.resource):
+            yield resource, resource_id, json.loads(body)
+        return
+    
+    from catalog import catalog_cases
+    from pokeapi_client import PokeAPIClient
+    client = PokeAPIClient()
+    client.config.setdefault("catalog", {})["endpoint"] = args.resource or "pokemon"
+    resource = client.config["endpoints"][client.config["catalog"]["endpoint"]].strip("/")
+    for entry in catalog_cases(client, client.config, max_cases=args.max_cases):
+        response = client.get_url(entry.url)
+        if response.status_code == 200:
+            yield resource, entry.id, response.json()
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect drift against stored response snapshots")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--snapshot", help="Read documents from a snapshot database")
+    source.add_argument("--from-api", action="store_true", help="Fetch catalog documents from the API (default)")
+    parser.add_argument("--resource", help="Resource to check (snapshot resource or config endpoint name)")
+    parser.add_argument("--max-cases", type=int, help="Catalog entries to fetch from the API (0 for all)")
+    parser.add_argument("--directory", default="snapshots", help="Where response snapshots are stored")
+    parser.add_argument("--update", action="store_true", help="Accept drifted documents as the new snapshots")
+    parser.add_argument("--output", default="reports/drift_report.json", help="JSON drift report")
+    
+    args = parser.parse_args()
+    
+    snapshots = ResponseSnapshots(args.directory)
+    checked = 0
+    drifted = {}
+    start_time = time.time()
+    for resource, key, data in iter_documents(args):
+        checked += 1
+        changes = snapshots.check(resource, key, data)
+        if changes:
+            drifted[f"{resource}/{key}"] = changes
+            if args.update:
+                snapshots.update(resource, key, data)
+    # New baselines and accepted drift are indexed in one write per resource type
+    snapshots.save_index()
+    
+    print(f"🔍 Checked {checked:,} documents in {time.time() - start_time:.1f}s")
+    if drifted:
+        print(f"⚠️ {len(drifted):,} documents drifted{' (snapshots updated)' if args.update else ''}")
+        for name, changes in list(drifted.items())[:20]:
+            print(f"   {name}: {', '.join(change['path'] for change in changes[:5])}"
+                  f"{' ...' if len(changes) > 5 else ''}")
+    else:
+        print("✅ No drift detected")
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({"checked": checked, "drifted": drifted}, f, indent=2)
+    print(f"📁 Report saved to {args.output}")
+    return 1 if drifted and not args.update else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
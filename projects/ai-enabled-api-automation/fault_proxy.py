@@ -0,0 +1,246 @@
+import random
+import socket
+import struct
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import HTTPError
+from compression import decode_stream, encode_body
+
+# Hop-by-hop headers (RFC 9110 section 7.6.1) apply to one connection and are never forwarded;
+# Host and Content-Length are set again for the upstream request
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+                      "te", "trailer", "transfer-encoding", "upgrade", "host", "content-length"}
+
+# Profile keys (all optional):
+#   latency_ms, jitter_ms          - delay before the response starts
+#   bandwidth_kbps                 - throttle the body to this many kilobits per second
+#   chunk_size, chunk_delay_ms     - send the body with chunked encoding, pausing between chunks
+#   reset_rate                     - probability of resetting the connection instead of answering
+#   rate_limit_rate, retry_after   - probability of a 429 with a Retry-After header
+#   error_rate, error_burst, error_status - probability of starting a burst of 5xx responses
+#   fault_requests                 - only the first N requests after switching may fail (0 = all)
+#   seed                           - make the random choices repeatable
+
+
+class FaultProxy:
+    """Local reverse proxy that injects latency, throttling, resets, 429s and 5xx bursts.
+    
+    Point a client's base_url at proxy.base_url; responses are fetched from
+    the target and rewritten so links in payloads also go through the proxy.
+    Profiles can be switched at any time and injected faults are counted
+    per kind in stats.
+    """
+    
+    _proxies: Dict[str, "FaultProxy"] = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, target_base_url: str, profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.target_base_url = target_base_url.rstrip('/')
+        target = urlparse(self.target_base_url)
+        self.target_origin = f"{target.scheme}://{target.netloc}"
+        self.target_path = target.path
+        self.profiles = profiles or {}
+        self._upstream = threading.local()
+        self._sessions = []
+        self.stats = Counter()
+        self.profile: Dict[str, Any] = {}
+        self.profile_name: Optional[str] = None
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._burst_left = 0
+        self._handled = 0
+        
+        proxy = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                proxy._handle(self)
+            
+            do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fault-proxy", daemon=True)
+        self._thread.start()
+    
+    @classmethod
+    def for_target(cls, target_base_url: str, profiles: Optional[Dict[str, Dict[str, Any]]] = None) -> "FaultProxy":
+        """Proxy shared by every client of a target, started on first use"""
+        key = target_base_url.rstrip('/')
+        with cls._registry_lock:
+            if key not in cls._proxies:
+                cls._proxies[key] = cls(key, profiles)
+            return cls._proxies[key]
+    
+    @property
+    def origin(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def base_url(self) -> str:
+        return self.origin + self.target_path
+    
+    def set_profile(self, profile: Optional[Any]):
+        """Switch to a named profile from config, an inline profile dict, or None for a clean pass-through"""
+        if isinstance(profile, str):
+            if profile not in self.profiles:
+                raise KeyError(f"Unknown fault profile '{profile}'. Available: {sorted(self.profiles)}")
+            name, profile = profile, self.profiles[profile]
+        else:
+            name = "custom" if profile else None
+        with self._lock:
+            self.profile = dict(profile or {})
+            self.profile_name = name
+            self._random = random.Random(self.profile.get("seed"))
+            self._burst_left = 0
+            self._handled = 0
+            self.stats = Counter()
+    
+    @property
+    def upstream(self) -> requests.Session:
+        """The calling handler thread's session to the target; sessions are not thread-safe"""
+        session = getattr(self._upstream, "session", None)
+        if session is None:
+            session = self._upstream.session = requests.Session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+    
+    def _choose_fault(self) -> Optional[str]:
+        """Decide which fault, if any, this request gets"""
+        profile = self.profile
+        with self._lock:
+            self._handled += 1
+            self.stats["requests"] += 1
+            limit = profile.get("fault_requests", 0)
+            if limit and self._handled > limit:
+                return None
+            if self._burst_left:
+                self._burst_left -= 1
+                fault = "error"
+            elif self._random.random() < profile.get("reset_rate", 0):
+                fault = "reset"
+            elif self._random.random() < profile.get("rate_limit_rate", 0):
+                fault = "rate_limit"
+            elif self._random.random() < profile.get("error_rate", 0):
+                self._burst_left = max(profile.get("error_burst", 1), 1) - 1
+                fault = "error"
+            else:
+                return None
+            self.stats[fault] += 1
+            return fault
+    
+    def _delay(self):
+        with self._lock:
+            latency = self.profile.get("latency_ms", 0) + self._random.uniform(0, self.profile.get("jitter_ms", 0))
+            if latency > 0:
+                self.stats["delayed"] += 1
+        if latency > 0:
+            time.sleep(latency / 1000)
+    
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        fault = self._choose_fault()
+        self._delay()
+        
+        if fault == "reset":
+            # SO_LINGER with a zero timeout makes close() send a RST
+            handler.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            handler.close_connection = True
+            handler.connection.close()
+            return
+        if fault == "rate_limit":
+            self._send_simple(handler, 429, b'{"detail": "Too Many Requests"}',
+                              {"Retry-After": str(self.profile.get("retry_after", 1))})
+            return
+        if fault == "error":
+            self._send_simple(handler, self.profile.get("error_status", 503), b'{"detail": "Injected failure"}')
+            return
+        
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else None
+        headers = CaseInsensitiveDict((name, value) for name, value in handler.headers.items()
+                                      if name.lower() not in HOP_BY_HOP_HEADERS)
+        # requests adds its own Accept-Encoding; the target must see the client's (or none)
+        headers.setdefault("Accept-Encoding", "identity")
+        try:
+            upstream = self.upstream.request(handler.command, self.target_origin + handler.path, data=body, timeout=30,
+                                             headers=headers, stream=True)
+            try:
+                # Links are rewritten in the decoded body, which is then encoded as the target sent it
+                encoding = upstream.headers.get("Content-Encoding")
+                content, _ = decode_stream(upstream.raw.stream(16384, decode_content=False), encoding)
+            finally:
+                upstream.close()
+        except (requests.RequestException, HTTPError) as e:
+            self._send_simple(handler, 502, f'{{"detail": "Upstream error: {type(e).__name__}"}}'.encode())
+            return
+        content = encode_body(content.replace(self.target_origin.encode(), self.origin.encode()), encoding)
+        self._send_body(handler, upstream.status_code, content, upstream.headers.get("Content-Type"), encoding)
+    
+    def _send_simple(self, handler: BaseHTTPRequestHandler, status: int, body: bytes,
+                     headers: Optional[Dict[str, str]] = None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        if handler.command != "HEAD":
+            handler.wfile.write(body)
+    
+    def _send_body(self, handler: BaseHTTPRequestHandler, status: int, body: bytes, content_type: Optional[str],
+                   encoding: Optional[str] = None):
+        chunk_size = self.profile.get("chunk_size")
+        bandwidth = self.profile.get("bandwidth_kbps")
+        chunked = bool(chunk_size)
+        chunk_size = chunk_size or 16384
+        chunk_delay = self.profile.get("chunk_delay_ms", 0) / 1000
+        
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type or "application/json")
+        if encoding:
+            handler.send_header("Content-Encoding", encoding)
+        if chunked:
+            handler.send_header("Transfer-Encoding", "chunked")
+        else:
+            handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if handler.command == "HEAD":
+            return
+        
+        if bandwidth or chunk_delay:
+            with self._lock:
+                self.stats["throttled"] += 1
+        for offset in range(0, len(body), chunk_size):
+            chunk = body[offset:offset + chunk_size]
+            if chunked:
+                handler.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            else:
+                handler.wfile.write(chunk)
+            handler.wfile.flush()
+            pause = chunk_delay + (len(chunk) * 8 / (bandwidth * 1000) if bandwidth else 0)
+            if pause:
+                time.sleep(pause)
+        if chunked:
+            handler.wfile.write(b"0\r\n\r\n")
\ No newline at end of file
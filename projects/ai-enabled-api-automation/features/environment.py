@@ -1,9 +1,16 @@
 import logging
 import time
 import json
-import os
 from behave import fixture, use_fixture
+from behave.contrib.scenario_autoretry import patch_scenario_with_autoretry
+from deadline import activate, budget_from_tags, deactivate
 from pages.pokemon_page import PokemonPage
+from profiling import ScenarioProfiler
+from response_retention import RetentionPolicy
+from resource_graph import prefetch_summary
+from run_history import HistoryScheduler, has_latency_check, scenario_id
+from telemetry import default_telemetry
+from utils.bdd_utils import BDDUtils
 import allure
 
 # Global variables to collect metrics
@@ -28,12 +35,86 @@ def before_all(context):
     # Initialize shared resources
     context.config.setup_logging()
     context.test_metrics = test_metrics
+    
+    # Profile each scenario when run with --profile
+    context.profiler = ScenarioProfiler.from_env()
+    
+    # Cap the whole run and each scenario (@budget_<n>s tags override the config)
+    with open("config.json", 'r') as f:
+        config = json.load(f)
+    context.budgets = config.get("budgets") or {}
+    context.prefetch = config.get("prefetch") or {}
+    
+    # Keep a compact summary of each response and spill bodies to a temp store
+    context.retention = RetentionPolicy.from_config(config)
+    context.suite_deadline = None
+    if context.budgets.get("suite"):
+        context.suite_deadline, context.suite_deadline_token = activate(context.budgets["suite"], "the suite")
+    
+    # Run features holding previously failed scenarios first
+    context.scheduler = HistoryScheduler.from_config()
+    context.scheduler.order(context._runner.features, lambda feature: [
+        scenario_id(feature.name, scenario.name) for scenario in feature.walk_scenarios()
+    ])
+
+def before_feature(context, feature):
+    """Order scenarios by failure history and retry flaky latency checks"""
+    context.scheduler.order(feature.scenarios, lambda scenario: [
+        scenario_id(feature.name, example.name) for example in getattr(scenario, "scenarios", [scenario])
+    ])
+    for scenario in feature.walk_scenarios():
+        attempts = context.scheduler.attempts_for(scenario_id(feature.name, scenario.name), has_latency_check(scenario))
+        if attempts > 1:
+            patch_scenario_with_autoretry(scenario, max_attempts=attempts)
+            logging.info(f"Flaky latency check {scenario.name} will be retried up to {attempts} times")
 
 def before_scenario(context, scenario):
     """Setup before each scenario"""
+    if context.profiler:
+        context.profiler.start(f"{scenario.feature.name} - {scenario.name}")
+    
+    # Prefetch the declared links in the background while steps of tagged scenarios validate
+    context.prefetch_links = None
+    if context.prefetch.get("enabled") and set(context.prefetch.get("tags", [])) & set(scenario.effective_tags):
+        context.prefetch_links = context.prefetch.get("links")
+    
     # Initialize page objects for each scenario
-    context.pokemon_page = PokemonPage()
+    context.pokemon_page = PokemonPage(prefetch_links=context.prefetch_links, retention=context.retention)
     context.scenario_start_time = time.time()
+    context.deadline = None
+    
+    # Skip the rest of the run once the suite budget is spent
+    if context.suite_deadline and context.suite_deadline.expired():
+        reason = f"Suite time budget of {context.suite_deadline.budget:g}s spent"
+        scenario.skip(reason)
+        logging.warning(f"Skipping scenario {scenario.name}: {reason}")
+        return
+    
+    # Skip straight away when the API host is known to be down
+    breaker_config = context.pokemon_page.api.config.get("circuit_breaker") or {}
+    if breaker_config.get("on_open") == "skip":
+        reason = context.pokemon_page.api.client.circuit_open_reason()
+        if reason:
+            scenario.skip(reason)
+            logging.warning(f"Skipping scenario {scenario.name}: {reason}")
+            return
+    
+    # Quarantined scenarios only run with --include-quarantined
+    reason = context.scheduler.skip_reason(scenario_id(scenario.feature.name, scenario.name))
+    if reason:
+        scenario.skip(reason)
+        logging.warning(f"Skipping scenario {scenario.name}: {reason}")
+        return
+    
+    # Route the scenario through the fault proxy for @fault_<profile> tags
+    for tag in scenario.effective_tags:
+        if tag.startswith("fault_"):
+            context.pokemon_page.use_fault_profile(tag[len("fault_"):])
+    
+    # Every API call in the scenario shares its time budget
+    budget = budget_from_tags(scenario.effective_tags) or context.budgets.get("scenario")
+    if budget:
+        context.deadline, context.deadline_token = activate(budget, f"scenario '{scenario.name}'")
     
     # Log scenario start
     logging.info(f"Starting scenario: {scenario.name}")
@@ -54,40 +135,37 @@ def after_scenario(context, scenario):
         'feature': scenario.feature.name
     }
     
+    # Report how much of its time budget the scenario used
+    if context.deadline:
+        deactivate(context.deadline_token)
+        scenario_data['budget'] = context.deadline.usage()
+        if scenario_data['budget']['exceeded']:
+            logging.warning(f"Scenario {scenario.name} exceeded its time budget: "
+                            f"{scenario_data['budget']['used']:.2f}s of {context.deadline.budget:g}s")
+    
     test_metrics['scenarios'].append(scenario_data)
     
     # Collect performance data if available
     if hasattr(context, 'pokemon_page') and context.pokemon_page.last_response:
-        response_time = context.pokemon_page.last_response.elapsed.total_seconds()
+        last_response = context.pokemon_page.last_response
         test_metrics['performance_data'].append({
             'scenario': scenario.name,
-            'response_time': response_time,
-            'status_code': context.pokemon_page.last_response.status_code
+            'response_time': last_response.elapsed.total_seconds(),
+            'status_code': last_response.status_code,
+            'endpoint': context.pokemon_page.api.client.endpoint_key(str(last_response.url)),
+            'decoded_bytes': BDDUtils.decoded_size(last_response),
+            'wire_bytes': getattr(last_response, 'wire_bytes', None)
         })
         
-        # Attach response details to Allure
-        allure.attach(
-            f"Status Code: {context.pokemon_page.last_response.status_code}\n"
-            f"Response Time: {response_time:.3f}s\n"
-            f"Response Size: {len(context.pokemon_page.last_response.content)} bytes",
-            "API Response Details",
-            allure.attachment_type.TEXT
-        )
-        
-        # Attach response body if it's JSON
-        try:
-            response_json = context.pokemon_page.last_response.json()
-            allure.attach(
-                json.dumps(response_json, indent=2),
-                "Response Body",
-                allure.attachment_type.JSON
-            )
-        except:
-            allure.attach(
-                context.pokemon_page.last_response.text,
-                "Response Body",
-                allure.attachment_type.TEXT
-            )
+        # Attach response details and body to Allure (spilled bodies are read back only when wanted)
+        attachment_types = {"text": allure.attachment_type.TEXT, "json": allure.attachment_type.JSON}
+        include_body = context.retention is None or context.retention.attach_body(scenario.status.name)
+        for body, name, kind in BDDUtils.build_response_attachments(last_response, include_body):
+            allure.attach(body, name, attachment_types[kind])
+    
+    if context.prefetch_links and context.pokemon_page:
+        scenario_data['prefetch'] = context.pokemon_page.prefetch_summary()
+        allure.attach(json.dumps(scenario_data['prefetch'], indent=2), "Prefetch", allure.attachment_type.JSON)
     
     # Log scenario completion
     status = "PASSED" if scenario.status.name == "passed" else "FAILED"
@@ -95,19 +173,54 @@ def after_scenario(context, scenario):
     
     # Clean up any resources if needed
     if hasattr(context, 'pokemon_page'):
+        if context.pokemon_page:
+            context.pokemon_page.clear_fault_profile()
         context.pokemon_page = None
+    
+    if context.profiler:
+        context.profiler.stop()
+
+def after_feature(context, feature):
+    """Record each scenario's final outcome (after any retries) in the run history"""
+    for scenario in feature.walk_scenarios():
+        context.scheduler.record(scenario_id(feature.name, scenario.name), scenario.status.name, scenario.duration,
+                                 location=str(scenario.location), latency_check=has_latency_check(scenario))
 
 def after_all(context):
     """Cleanup after all tests"""
     global test_metrics
     test_metrics['end_time'] = time.time()
     
+    # Per-endpoint request counts and wire vs decoded bytes for the whole run
+    test_metrics['telemetry'] = default_telemetry.snapshot()
+    
+    # Share of follow-up requests served by background prefetches
+    counters = test_metrics['telemetry']['counters']
+    if counters.get("prefetch.issued"):
+        test_metrics['prefetch'] = prefetch_summary({
+            outcome: counters.get(f"prefetch.{outcome}", 0) for outcome in ("issued", "hit", "miss", "failed")
+        })
+        logging.info(f"Prefetch hit rate: {test_metrics['prefetch']['hit_rate']}% "
+                     f"({test_metrics['prefetch']['hits']} hits, {test_metrics['prefetch']['wasted']} wasted)")
+    
+    if context.retention:
+        test_metrics['retention'] = context.retention.summary()
+        context.retention.close()
+    
+    if context.suite_deadline:
+        deactivate(context.suite_deadline_token)
+        test_metrics['budget'] = context.suite_deadline.usage()
+    
     # Save metrics to file for report generation
     metrics_file = "reports/test_metrics.json"
-    os.makedirs("reports", exist_ok=True)
+    BDDUtils.save_metrics(test_metrics, metrics_file)
+    
+    context.scheduler.save()
+    for line in context.scheduler.summary():
+        logging.info(line)
     
-    with open(metrics_file, 'w') as f:
-        json.dump(test_metrics, f, indent=2)
+    if context.profiler:
+        logging.info(f"Profiles saved to {context.profiler.write_summary()}")
     
     logging.info("All BDD tests completed")
     logging.info(f"Test metrics saved to {metrics_file}")
\ No newline at end of file
@@ -1,3 +1,4 @@
+@budget_10s
 Feature: API Performance Testing
   As a Pokemon API user
   I want the API to respond quickly
@@ -29,4 +30,11 @@ Feature: API Performance Testing
     When I request Pokemon list with limit 100 and offset 0
     Then the response status should be 200
     And the response time should be less than 5 seconds
-    And the response should contain 100 Pokemon entries
\ No newline at end of file
+    And the response should contain 100 Pokemon entries
+
+  @performance
+  Scenario: Stream the whole Pokemon collection in one request
+    When I stream the Pokemon list with limit 100000 and offset 0
+    Then the response status should be 200
+    And every streamed Pokemon entry should have a name and url
+    And the number of streamed Pokemon entries should match the reported count
\ No newline at end of file
@@ -78,4 +78,11 @@ Feature: Pokemon API Testing
     Then the response status should be 200
     When I get the evolution chain for the species
     Then the response status should be 200
-    And the evolution chain should contain species information
\ No newline at end of file
+    And the evolution chain should contain species information
+
+  @integration
+  Scenario: Resolve linked Pokemon resources in parallel
+    When I request Pokemon with name "pikachu"
+    Then the response status should be 200
+    When I resolve linked "species, evolution_chain" resources to depth 2
+    Then the linked resource "species.url > evolution_chain.url" should contain "chain"
\ No newline at end of file
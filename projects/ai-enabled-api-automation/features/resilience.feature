@@ -0,0 +1,47 @@
+Feature: API Resilience Under Adverse Conditions
+  As a Pokemon API consumer
+  I want the client to degrade gracefully when the network or API misbehaves
+  So that slow or flaky days do not break my integration
+
+  Background:
+    Given the Pokemon API is available
+
+  @resilience @fault_slow
+  Scenario: Responses stay correct under injected latency
+    When I request Pokemon with name "pikachu"
+    Then the response status should be 200
+    And the response time should be at least 800 milliseconds
+    And the response should contain valid Pokemon data
+
+  @resilience @fault_throttled
+  Scenario: Throttled bandwidth still delivers the full payload
+    When I request Pokemon with name "pikachu"
+    Then the response status should be 200
+    And the response should contain valid Pokemon data
+
+  @resilience @fault_slow_body
+  Scenario: Slow chunked bodies are reassembled
+    When I request Pokemon list with limit 20 and offset 0
+    Then the response status should be 200
+    And the response should contain 20 Pokemon entries
+
+  @resilience
+  Scenario: The client honours Retry-After on 429 responses
+    Given the API is behind the "rate_limited_once" fault profile
+    When I request Pokemon with name "pikachu"
+    Then the response status should be 200
+    And the fault proxy should have injected 1 "rate_limit" faults
+
+  @resilience
+  Scenario: The client retries after a connection reset
+    Given the API is behind the "reset_once" fault profile
+    When I request Pokemon with ID "25"
+    Then the response status should be 200
+    And the fault proxy should have injected 1 "reset" faults
+
+  @resilience
+  Scenario: The client rides out a burst of 5xx responses
+    Given the API is behind the "error_burst" fault profile
+    When I request ability with identifier "1"
+    Then the response status should be 200
+    And the fault proxy should have injected 2 "error" faults
@@ -1,3 +1,5 @@
+import json
+from urllib.parse import parse_qs, urlparse
 from behave import given, when, then
 from pages.pokemon_page import PokemonPage
 from reusable_functions import ReusableFunctions
@@ -7,7 +9,11 @@ import allure
 @allure.step("Initialize Pokemon API client")
 def step_api_available(context):
     """Initialize Pokemon page object"""
-    context.pokemon_page = PokemonPage()
+    # Keep the routing (e.g. a fault proxy from a @fault_ tag) of the page set up for the scenario
+    previous = getattr(context, "pokemon_page", None)
+    context.pokemon_page = PokemonPage(prefetch_links=getattr(context, "prefetch_links", None),
+                                       retention=getattr(context, "retention", None),
+                                       api=previous.api if previous else None)
     context.functions = ReusableFunctions()
 
 @when('I request Pokemon with ID "{pokemon_id}"')
@@ -31,6 +37,13 @@ def step_request_pokemon_list(context, limit, offset):
     with allure.step(f"Getting Pokemon list with limit={limit}, offset={offset}"):
         context.pokemon_page.get_pokemon_list_with_pagination(limit, offset)
 
+@when('I stream the Pokemon list with limit {limit:d} and offset {offset:d}')
+@allure.step("Stream Pokemon list with pagination")
+def step_stream_pokemon_list(context, limit, offset):
+    """Request a Pokemon list whose results are parsed as they arrive"""
+    with allure.step(f"Streaming Pokemon list with limit={limit}, offset={offset}"):
+        context.pokemon_page.get_pokemon_list_with_pagination(limit, offset, stream=True)
+
 @when('I request ability with identifier "{identifier}"')
 @allure.step("Request ability: {identifier}")
 def step_request_ability(context, identifier):
@@ -54,19 +67,28 @@ def step_request_endpoint(context, endpoint, identifier):
 @allure.step("Get Pokemon species information")
 def step_get_species_info(context):
     """Get species information for current Pokemon"""
-    pokemon_data = context.pokemon_page.parse_response_data()
-    species_url = pokemon_data["species"]["url"]
-    species_id = context.functions.extract_id_from_url(species_url)
-    context.pokemon_page.api.get_species(species_id)
+    context.pokemon_page.follow_link("species.url")
 
 @when('I get the evolution chain for the species')
 @allure.step("Get evolution chain information")
 def step_get_evolution_chain(context):
     """Get evolution chain for current species"""
-    species_data = context.pokemon_page.parse_response_data()
-    evolution_url = species_data["evolution_chain"]["url"]
-    chain_id = context.functions.extract_id_from_url(evolution_url)
-    context.pokemon_page.api.get_evolution_chain(chain_id)
+    context.pokemon_page.follow_link("evolution_chain.url")
+
+@when('I resolve linked "{links}" resources to depth {depth:d}')
+@allure.step("Resolve linked resources to depth {depth}")
+def step_resolve_linked_resources(context, links, depth):
+    """Resolve linked resources in parallel, one round trip per level"""
+    follow = [link.strip() for link in links.split(",")]
+    graph = context.pokemon_page.resolve_linked_resources(depth, follow)
+    allure.attach(f"Resolved {graph.resolved} resources in {graph.levels} round trip(s)", "Linked Resources", allure.attachment_type.TEXT)
+
+@given('the API is behind the "{profile}" fault profile')
+@allure.step("Route API calls through fault profile {profile}")
+def step_use_fault_profile(context, profile):
+    """Send requests through the local fault-injection proxy"""
+    proxy = context.pokemon_page.use_fault_profile(profile)
+    allure.attach(f"Proxy: {proxy.base_url}\nProfile: {proxy.profile}", "Fault Profile", allure.attachment_type.TEXT)
 
 @then('the response status should be {expected_status:d}')
 @allure.step("Validate response status code: {expected_status}")
@@ -86,6 +108,23 @@ def step_validate_response_time(context, max_time):
     assert context.pokemon_page.validate_response_time(float(max_time)), \
         f"Response time {response_time:.3f}s exceeded {max_time} seconds"
 
+@then('the response time should be at least {milliseconds:d} milliseconds')
+@allure.step("Validate response time >= {milliseconds} ms")
+def step_validate_min_response_time(context, milliseconds):
+    """Validate injected latency reached the client"""
+    response_time = context.pokemon_page.last_response.elapsed.total_seconds()
+    assert response_time * 1000 >= milliseconds, \
+        f"Response time {response_time * 1000:.0f}ms is below {milliseconds}ms"
+
+@then('the fault proxy should have injected {count:d} "{fault}" faults')
+@allure.step("Validate {count} injected {fault} faults")
+def step_validate_injected_faults(context, count, fault):
+    """Validate how many faults of a kind the proxy injected"""
+    proxy = context.pokemon_page.fault_proxy
+    assert proxy, "No fault profile is active"
+    allure.attach(str(dict(proxy.stats)), "Fault Proxy Stats", allure.attachment_type.TEXT)
+    assert proxy.stats[fault] == count, f"Expected {count} {fault} faults, got {proxy.stats[fault]}"
+
 @then('the response should contain valid Pokemon data')
 @allure.step("Validate Pokemon response schema")
 def step_validate_pokemon_data(context):
@@ -159,6 +198,33 @@ def step_validate_pokemon_count(context, count):
     allure.attach(f"Expected count: {count}, Actual count: {actual_count}", "Pokemon Count Validation", allure.attachment_type.TEXT)
     assert actual_count == count, f"Expected {count} Pokemon, got {actual_count}"
 
+@then('every streamed Pokemon entry should have a name and url')
+@allure.step("Validate streamed Pokemon entries")
+def step_validate_streamed_entries(context):
+    """Validate each streamed entry as it is parsed"""
+    context.stream_summary = context.pokemon_page.validate_streamed_entries(["name", "url"])
+    allure.attach(json.dumps(context.stream_summary, indent=2), "Streamed List", allure.attachment_type.JSON)
+    invalid = context.stream_summary["invalid"]
+    assert not invalid, f"{len(invalid)} streamed entries lack a name or url, first at index {invalid[0]}"
+
+@then('the number of streamed Pokemon entries should match the reported count')
+@allure.step("Validate streamed Pokemon count")
+def step_validate_streamed_count(context):
+    """Validate the streamed entries cover the collection from the offset"""
+    summary = context.stream_summary
+    params = parse_qs(urlparse(str(context.pokemon_page.last_response.url)).query)
+    limit, offset = int(params["limit"][0]), int(params["offset"][0])
+    expected = max(min(summary["count"] - offset, limit), 0)
+    assert summary["entries"] == expected, f"Expected {expected} streamed Pokemon, got {summary['entries']}"
+
+@then('the linked resource "{path}" should contain "{field}"')
+@allure.step("Validate linked resource {path} contains {field}")
+def step_validate_linked_resource(context, path, field):
+    """Validate a resolved linked resource, hops separated by '>'"""
+    node = context.pokemon_page.resource_graph.follow(*[hop.strip() for hop in path.split(">")])
+    assert node.status_code == 200, f"Linked resource {node.url} returned {node.status_code}"
+    assert field in node.data, f"Linked resource {node.url} should contain '{field}'"
+
 @then('the evolution chain should contain species information')
 @allure.step("Validate evolution chain structure")
 def step_validate_evolution_chain(context):
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Catalog Scenario Generator
+Streams the whole PokéAPI catalog into behave Examples tables
+"""
+
+import argparse
+import sys
+from catalog import CATALOG_FEATURE, catalog_cases, write_examples
+from pokeapi_client import PokeAPIClient
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate catalog-driven behave scenarios")
+    parser.add_argument("--template", default="features/templates/catalog_pokemon.feature.template",
+                       help="Feature template whose Examples table is filled from the catalog")
+    parser.add_argument("--output", default=CATALOG_FEATURE,
+                       help="Generated feature file")
+    parser.add_argument("--shard-index", type=int, help="This worker's shard (default: CATALOG_SHARD_INDEX or 0)")
+    parser.add_argument("--shard-count", type=int, help="Total shards (default: CATALOG_SHARD_COUNT or 1)")
+    parser.add_argument("--sample-per-stratum", type=int, help="Stratified sample size per ID range")
+    parser.add_argument("--max-cases", type=int, help="Stop after this many cases (0 for the whole catalog)")
+    
+    args = parser.parse_args(argv)
+    
+    client = PokeAPIClient()
+    entries = catalog_cases(client, client.config, args.shard_index, args.shard_count,
+                            args.sample_per_stratum, args.max_cases)
+    rows = write_examples(args.template, args.output, entries)
+    
+    print(f"📝 Generated {rows} catalog cases in {args.output}")
+    return 0 if rows else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,62 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+class HedgingPolicy:
+    """Decides when an idempotent request is slow enough to fire a hedge.
+    
+    The delay is the configured percentile of recently observed latencies, so
+    only requests already in the tail of the distribution get a second copy.
+    Each endpoint keeps its own window: a slow listing must not set the hedge
+    delay for fast detail lookups on the same host.
+    """
+    
+    _policies: Dict[Tuple[str, str], "HedgingPolicy"] = {}
+    _registry_lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+    
+    def __init__(self, percentile: float = 95.0, min_samples: int = 20, window: int = 200):
+        self.options = {"percentile": percentile, "min_samples": min_samples, "window": window}
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_endpoint(cls, host: str, endpoint: str, **options) -> "HedgingPolicy":
+        """Return the policy shared by all clients calling one endpoint of a host.
+        
+        Raises ValueError when the options differ from those the shared policy
+        was created with, instead of silently keeping the first caller's.
+        """
+        with cls._registry_lock:
+            policy = cls._policies.get((host, endpoint))
+            if policy is None:
+                policy = cls._policies[(host, endpoint)] = cls(**options)
+            elif dict(policy.options, **options) != policy.options:
+                raise ValueError(f"Hedging for {host}{endpoint} already uses {policy.options}, not {options}")
+            return policy
+    
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Return the shared pool that runs primary and hedge attempts"""
+        with cls._registry_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+            return cls._executor
+    
+    def observe(self, latency: float):
+        """Record the latency of a completed request"""
+        with self._lock:
+            self.latencies.append(latency)
+    
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough samples exist"""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
\ No newline at end of file
@@ -0,0 +1,214 @@
+import codecs
+import json
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+WHITESPACE = " \t\n\r"
+
+# Characters that may continue a number (or follow a literal's prefix) in the next piece of text
+SCALAR_CONTINUATION = "0123456789+-.eE"
+
+
+class JSONListParser:
+    """Incremental parser for a JSON object holding one large array.
+    
+    Text is fed in arbitrary pieces. Items of the ``items_key`` array are
+    returned by feed() as soon as each is complete; every other top-level
+    field is kept in ``fields``. Only the unparsed tail of the text is held,
+    so memory stays at roughly one item however long the array is.
+    """
+    
+    def __init__(self, items_key: str = "results"):
+        self.items_key = items_key
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+    
+    def feed(self, text: str, final: bool = False) -> List[Any]:
+        """Parse more text and return the items it completed"""
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        items = []
+        while self._step(items, final):
+            pass
+        if final and not self.done:
+            raise json.JSONDecodeError("Unexpected end of JSON list body", self._buffer, self._pos)
+        return items
+    
+    def _skip(self) -> Optional[str]:
+        """Skip whitespace and return the next character, or None if the buffer is exhausted"""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+            self._pos += 1
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+    
+    def _expect(self, char: str, expected: str):
+        if char not in expected:
+            raise json.JSONDecodeError(f"Expected one of {expected!r}", self._buffer, self._pos)
+        self._pos += 1
+    
+    def _value(self, final: bool):
+        """Decode one complete value at the cursor, or return (False, None) until more text arrives"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        # A number or literal is only complete once a delimiter follows it: "1" may be the start
+        # of "12", and the decoder stops at "1." or "2e" before a fraction or exponent that is
+        # still to come, so any scalar touching the end of the buffer waits for the next piece
+        if not final and self._buffer[self._pos] not in '{["':
+            tail = end
+            while tail < len(self._buffer) and self._buffer[tail] in SCALAR_CONTINUATION:
+                tail += 1
+            if tail == len(self._buffer):
+                return False, None
+        self._pos = end
+        return True, value
+    
+    def _step(self, items: List[Any], final: bool) -> bool:
+        """Advance the state machine by one token; False when more text is needed"""
+        char = self._skip()
+        if self._state == "done":
+            if char is not None:
+                raise json.JSONDecodeError("Extra data after JSON body", self._buffer, self._pos)
+            return False
+        if char is None:
+            return False
+        if self._state == "start":
+            self._expect(char, "{")
+            self._state = "key_or_end"
+        elif self._state in ("key_or_end", "key"):
+            if char == "}" and self._state == "key_or_end":
+                self._pos += 1
+                self._state = "done"
+                self.done = True
+                return True
+            complete, key = self._value(final)
+            if not complete:
+                return False
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expected a property name", self._buffer, self._pos)
+            self._key = key
+            self._state = "colon"
+        elif self._state == "colon":
+            self._expect(char, ":")
+            self._state = "value"
+        elif self._state == "value":
+            if self._key == self.items_key and char == "[":
+                self._pos += 1
+                self._state = "item_or_end"
+                return True
+            complete, value = self._value(final)
+            if not complete:
+                return False
+            self.fields[self._key] = value
+            self._state = "field_end"
+        elif self._state == "field_end":
+            self._expect(char, ",}")
+            if char == "}":
+                self._state = "done"
+                self.done = True
+            else:
+                self._state = "key"
+        elif self._state in ("item_or_end", "item"):
+            if char == "]" and self._state == "item_or_end":
+                self._pos += 1
+                self._state = "field_end"
+                return True
+            complete, item = self._value(final)
+            if not complete:
+                return False
+            items.append(item)
+            self._state = "item_end"
+        elif self._state == "item_end":
+            self._expect(char, ",]")
+            self._state = "item" if char == "," else "field_end"
+        return True
+
+
+class ListStream:
+    """Items of a JSON list response, parsed as the body arrives.
+    
+    Iterating yields each item of ``items_key`` once it is complete, so a
+    whole collection can be pulled in one request without holding the body
+    or the decoded list in memory. ``count``, ``next`` and ``previous`` are
+    available as soon as they are parsed; PokeAPI sends them before the
+    results, so reading them parses at most the first few items ahead.
+    The response's own ``content`` stays empty; ``decoded_bytes`` grows as
+    the body is read.
+    """
+    
+    def __init__(self, response, chunks: Iterable[bytes], items_key: str = "results",
+                 on_complete: Optional[Callable[[int], None]] = None):
+        self.response = response
+        self.status_code = response.status_code
+        self.items_seen = 0
+        self.decoded_bytes = 0
+        self._chunks = iter(chunks)
+        self._parser = JSONListParser(items_key)
+        self._text = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+        self._pending = deque()
+        self._finished = False
+        self._on_complete = on_complete
+        # An unread requests body (content is False) reads as empty, but it is not marked consumed:
+        # closing a response that was not read to the end must drop its connection rather than
+        # pool it with unread data on it. httpx responses are left alone, since their
+        # iter_bytes() would serve the replaced content instead of the body
+        if getattr(response, "_content", None) is False:
+            response._content = b""
+        response.streamed = True
+        response.decoded_bytes = 0
+    
+    @property
+    def fields(self) -> Dict[str, Any]:
+        return self._parser.fields
+    
+    def field(self, name: str, default: Any = None) -> Any:
+        """A top-level field, reading ahead until it is parsed or the body ends"""
+        while name not in self._parser.fields and not self._finished:
+            self._read()
+        return self._parser.fields.get(name, default)
+    
+    @property
+    def count(self) -> Optional[int]:
+        return self.field("count")
+    
+    @property
+    def next(self) -> Optional[str]:
+        return self.field("next")
+    
+    @property
+    def previous(self) -> Optional[str]:
+        return self.field("previous")
+    
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            while self._pending:
+                self.items_seen += 1
+                yield self._pending.popleft()
+            if self._finished:
+                return
+            self._read()
+    
+    def _read(self):
+        """Parse the next chunk of the body"""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._pending.extend(self._parser.feed(self._text.decode(b"", final=True), final=True))
+            self._finished = True
+            if self._on_complete:
+                self._on_complete(self.decoded_bytes)
+            return
+        self.decoded_bytes += len(chunk)
+        self.response.decoded_bytes = self.decoded_bytes
+        self._pending.extend(self._parser.feed(self._text.decode(chunk)))
+    
+    def close(self):
+        """Stop reading and release the connection"""
+        self._finished = True
+        self.response.close()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import gc
+import os
+import resource
+import statistics
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+
+def rss_kb() -> float:
+    """Resident set size of this process in KiB"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError):
+        # Peak rather than current RSS, but still shows sustained growth
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def open_descriptors() -> Dict[str, int]:
+    """Open file descriptors and sockets of this process (Linux only, zeros elsewhere)"""
+    fd_dir = "/proc/self/fd"
+    counts = {"fds": 0, "sockets": 0}
+    if not os.path.isdir(fd_dir):
+        return counts
+    for fd in os.listdir(fd_dir):
+        try:
+            target = os.readlink(os.path.join(fd_dir, fd))
+        except OSError:
+            continue
+        counts["fds"] += 1
+        if target.startswith("socket:"):
+            counts["sockets"] += 1
+    return counts
+
+
+def slope_per_minute(points: List[tuple]) -> float:
+    """Theil-Sen slope of (seconds, value) points, per minute.
+    
+    The median of pairwise slopes ignores one-off steps (an allocator arena,
+    a cache filling up) and only reports growth that is sustained.
+    """
+    slopes = [
+        (y2 - y1) / (x2 - x1)
+        for i, (x1, y1) in enumerate(points)
+        for x2, y2 in points[i + 1:]
+        if x2 != x1
+    ]
+    return statistics.median(slopes) * 60 if slopes else 0.0
+
+
+class LeakMonitor:
+    """Samples process resources during a soak run and flags sustained growth.
+    
+    Samples taken during the warm-up are kept but not used for the trend, so
+    caches and connection pools filling up are not mistaken for leaks.
+    """
+    
+    METRICS = ("rss_kb", "fds", "sockets", "traced_kb")
+    
+    def __init__(self, warmup: float = 60.0, trace_depth: int = 1, top: int = 10):
+        self.warmup = warmup
+        self.top = top
+        self.samples: List[Dict[str, float]] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._start = time.monotonic()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(trace_depth)
+    
+    def sample(self, iteration: int) -> Dict[str, float]:
+        # Collect reference cycles first so pending garbage is not counted as growth
+        gc.collect()
+        elapsed = time.monotonic() - self._start
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ])
+        traced = sum(stat.size for stat in snapshot.statistics("filename"))
+        sample = {"elapsed": elapsed, "iteration": iteration, "rss_kb": rss_kb(),
+                  "traced_kb": traced / 1024, **open_descriptors()}
+        self.samples.append(sample)
+        
+        if self._baseline is None and elapsed >= self.warmup:
+            self._baseline = snapshot
+        self._last = snapshot
+        return sample
+    
+    def slopes(self) -> Dict[str, float]:
+        """Growth per minute of every metric after the warm-up"""
+        steady = [sample for sample in self.samples if sample["elapsed"] >= self.warmup]
+        return {metric: slope_per_minute([(sample["elapsed"], sample[metric]) for sample in steady])
+                for metric in self.METRICS}
+    
+    def growing_sites(self) -> List[Dict[str, Any]]:
+        """Allocation sites that grew the most since the end of the warm-up"""
+        if self._baseline is None or self._last is None:
+            return []
+        stats = self._last.compare_to(self._baseline, "traceback")
+        return [{"site": str(stat.traceback[0]), "size_kb": stat.size_diff / 1024, "count": stat.count_diff}
+                for stat in stats[:self.top] if stat.size_diff > 0]
+    
+    def evaluate(self, thresholds: Dict[str, float]) -> Dict[str, Any]:
+        """Compare post-warm-up slopes with per-minute thresholds"""
+        slopes = self.slopes()
+        failures = [
+            f"{metric} grows {slopes[metric]:.2f}/min (limit {limit}/min)"
+            for metric, limit in thresholds.items()
+            if limit is not None and slopes[metric] > limit
+        ]
+        return {
+            "passed": not failures,
+            "failures": failures,
+            "slopes_per_minute": slopes,
+            "growing_sites": self.growing_sites(),
+            "samples": self.samples
+        }
\ No newline at end of file
@@ -0,0 +1,163 @@
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from load_engine import LatencyHistogram, LoadGenerator
+
+# Newline-delimited JSON messages:
+#   worker -> coordinator  {"type": "hello", "host", "pid"}
+#   coordinator -> worker  {"type": "plan", "plan", "start_at", "report_interval", "seed"}
+#   worker -> coordinator  {"type": "interval", "time", "requests", "errors", "histogram"} ... {"type": "done"}
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def run_worker(host: str, port: int, connect_timeout: float = 30.0):
+    """Connect to a coordinator, run the plan it sends and stream interval histograms back"""
+    sock = socket.create_connection((host, port), timeout=connect_timeout)
+    sock.settimeout(None)
+    reader = sock.makefile('r')
+    send_message(sock, {"type": "hello", "host": socket.gethostname(), "pid": os.getpid()})
+    message = json.loads(reader.readline())
+    
+    def report(interval):
+        send_message(sock, {
+            "type": "interval",
+            "time": time.time(),
+            "requests": interval["requests"],
+            "errors": dict(interval["errors"]),
+            "histogram": interval["histogram"].to_dict()
+        })
+    
+    generator = LoadGenerator(message["plan"], seed=message.get("seed"))
+    generator.run(start_at=message["start_at"], on_report=report, report_interval=message["report_interval"])
+    send_message(sock, {"type": "done"})
+    sock.close()
+
+
+class Coordinator:
+    """Hands one workload plan to every worker, starts them together and merges their results.
+    
+    Workers start at the same wall-clock time (start_at), so hosts need
+    reasonably synchronized clocks; the lead time covers plan delivery.
+    """
+    
+    def __init__(self, plan: Dict[str, Any], workers: int, listen: Tuple[str, int] = ("0.0.0.0", 0),
+                 report_interval: float = 1.0, lead_time: float = 2.0):
+        self.plan = plan
+        self.workers = workers
+        self.report_interval = report_interval
+        self.lead_time = lead_time
+        self.server = socket.create_server(listen)
+        self.histogram = LatencyHistogram()
+        self.errors = Counter()
+        self.requests = 0
+        self.timeline: Dict[int, int] = Counter()
+        self.per_worker: Dict[str, int] = Counter()
+        self.start_at: Optional[float] = None
+        self.processes: List[subprocess.Popen] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server.getsockname()[:2]
+    
+    def spawn_local_workers(self, count: int, script: str = "run_load.py") -> List[subprocess.Popen]:
+        """Start worker processes on this machine connected to this coordinator"""
+        port = self.address[1]
+        processes = [subprocess.Popen([sys.executable, script, "worker", "--connect", f"127.0.0.1:{port}"])
+                     for _ in range(count)]
+        self.processes.extend(processes)
+        return processes
+    
+    def _collect(self, name: str, reader):
+        for line in reader:
+            message = json.loads(line)
+            if message["type"] == "done":
+                break
+            histogram = LatencyHistogram.from_dict(message["histogram"])
+            with self._lock:
+                self.histogram.merge(histogram)
+                self.errors.update(message["errors"])
+                self.requests += message["requests"]
+                self.per_worker[name] += message["requests"]
+                # Intervals are sent as they end, so bucket them by the second they started in
+                started = message["time"] - self.report_interval - self.start_at
+                self.timeline[max(0, math.floor(started))] += message["requests"]
+    
+    def run(self, accept_timeout: float = 60.0, on_progress=None) -> Dict[str, Any]:
+        """Wait for every worker, run the plan and return the merged report.
+        
+        Raises TimeoutError when not every worker connects within accept_timeout.
+        On any error the local workers are terminated rather than left orphaned.
+        """
+        connections = []
+        try:
+            self._accept(connections, accept_timeout)
+            return self._run_plan(connections, on_progress)
+        except BaseException:
+            for process in self.processes:
+                if process.poll() is None:
+                    process.terminate()
+            raise
+        finally:
+            for _, sock, _ in connections:
+                sock.close()
+            self.server.close()
+    
+    def _accept(self, connections: List[Tuple[str, socket.socket, Any]], accept_timeout: float):
+        """Add (name, socket, reader) for each worker as it says hello"""
+        self.server.settimeout(accept_timeout)
+        while len(connections) < self.workers:
+            try:
+                sock, _ = self.server.accept()
+            except socket.timeout:
+                raise TimeoutError(f"Only {len(connections)} of {self.workers} workers connected "
+                                   f"within {accept_timeout}s")
+            reader = sock.makefile('r')
+            try:
+                hello = json.loads(reader.readline())
+            except BaseException:
+                sock.close()
+                raise
+            connections.append((f"{hello['host']}:{hello['pid']}", sock, reader))
+    
+    def _run_plan(self, connections: List[Tuple[str, socket.socket, Any]], on_progress) -> Dict[str, Any]:
+        """Send the plan with a common start time and merge results until every worker is done"""
+        self.start_at = time.time() + self.lead_time
+        for seed, (_, sock, _) in enumerate(connections):
+            send_message(sock, {"type": "plan", "plan": self.plan, "start_at": self.start_at,
+                                "report_interval": self.report_interval, "seed": seed})
+        
+        collectors = [threading.Thread(target=self._collect, args=(name, reader), daemon=True)
+                      for name, _, reader in connections]
+        for collector in collectors:
+            collector.start()
+        while any(collector.is_alive() for collector in collectors):
+            time.sleep(self.report_interval)
+            if on_progress:
+                with self._lock:
+                    on_progress(self.requests, time.time() - self.start_at)
+        return self.report()
+    
+    def report(self) -> Dict[str, Any]:
+        duration = self.plan["duration"]
+        return {
+            "plan": self.plan,
+            "workers": self.workers,
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "throughput": self.requests / duration if duration else None,
+            "latency": self.histogram.summary(),
+            "per_worker": dict(self.per_worker),
+            "timeline": [self.timeline[second] for second in range(max(self.timeline, default=-1) + 1)],
+            "histogram": self.histogram.to_dict()
+        }
\ No newline at end of file
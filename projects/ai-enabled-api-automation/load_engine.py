@@ -0,0 +1,152 @@
+import logging
+import math
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+from api_client import APIClient
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that can be merged across workers.
+    
+    Buckets grow by a fixed ratio (2% by default), so any percentile is
+    within that relative error however many samples are recorded, and the
+    histogram stays a few hundred integers whatever the request count.
+    """
+    
+    def __init__(self, ratio: float = 1.02):
+        self.ratio = ratio
+        self._log_ratio = math.log(ratio)
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def record(self, seconds: float):
+        microseconds = max(seconds * 1e6, 1.0)
+        self.buckets[int(math.log(microseconds) / self._log_ratio)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+    
+    def merge(self, other: "LatencyHistogram"):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given percentile, in seconds"""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.ratio ** (bucket + 1) / 1e6, self.max)
+        return self.max
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ratio": self.ratio, "buckets": {str(key): value for key, value in self.buckets.items()},
+                "count": self.count, "total": self.total, "min": self.min, "max": self.max}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["ratio"])
+        histogram.buckets.update({int(key): value for key, value in data["buckets"].items()})
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
+
+
+class LoadGenerator:
+    """Closed-loop load from one process: each thread sends requests back to back.
+    
+    A plan is a plain dict so it can be sent to remote workers:
+    {"base_url", "endpoints": {path: weight}, "duration", "concurrency"}.
+    Latencies and errors are collected per reporting interval and handed to
+    on_report, which lets a worker stream them while the run is going.
+    """
+    
+    def __init__(self, plan: Dict[str, Any], seed: Optional[int] = None):
+        self.plan = plan
+        self.paths = list(plan["endpoints"])
+        self.weights = [plan["endpoints"][path] for path in self.paths]
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._interval = self._new_interval()
+    
+    @staticmethod
+    def _new_interval() -> Dict[str, Any]:
+        return {"histogram": LatencyHistogram(), "errors": Counter(), "requests": 0}
+    
+    def _record(self, latency: float, error: Optional[str]):
+        with self._lock:
+            self._interval["requests"] += 1
+            if error:
+                self._interval["errors"][error] += 1
+            else:
+                self._interval["histogram"].record(latency)
+    
+    def take_interval(self) -> Dict[str, Any]:
+        """Return and reset what was recorded since the last call"""
+        with self._lock:
+            interval, self._interval = self._interval, self._new_interval()
+        return interval
+    
+    def _worker(self, index: int, end_time: float):
+        client = APIClient(self.plan["base_url"], timeout=self.plan.get("timeout", 10),
+                           retry_count=0, circuit_breaker={"enabled": False})
+        client.logger.setLevel(logging.WARNING)
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        try:
+            while time.time() < end_time:
+                path = rng.choices(self.paths, self.weights)[0]
+                start = time.perf_counter()
+                error = None
+                try:
+                    response = client.get(path)
+                    if response.status_code >= 400:
+                        error = f"HTTP {response.status_code}"
+                except Exception as e:
+                    error = type(e).__name__
+                self._record(time.perf_counter() - start, error)
+        finally:
+            client.close()
+    
+    def run(self, start_at: Optional[float] = None, on_report=None, report_interval: float = 1.0):
+        """Wait until start_at (wall clock), generate load for the plan's duration and report intervals"""
+        if start_at:
+            time.sleep(max(0.0, start_at - time.time()))
+        end_time = time.time() + self.plan["duration"]
+        threads = [threading.Thread(target=self._worker, args=(index, end_time), daemon=True)
+                   for index in range(self.plan["concurrency"])]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(report_interval)
+            if on_report:
+                on_report(self.take_interval())
+        if on_report:
+            on_report(self.take_interval())
\ No newline at end of file
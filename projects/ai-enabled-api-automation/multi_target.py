@@ -0,0 +1,209 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from api_client import APIClient
+from load_engine import LatencyHistogram
+from response_snapshots import diff_trees, hash_tree
+from telemetry import Telemetry
+
+# Changes listed per request in the report; the total is always counted
+MAX_CHANGES = 20
+
+
+def suite_paths(metrics_file: str = "reports/test_metrics.json") -> List[str]:
+    """GET paths recorded by the last suite run, most requested first"""
+    if not os.path.exists(metrics_file):
+        return []
+    with open(metrics_file, 'r') as f:
+        paths = json.load(f).get("telemetry", {}).get("paths", {})
+    return sorted(paths, key=lambda path: (-paths[path], path))
+
+
+def parse_targets(items: List[str]) -> Dict[str, str]:
+    """name=url pairs from the command line; a bare URL is named after its host"""
+    targets = {}
+    for item in items:
+        name, separator, url = item.partition("=")
+        if not separator or "://" in name:
+            name, url = item.split("://", 1)[-1].split("/", 1)[0], item
+        targets[name] = url.rstrip("/")
+    return targets
+
+
+def normalize_links(value: Any, base_urls: List[str]) -> Any:
+    """Replace any compared base URL in string values so links compare equal across targets.
+    
+    A mirror or cache may return links to its own host or pass through the
+    origin's; either points at the same resource.
+    """
+    if isinstance(value, dict):
+        return {key: normalize_links(child, base_urls) for key, child in value.items()}
+    if isinstance(value, list):
+        return [normalize_links(child, base_urls) for child in value]
+    if isinstance(value, str):
+        for base_url in base_urls:
+            if value.startswith(base_url):
+                return "{base_url}" + value[len(base_url):]
+    return value
+
+
+class TargetResult:
+    """Latency, errors and response hash trees collected from one base URL"""
+    
+    def __init__(self, name: str, base_url: str):
+        self.name = name
+        self.base_url = base_url
+        self.latency = LatencyHistogram()
+        self.endpoints: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.endpoint_errors: Dict[str, Counter] = defaultdict(Counter)
+        self.errors = Counter()
+        self.statuses: Dict[str, int] = {}
+        self.endpoint_of: Dict[str, str] = {}
+        self.trees: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, path: str, endpoint: str, latency: float, status: Optional[int] = None,
+               tree: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        with self._lock:
+            self.requests += 1
+            self.endpoint_of[path] = endpoint
+            if error:
+                self.errors[error] += 1
+                self.endpoint_errors[endpoint][error] += 1
+                self.statuses.setdefault(path, None)
+                return
+            self.latency.record(latency)
+            self.endpoints[endpoint].record(latency)
+            self.statuses[path] = status
+            if tree is not None:
+                self.trees[path] = tree
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "duration": round(self.duration, 3),
+            "throughput": round(self.requests / self.duration, 1) if self.duration else None,
+            "latency": self.latency.summary()
+        }
+
+
+class MultiTargetRun:
+    """Sends the same GET requests to several base URLs at once and compares the results.
+    
+    Every target gets its own client and thread pool and all targets run
+    concurrently, so each sees the same request mix at the same time. Each
+    request is repeated `repeat` times for latency; the first response body
+    is kept as a hash tree (with the compared base URLs normalized out of
+    links) and compared with the baseline target's, descending only into
+    subtrees whose hashes differ. Retries, hedging and the circuit breaker
+    are off so latencies and failures are each target's own.
+    """
+    
+    def __init__(self, targets: Dict[str, str], paths: List[str], client_options: Dict[str, Any],
+                 repeat: int = 1, workers: int = 8):
+        if not targets:
+            raise ValueError("At least one target is required")
+        self.targets = targets
+        # Longest first so a base URL that prefixes another does not match its links
+        self.base_urls = sorted((url.rstrip("/") for url in targets.values()), key=len, reverse=True)
+        self.baseline = next(iter(targets))
+        self.paths = paths
+        self.client_options = client_options
+        self.repeat = max(repeat, 1)
+        self.workers = workers
+        self.results: Dict[str, TargetResult] = {}
+    
+    def _run_target(self, name: str, base_url: str) -> TargetResult:
+        options = dict(self.client_options, base_url=base_url, telemetry=Telemetry(), retry_count=0,
+                       hedging=None, circuit_breaker={"enabled": False},
+                       concurrency={"enabled": True, "workers": self.workers})
+        client = APIClient(**options)
+        client.logger.setLevel(logging.WARNING)
+        result = TargetResult(name, client.base_url)
+        
+        def send(job: Tuple[str, int]):
+            path, attempt = job
+            endpoint = client.endpoint_key(f"{client.base_url}{path}")
+            start = time.perf_counter()
+            try:
+                response = client.get(path)
+            except Exception as e:
+                result.record(path, endpoint, time.perf_counter() - start, error=type(e).__name__)
+                return
+            latency = time.perf_counter() - start
+            tree = None
+            if attempt == 0:
+                try:
+                    tree = hash_tree(normalize_links(response.json(), self.base_urls))
+                except ValueError:
+                    tree = hash_tree(response.text)
+            result.record(path, endpoint, latency, response.status_code, tree)
+        
+        jobs = [(path, attempt) for attempt in range(self.repeat) for path in self.paths]
+        start = time.perf_counter()
+        try:
+            client.map(send, jobs)
+        finally:
+            result.duration = time.perf_counter() - start
+            client.close()
+        return result
+    
+    def run(self) -> Dict[str, Any]:
+        """Run every target concurrently and return the comparison report"""
+        with ThreadPoolExecutor(max_workers=len(self.targets), thread_name_prefix="target") as executor:
+            futures = {name: executor.submit(self._run_target, name, url) for name, url in self.targets.items()}
+            self.results = {name: future.result() for name, future in futures.items()}
+        return self.report()
+    
+    def diffs(self) -> Dict[str, Dict[str, Any]]:
+        """Per request path, how each target's response differs from the baseline's"""
+        baseline = self.results[self.baseline]
+        diffs = {}
+        for path in self.paths:
+            for name, result in self.results.items():
+                if name == self.baseline:
+                    continue
+                expected, actual = baseline.statuses.get(path), result.statuses.get(path)
+                if expected != actual:
+                    diffs.setdefault(path, {})[name] = {"status": [expected, actual]}
+                    continue
+                if path not in baseline.trees or path not in result.trees:
+                    continue
+                changes = diff_trees(baseline.trees[path], result.trees[path])
+                if changes:
+                    diffs.setdefault(path, {})[name] = {"changed": len(changes), "changes": changes[:MAX_CHANGES]}
+        return diffs
+    
+    def report(self) -> Dict[str, Any]:
+        """Side-by-side latency and throughput per target and endpoint, plus the functional diff"""
+        endpoints = defaultdict(dict)
+        for name, result in self.results.items():
+            for endpoint in result.endpoints.keys() | result.endpoint_errors.keys():
+                summary = result.endpoints[endpoint].summary()
+                summary["errors"] = dict(result.endpoint_errors[endpoint])
+                endpoints[endpoint][name] = summary
+        
+        diffs = self.diffs()
+        mismatches = defaultdict(Counter)
+        for path, targets in diffs.items():
+            for name in targets:
+                mismatches[self.results[self.baseline].endpoint_of.get(path, path)][name] += 1
+        
+        return {
+            "baseline": self.baseline,
+            "paths": len(self.paths),
+            "repeat": self.repeat,
+            "targets": {name: result.summary() for name, result in self.results.items()},
+            "endpoints": dict(endpoints),
+            "mismatches": {endpoint: dict(counts) for endpoint, counts in mismatches.items()},
+            "diffs": diffs
+        }
\ No newline at end of file
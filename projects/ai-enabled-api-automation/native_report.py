@@ -0,0 +1,615 @@
+import glob
+import gzip
+import hashlib
+import html
+import json
+import math
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from load_engine import LatencyHistogram
+
+# Every source is normalized to one result dict:
+#   {"key", "feature", "name", "status", "duration" (seconds), "start" (epoch seconds or None),
+#    "message", "tags", "source"}
+# Results with the same key (Allure historyId, or feature + name) are the same test;
+# the latest run wins and earlier ones are counted as retries.
+
+STATUSES = ("passed", "failed", "broken", "skipped", "unknown")
+
+STATUS_COLORS = {
+    "passed": "#4caf50",
+    "failed": "#e53935",
+    "broken": "#fb8c00",
+    "skipped": "#9e9e9e",
+    "unknown": "#8e24aa"
+}
+
+STYLE = """body { font-family: -apple-system, Segoe UI, Helvetica, Arial, sans-serif; margin: 0; color: #222; background: #f5f6f8; }
+header { background: #263238; color: #fff; padding: 16px 32px; }
+header a { color: #80cbc4; }
+main { padding: 24px 32px; }
+h1 { margin: 0; font-size: 22px; }
+h2 { font-size: 17px; margin: 28px 0 10px; }
+.meta { color: #b0bec5; font-size: 13px; margin-top: 4px; }
+.cards { display: flex; flex-wrap: wrap; gap: 12px; }
+.card { background: #fff; border-radius: 6px; padding: 12px 18px; min-width: 110px; box-shadow: 0 1px 2px rgba(0,0,0,.1); }
+.card b { display: block; font-size: 22px; }
+table { border-collapse: collapse; width: 100%; background: #fff; font-size: 13px; box-shadow: 0 1px 2px rgba(0,0,0,.1); }
+th, td { text-align: left; padding: 6px 10px; border-bottom: 1px solid #eceff1; vertical-align: top; }
+th { background: #eceff1; }
+td.num, th.num { text-align: right; white-space: nowrap; }
+.status { font-weight: 600; text-transform: uppercase; font-size: 11px; }
+.passed { color: #2e7d32; } .failed { color: #c62828; } .broken { color: #ef6c00; }
+.skipped { color: #757575; } .unknown { color: #6a1b9a; }
+pre { white-space: pre-wrap; margin: 4px 0 0; font-size: 12px; color: #b71c1c; }
+svg { background: #fff; box-shadow: 0 1px 2px rgba(0,0,0,.1); }
+svg text { font-size: 11px; fill: #455a64; }
+"""
+
+
+def _millis_to_seconds(value: Optional[float]) -> Optional[float]:
+    return value / 1000 if value is not None else None
+
+
+def read_allure_result(path: str) -> Optional[Dict[str, Any]]:
+    """Normalized result from one Allure *-result.json file, or None if it cannot be read"""
+    with open(path, 'r') as f:
+        try:
+            data = json.load(f)
+        except ValueError:
+            return None
+    name = os.path.basename(path)
+    labels = data.get("labels", [])
+    feature = next((label["value"] for label in labels if label.get("name") == "feature"), None)
+    start, stop = data.get("start"), data.get("stop")
+    return {
+        "key": data.get("historyId") or data.get("fullName") or name,
+        "feature": feature or data.get("fullName", "").partition(":")[0] or "Unknown",
+        "name": data.get("name", name),
+        "status": data.get("status") if data.get("status") in STATUSES else "unknown",
+        "duration": (stop - start) / 1000 if start and stop else 0.0,
+        "start": _millis_to_seconds(start),
+        "message": (data.get("statusDetails") or {}).get("message"),
+        "tags": [label["value"] for label in labels if label.get("name") == "tag"],
+        "source": name
+    }
+
+
+def allure_result_paths(results_dir: str) -> List[str]:
+    if not os.path.isdir(results_dir):
+        return []
+    return [entry.path for entry in os.scandir(results_dir) if entry.name.endswith("-result.json")]
+
+
+def iter_junit_results(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield normalized results from JUnit XML files, one testcase element at a time"""
+    for path in paths:
+        try:
+            for _, element in ElementTree.iterparse(path, events=("end",)):
+                if element.tag != "testcase":
+                    continue
+                status, message = "passed", None
+                for child, child_status in (("failure", "failed"), ("error", "broken"), ("skipped", "skipped")):
+                    found = element.find(child)
+                    if found is not None:
+                        status, message = child_status, found.get("message") or (found.text or "").strip() or None
+                        break
+                # behave writes "<file>.<Feature name>", pytest "<module>.<Class>"
+                feature = (element.get("classname") or "Unknown").split(".", 1)[-1]
+                yield {
+                    "key": f"{feature}::{element.get('name')}",
+                    "feature": feature,
+                    "name": element.get("name", ""),
+                    "status": status,
+                    "duration": float(element.get("time") or 0),
+                    "start": None,
+                    "message": message,
+                    "tags": [],
+                    "source": os.path.basename(path)
+                }
+                element.clear()
+        except ElementTree.ParseError:
+            continue
+
+
+def default_junit_paths(reports_dir: str = "reports") -> List[str]:
+    """JUnit files written by behave (reports/TESTS-*.xml) and the in-process runner (reports/junit/*/)"""
+    return sorted(glob.glob(os.path.join(reports_dir, "*.xml")) +
+                  glob.glob(os.path.join(reports_dir, "junit", "**", "*.xml"), recursive=True))
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "feature"
+
+
+class FeatureSummary:
+    """Status counts and a duration histogram for the results of one feature"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.slug = slugify(name)
+        self.counts = Counter()
+        self.durations = LatencyHistogram()
+    
+    def add(self, result: Dict[str, Any]):
+        self.counts[result["status"]] += 1
+        self.durations.record(result["duration"])
+    
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+    
+    @property
+    def pass_rate(self) -> float:
+        return self.counts["passed"] / self.total * 100 if self.total else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": dict(self.counts), "durations": self.durations.to_dict()}
+    
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "FeatureSummary":
+        summary = cls(name)
+        summary.counts.update(data["counts"])
+        summary.durations = LatencyHistogram.from_dict(data["durations"])
+        return summary
+
+
+class ReportData:
+    """Results from every source, deduplicated by key, plus the run metrics.
+    
+    Saved next to the report with a manifest of the source files it was built
+    from (size, mtime, hash and the result keys each file produced), so the
+    next build only reads new or changed files, updates the summaries of the
+    features they touch and rewrites just those pages.
+    """
+    
+    STATE_FILE = "report_state.json.gz"
+    HISTORY_LIMIT = 100
+    
+    def __init__(self):
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.retries = Counter()
+        self.metrics: Dict[str, Any] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.summaries: Dict[str, FeatureSummary] = {}
+        self.history: List[Dict[str, Any]] = []
+        self.affected: Set[str] = set()
+        self.changes = Counter()
+        self.dirty = False
+    
+    def add(self, result: Dict[str, Any]):
+        """Add a result; a later run of the same test replaces the earlier one"""
+        key = result["key"]
+        current = self.results.get(key)
+        if current is not None:
+            if current["source"] != result["source"]:
+                self.retries[key] += 1
+            if (current["start"] or 0) > (result["start"] or 0):
+                return
+            self.affected.add(current["feature"])
+        self.results[key] = result
+        self.affected.add(result["feature"])
+    
+    def remove(self, key: str, source: str):
+        """Drop a result if it still comes from the given source file"""
+        current = self.results.get(key)
+        if current is not None and current["source"] == source:
+            del self.results[key]
+            self.affected.add(current["feature"])
+    
+    @staticmethod
+    def _file_hash(path: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _changed(self, path: str) -> Optional[Tuple[os.stat_result, str]]:
+        """Return the file's stat and hash if it is new or its content changed since it was ingested"""
+        stat = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return None
+        digest = self._file_hash(path)
+        if entry and entry["hash"] == digest:
+            entry["mtime"] = stat.st_mtime_ns
+            self.dirty = True
+            return None
+        return stat, digest
+    
+    def ingest(self, paths: Iterable[str], kind: str):
+        """Read new or changed Allure ("allure") or JUnit ("junit") files into the data"""
+        covered = None
+        for path in paths:
+            changed = self._changed(path)
+            if changed is None:
+                continue
+            stat, digest = changed
+            self.dirty = True
+            entry = self.files.get(path)
+            self.changes["changed" if entry else "new"] += 1
+            source = os.path.basename(path)
+            for key in entry["keys"] if entry else []:
+                self.remove(key, source)
+            
+            if kind == "allure":
+                result = read_allure_result(path)
+                results = [result] if result else []
+            else:
+                # JUnit only fills in tests that no Allure result covers
+                if covered is None:
+                    covered = {(result["feature"], result["name"]) for result in self.results.values()
+                               if not result["source"].endswith(".xml")}
+                results = [result for result in iter_junit_results([path])
+                           if (result["feature"], result["name"]) not in covered]
+            for result in results:
+                self.add(result)
+            self.files[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest,
+                                "keys": [result["key"] for result in results]}
+    
+    def forget_missing(self, present: Iterable[str]):
+        """Drop results of source files that no longer exist"""
+        for path in set(self.files) - set(present):
+            self.dirty = True
+            self.changes["removed"] += 1
+            source = os.path.basename(path)
+            for key in self.files.pop(path)["keys"]:
+                self.remove(key, source)
+    
+    def refresh_summaries(self) -> Set[str]:
+        """Recompute the summaries of affected features; returns the affected feature names"""
+        affected, self.affected = self.affected, set()
+        for name in affected:
+            self.summaries.pop(name, None)
+        for result in self.results.values():
+            if result["feature"] in affected:
+                if result["feature"] not in self.summaries:
+                    self.summaries[result["feature"]] = FeatureSummary(result["feature"])
+                self.summaries[result["feature"]].add(result)
+        return affected
+    
+    def features(self) -> Dict[str, FeatureSummary]:
+        return dict(sorted(self.summaries.items()))
+    
+    def record_trend(self):
+        """Append this build's status counts to the trend history"""
+        counts = Counter()
+        for summary in self.summaries.values():
+            counts.update(summary.counts)
+        self.history.append({"time": time.time(), "total": sum(counts.values()), "counts": dict(counts),
+                             "files": dict(self.changes)})
+        del self.history[:-self.HISTORY_LIMIT]
+    
+    def load_metrics(self, metrics_file: str):
+        if os.path.exists(metrics_file):
+            with open(metrics_file, 'r') as f:
+                self.metrics = json.load(f)
+    
+    def response_times(self) -> List[float]:
+        """API response times from test_metrics.json, falling back to test durations"""
+        times = [entry["response_time"] for entry in self.metrics.get("performance_data", [])
+                 if entry.get("response_time") is not None]
+        return times or [result["duration"] for result in self.results.values()]
+    
+    def save(self, output_dir: str):
+        state = {
+            "files": self.files,
+            "results": list(self.results.values()),
+            "retries": dict(self.retries),
+            "summaries": {name: summary.to_dict() for name, summary in self.summaries.items()},
+            "history": self.history
+        }
+        with gzip.open(os.path.join(output_dir, self.STATE_FILE), 'wb', compresslevel=1) as f:
+            f.write(json.dumps(state, separators=(",", ":")).encode())
+        self.dirty = False
+    
+    @classmethod
+    def load(cls, output_dir: str, history_only: bool = False) -> "ReportData":
+        """Data saved by the previous build, or empty data; history_only keeps just the trend"""
+        data = cls()
+        path = os.path.join(output_dir, cls.STATE_FILE)
+        if not os.path.exists(path):
+            return data
+        with gzip.open(path, 'rt') as f:
+            state = json.load(f)
+        data.history = state.get("history", [])
+        if not history_only:
+            data.files = state["files"]
+            data.results = {result["key"]: result for result in state["results"]}
+            data.retries = Counter(state["retries"])
+            data.summaries = {name: FeatureSummary.from_dict(name, summary)
+                              for name, summary in state["summaries"].items()}
+        return data
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    return f"{seconds * 1000:.0f}ms" if seconds < 1 else f"{seconds:.2f}s"
+
+
+def _format_bytes(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def latency_histogram_svg(values: List[float], width: int = 640, height: int = 220, bins: int = 24) -> str:
+    """SVG bar chart of a latency distribution on log-spaced bins"""
+    if not values:
+        return "<p>No latency data.</p>"
+    low = max(min(values), 1e-4)
+    high = max(max(values), low * 1.01)
+    step = (math.log(high) - math.log(low)) / bins
+    counts = [0] * bins
+    for value in values:
+        index = int((math.log(max(value, low)) - math.log(low)) / step) if step else 0
+        counts[min(index, bins - 1)] += 1
+    
+    left, bottom, top = 40, 30, 10
+    bar_width = (width - left - 10) / bins
+    peak = max(counts)
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    for index, count in enumerate(counts):
+        bar_height = (height - bottom - top) * count / peak
+        x = left + index * bar_width
+        y = height - bottom - bar_height
+        upper = math.exp(math.log(low) + (index + 1) * step)
+        parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width - 2:.1f}" height="{bar_height:.1f}" '
+                     f'fill="#42a5f5"><title>≤ {_format_seconds(upper)}: {count}</title></rect>')
+    for index in range(0, bins + 1, max(bins // 6, 1)):
+        x = left + index * bar_width
+        edge = math.exp(math.log(low) + index * step)
+        parts.append(f'<text x="{x:.1f}" y="{height - 12}" text-anchor="middle">{_format_seconds(edge)}</text>')
+    parts.append(f'<text x="{left - 6}" y="{top + 10}" text-anchor="end">{peak}</text>')
+    parts.append(f'<text x="{left - 6}" y="{height - bottom}" text-anchor="end">0</text>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def feature_latency_svg(features: List[FeatureSummary], width: int = 640, row_height: int = 22) -> str:
+    """SVG horizontal bars of p50, p90 and max test duration per feature"""
+    rows = [feature for feature in features if feature.durations.count]
+    if not rows:
+        return "<p>No duration data.</p>"
+    label_width = 220
+    longest = max(feature.durations.max for feature in rows)
+    scale = (width - label_width - 170) / longest if longest else 0
+    height = row_height * len(rows) + 24
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    for index, feature in enumerate(rows):
+        y = index * row_height + 6
+        durations = feature.durations
+        parts.append(f'<text x="{label_width - 8}" y="{y + 12}" text-anchor="end">{html.escape(feature.name[:32])}</text>')
+        for value, color in ((durations.max, "#e3f2fd"), (durations.percentile(90), "#90caf9"),
+                             (durations.percentile(50), "#1e88e5")):
+            parts.append(f'<rect x="{label_width}" y="{y}" width="{max(value * scale, 1):.1f}" '
+                         f'height="{row_height - 8}" fill="{color}"/>')
+        parts.append(f'<text x="{label_width + durations.max * scale + 6:.1f}" y="{y + 12}">'
+                     f'p50 {_format_seconds(durations.percentile(50))} · max {_format_seconds(durations.max)}</text>')
+    parts.append(f'<text x="{label_width}" y="{height - 4}">dark: p50 · mid: p90 · light: max</text>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def status_bar_svg(counts: Counter, width: int = 640, height: int = 18) -> str:
+    """One stacked bar of status counts"""
+    total = sum(counts.values()) or 1
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    x = 0.0
+    for status in STATUSES:
+        if counts[status]:
+            bar_width = width * counts[status] / total
+            parts.append(f'<rect x="{x:.1f}" y="0" width="{bar_width:.1f}" height="{height}" '
+                         f'fill="{STATUS_COLORS[status]}"><title>{status}: {counts[status]}</title></rect>')
+            x += bar_width
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def trend_svg(history: List[Dict[str, Any]], width: int = 640, height: int = 160) -> str:
+    """Stacked status bars, one per report build"""
+    if len(history) < 2:
+        return "<p>The trend appears after the next build.</p>"
+    left, bottom = 40, 20
+    peak = max(point["total"] for point in history) or 1
+    bar_width = (width - left - 10) / len(history)
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">']
+    for index, point in enumerate(history):
+        x = left + index * bar_width
+        y = height - bottom
+        when = datetime.fromtimestamp(point["time"])
+        for status in STATUSES:
+            count = point["counts"].get(status, 0)
+            if count:
+                bar_height = (height - bottom - 10) * count / peak
+                y -= bar_height
+                parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{max(bar_width - 2, 1):.1f}" '
+                             f'height="{bar_height:.1f}" fill="{STATUS_COLORS[status]}">'
+                             f'<title>{when:%Y-%m-%d %H:%M} {status}: {count}</title></rect>')
+    first, last = (datetime.fromtimestamp(history[index]["time"]) for index in (0, -1))
+    parts.append(f'<text x="{left}" y="{height - 6}">{first:%Y-%m-%d %H:%M}</text>')
+    parts.append(f'<text x="{width - 10}" y="{height - 6}" text-anchor="end">{last:%Y-%m-%d %H:%M}</text>')
+    parts.append(f'<text x="{left - 6}" y="20" text-anchor="end">{peak}</text>')
+    parts.append('</svg>')
+    return "".join(parts)
+
+
+def _page(title: str, subtitle: str, body: str, stylesheet: str) -> str:
+    return (f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<link rel="stylesheet" href="{stylesheet}"></head><body>'
+            f'<header><h1>{html.escape(title)}</h1><div class="meta">{subtitle}</div></header>'
+            f'<main>{body}</main></body></html>\n')
+
+
+def render_index(data: ReportData, features: Dict[str, FeatureSummary], title: str) -> str:
+    counts = Counter()
+    for feature in features.values():
+        counts.update(feature.counts)
+    total = sum(counts.values())
+    durations = [result["duration"] for result in data.results.values()]
+    starts = [result["start"] for result in data.results.values() if result["start"]]
+    cards = [("Tests", total), ("Pass rate", f"{counts['passed'] / total * 100:.1f}%" if total else "-")]
+    cards += [(status.capitalize(), counts[status]) for status in STATUSES if counts[status]]
+    cards += [("Retried", len(data.retries)), ("Test time", _format_seconds(sum(durations)))]
+    
+    body = ['<div class="cards">']
+    body += [f'<div class="card"><b>{value}</b>{label}</div>' for label, value in cards]
+    body.append('</div><h2>Status</h2>')
+    body.append(status_bar_svg(counts))
+    body.append('<h2>Trend</h2>')
+    body.append(trend_svg(data.history))
+    
+    body.append('<h2>Features</h2><table><tr><th>Feature</th><th class="num">Tests</th>')
+    body += [f'<th class="num">{status.capitalize()}</th>' for status in STATUSES[:4]]
+    body.append('<th class="num">Pass rate</th><th class="num">p50</th><th class="num">p90</th></tr>')
+    for feature in features.values():
+        body.append(f'<tr><td><a href="features/{feature.slug}.html">{html.escape(feature.name)}</a></td>'
+                    f'<td class="num">{feature.total}</td>')
+        body += [f'<td class="num {status}">{feature.counts[status] or ""}</td>' for status in STATUSES[:4]]
+        body.append(f'<td class="num">{feature.pass_rate:.1f}%</td>'
+                    f'<td class="num">{_format_seconds(feature.durations.percentile(50))}</td>'
+                    f'<td class="num">{_format_seconds(feature.durations.percentile(90))}</td></tr>')
+    body.append('</table>')
+    
+    body.append('<h2>API response time distribution</h2>')
+    body.append(latency_histogram_svg(data.response_times()))
+    body.append('<h2>Test duration by feature</h2>')
+    body.append(feature_latency_svg(list(features.values())))
+    
+    endpoints = data.metrics.get("telemetry", {}).get("endpoints", {})
+    if endpoints:
+        body.append('<h2>Traffic by endpoint</h2><table><tr><th>Endpoint</th><th class="num">Calls</th>'
+                    '<th class="num">Decoded</th><th class="num">Wire</th><th class="num">Ratio</th></tr>')
+        for endpoint, totals in sorted(endpoints.items(), key=lambda item: -item[1].get("decoded_bytes", 0)):
+            wire = totals.get("wire_bytes")
+            ratio = f"{totals['decoded_bytes'] / wire:.1f}x" if wire else "-"
+            body.append(f'<tr><td>{html.escape(endpoint)}</td><td class="num">{totals.get("calls", 0):.0f}</td>'
+                        f'<td class="num">{_format_bytes(totals.get("decoded_bytes"))}</td>'
+                        f'<td class="num">{_format_bytes(wire)}</td><td class="num">{ratio}</td></tr>')
+        body.append('</table>')
+    
+    budgeted = [scenario for scenario in data.metrics.get("scenarios", []) if scenario.get("budget")]
+    if budgeted:
+        suite = data.metrics.get("budget")
+        heading = f' (suite: {_format_seconds(suite["used"])} of {suite["budget"]:g}s)' if suite else ""
+        body.append(f'<h2>Time budgets{heading}</h2><table><tr><th>Scenario</th><th>Feature</th>'
+                    '<th class="num">Budget</th><th class="num">Used</th><th class="num">Share</th>'
+                    '<th class="num">Calls</th></tr>')
+        for scenario in sorted(budgeted, key=lambda scenario: -scenario["budget"]["used"])[:20]:
+            usage = scenario["budget"]
+            share_class = "num failed" if usage["exceeded"] else "num"
+            body.append(f'<tr><td>{html.escape(scenario["name"])}</td><td>{html.escape(scenario["feature"])}</td>'
+                        f'<td class="num">{usage["budget"]:g}s</td><td class="num">{_format_seconds(usage["used"])}</td>'
+                        f'<td class="{share_class}">{usage["used_percent"]:.0f}%</td>'
+                        f'<td class="num">{usage["calls"]}</td></tr>')
+        body.append('</table>')
+    
+    kinds = Counter("junit" if result["source"].endswith(".xml") else "allure" for result in data.results.values())
+    sources = ", ".join(f"{count} {kind}" for kind, count in sorted(kinds.items()))
+    period = ""
+    if starts:
+        period = f" · run {datetime.fromtimestamp(min(starts)):%Y-%m-%d %H:%M} – {datetime.fromtimestamp(max(starts)):%H:%M}"
+    subtitle = f"Generated {datetime.now():%Y-%m-%d %H:%M:%S} from {sources or 'no results'}{period}"
+    return _page(title, subtitle, "".join(body), "style.css")
+
+
+def render_feature(feature: FeatureSummary, results: List[Dict[str, Any]], retries: Counter, title: str) -> str:
+    order = {status: index for index, status in enumerate(("failed", "broken", "unknown", "skipped", "passed"))}
+    results = sorted(results, key=lambda result: (order[result["status"]], -result["duration"]))
+    body = ['<div class="cards">']
+    body += [f'<div class="card"><b>{feature.counts[status]}</b>{status.capitalize()}</div>'
+             for status in STATUSES if feature.counts[status]]
+    body.append(f'<div class="card"><b>{_format_seconds(feature.durations.percentile(50))}</b>p50</div>'
+                f'<div class="card"><b>{_format_seconds(feature.durations.max)}</b>max</div></div>')
+    body.append('<h2>Duration distribution</h2>')
+    body.append(latency_histogram_svg([result["duration"] for result in results]))
+    body.append('<h2>Tests</h2><table><tr><th>Status</th><th>Test</th><th>Tags</th>'
+                '<th class="num">Duration</th><th class="num">Retries</th></tr>')
+    for result in results:
+        message = f'<pre>{html.escape(result["message"])}</pre>' if result["message"] else ""
+        tags = " ".join(f"@{html.escape(tag)}" for tag in result["tags"])
+        body.append(f'<tr><td class="status {result["status"]}">{result["status"]}</td>'
+                    f'<td>{html.escape(result["name"])}{message}</td><td>{tags}</td>'
+                    f'<td class="num">{_format_seconds(result["duration"])}</td>'
+                    f'<td class="num">{retries.get(result["key"], "")}</td></tr>')
+    body.append('</table>')
+    subtitle = f'<a href="../index.html">← {html.escape(title)}</a> · {feature.total} tests · {feature.pass_rate:.1f}% passed'
+    return _page(feature.name, subtitle, "".join(body), "../style.css")
+
+
+def write_report(data: ReportData, output_dir: str = "reports/native-report", title: str = "PokéAPI Test Report",
+                 features: Optional[Iterable[str]] = None) -> str:
+    """Write index.html, style.css and the pages of the given features (all by default); returns the index path"""
+    os.makedirs(os.path.join(output_dir, "features"), exist_ok=True)
+    summaries = data.features()
+    names = set(summaries if features is None else features)
+    by_feature: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+    for result in data.results.values():
+        if result["feature"] in names:
+            by_feature[result["feature"]].append(result)
+    
+    style_path = os.path.join(output_dir, "style.css")
+    if features is None or not os.path.exists(style_path):
+        with open(style_path, 'w') as f:
+            f.write(STYLE)
+    for name in names:
+        page_path = os.path.join(output_dir, "features", f"{slugify(name)}.html")
+        if name in summaries:
+            with open(page_path, 'w') as f:
+                f.write(render_feature(summaries[name], by_feature[name], data.retries, title))
+        elif os.path.exists(page_path):
+            os.remove(page_path)
+    index_path = os.path.join(output_dir, "index.html")
+    with open(index_path, 'w') as f:
+        f.write(render_index(data, summaries, title))
+    return index_path
+
+
+def update_report(results_dir: str = "reports/allure-results", junit_paths: Optional[List[str]] = None,
+                  metrics_file: str = "reports/test_metrics.json", output_dir: str = "reports/native-report",
+                  full: bool = False) -> Tuple[str, ReportData]:
+    """Bring the report up to date with the result files, reading only new or changed ones.
+    
+    full=True ignores what earlier builds ingested (the trend history is kept).
+    Returns the index path and the data, whose changes count new, changed and
+    removed source files.
+    """
+    data = ReportData.load(output_dir, history_only=full)
+    allure_paths = allure_result_paths(results_dir)
+    junit_paths = default_junit_paths() if junit_paths is None else junit_paths
+    data.ingest(allure_paths, "allure")
+    data.ingest(junit_paths, "junit")
+    data.forget_missing(allure_paths + junit_paths)
+    data.load_metrics(metrics_file)
+    
+    affected = data.refresh_summaries()
+    if data.changes or not data.history:
+        data.record_trend()
+        data.dirty = True
+    if full:
+        for page in glob.glob(os.path.join(output_dir, "features", "*.html")):
+            os.remove(page)
+    os.makedirs(output_dir, exist_ok=True)
+    index_path = write_report(data, output_dir, features=None if full else affected)
+    data.changes["pages"] = len(data.summaries) if full else len(affected)
+    if data.dirty:
+        data.save(output_dir)
+    return index_path, data
+
+
+def build_report(results_dir: str = "reports/allure-results", junit_paths: Optional[List[str]] = None,
+                 metrics_file: str = "reports/test_metrics.json", output_dir: str = "reports/native-report",
+                 full: bool = False) -> str:
+    """Aggregate Allure results, JUnit files and run metrics into a static HTML report"""
+    return update_report(results_dir, junit_paths, metrics_file, output_dir, full)[0]
\ No newline at end of file
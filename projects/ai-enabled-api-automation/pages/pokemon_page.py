@@ -1,46 +1,115 @@
 from api_collections.pokemon_api import PokemonAPICollection
 from utils.bdd_utils import BDDUtils
 from reusable_functions import ReusableFunctions
+from fault_proxy import FaultProxy
+from resource_graph import LinkResolver
+from response_retention import RetentionPolicy
 from schemas import POKEMON_SCHEMA, ABILITY_SCHEMA, POKEMON_LIST_SCHEMA
 from typing import Dict, Any, Optional
 
 class PokemonPage:
-    def __init__(self):
-        self.api = PokemonAPICollection()
+    def __init__(self, prefetch_links: Optional[list] = None, retention: Optional[RetentionPolicy] = None,
+                 api: Optional[PokemonAPICollection] = None):
+        self.api = api or PokemonAPICollection.shared()
         self.utils = BDDUtils()
         self.functions = ReusableFunctions()
         self.last_response = None
         self.last_response_data = None
         self.response_time = None
+        self.retention = retention
+        self.resolver = LinkResolver(self.api.client, prefetch_paths=prefetch_links, retention=retention)
+        self.resource_graph = None
+        self.list_stream = None
     
     def get_pokemon_by_identifier(self, identifier: str):
         """Get Pokemon by ID or name and store response"""
         if identifier.isdigit():
-            self.last_response = self.api.get_pokemon_by_id(int(identifier))
+            response = self.api.get_pokemon_by_id(int(identifier))
         else:
-            self.last_response = self.api.get_pokemon_by_name(identifier)
-        
-        self.utils.log_response_details(self.last_response, f"pokemon/{identifier}")
-        return self.last_response
+            response = self.api.get_pokemon_by_name(identifier)
+        return self._keep(response, f"pokemon/{identifier}")
     
-    def get_pokemon_list_with_pagination(self, limit: int = 20, offset: int = 0):
-        """Get Pokemon list and store response"""
-        self.last_response = self.api.get_pokemon_list(limit, offset)
-        self.utils.log_response_details(self.last_response, "pokemon list")
-        return self.last_response
+    def get_pokemon_list_with_pagination(self, limit: int = 20, offset: int = 0, stream: bool = False):
+        """Get Pokemon list and store response; with stream the results are parsed later as they arrive"""
+        if stream:
+            self.list_stream = self.api.get_pokemon_list(limit, offset, stream=True)
+            self.last_response = self.list_stream.response
+            return self.last_response
+        return self._keep(self.api.get_pokemon_list(limit, offset), "pokemon list")
     
     def get_ability_by_identifier(self, identifier: str):
         """Get ability and store response"""
-        self.last_response = self.api.get_ability(identifier)
-        self.utils.log_response_details(self.last_response, f"ability/{identifier}")
-        return self.last_response
+        return self._keep(self.api.get_ability(identifier), f"ability/{identifier}")
     
     def get_item_by_identifier(self, identifier: str):
         """Get item and store response"""
-        self.last_response = self.api.get_item(identifier)
-        self.utils.log_response_details(self.last_response, f"item/{identifier}")
+        return self._keep(self.api.get_item(identifier), f"item/{identifier}")
+    
+    def follow_link(self, path: str):
+        """Get the resource linked at a dot path of the last response and store its response"""
+        if not self.last_response_data:
+            self.parse_response_data()
+        url = self.functions.extract_nested_value(self.last_response_data, path)
+        response, _ = self.resolver.fetch(url)
+        return self._keep(response, url)
+    
+    def _keep(self, response, endpoint: str):
+        """Prefetch links and log a new response, then store what the retention policy keeps of it"""
+        self.last_response_data = None
+        self.resolver.prefetch(response)
+        self.utils.log_response_details(response, endpoint)
+        self.last_response = self.retention.retain(response) if self.retention else response
         return self.last_response
     
+    def _field(self, name: str, default: Any = None) -> Any:
+        """A top-level field of the last response, from its retained projection when there is one"""
+        fields = getattr(self.last_response, "fields", None)
+        if isinstance(fields, dict) and name in fields:
+            return fields[name]
+        if not self.last_response_data:
+            self.parse_response_data()
+        return self.last_response_data.get(name, default)
+    
+    def prefetch_summary(self) -> Dict[str, Any]:
+        """Prefetch hit rate and counts for the links fetched by this page"""
+        return self.resolver.prefetch_summary()
+    
+    def resolve_linked_resources(self, depth: int, follow: Optional[list] = None):
+        """Resolve resources linked from the last response, one parallel round trip per level"""
+        if not self.last_response_data:
+            self.parse_response_data()
+        self.resource_graph = self.resolver.resolve(self.last_response_data, depth, follow, root_url=str(self.last_response.url))
+        return self.resource_graph
+    
+    def use_fault_profile(self, profile) -> FaultProxy:
+        """Route API calls through the local fault proxy with a profile from config.json.
+        
+        Calls go through a separate client bound to the proxy, so its circuit
+        breaker and hedging windows never record faults against the real host.
+        """
+        proxy = FaultProxy.for_target(self.api.config["base_url"], self.api.config.get("fault_profiles"))
+        proxy.set_profile(profile)
+        self._use_api(PokemonAPICollection.shared(base_url=proxy.base_url))
+        return proxy
+    
+    @property
+    def fault_proxy(self) -> Optional[FaultProxy]:
+        """The fault proxy API calls currently go through, if any"""
+        if self.api is PokemonAPICollection.shared():
+            return None
+        return FaultProxy.for_target(self.api.config["base_url"])
+    
+    def clear_fault_profile(self):
+        """Send API calls straight to the target again"""
+        if self.fault_proxy:
+            self.fault_proxy.set_profile(None)
+        self._use_api(PokemonAPICollection.shared())
+    
+    def _use_api(self, api: PokemonAPICollection):
+        """Send page and link resolver calls through another collection's client"""
+        self.api = api
+        self.resolver.client = api.client
+    
     def validate_response_status(self, expected_status: int) -> bool:
         """Validate last response status code"""
         return self.utils.validate_status_code(self.last_response, expected_status)
@@ -66,6 +135,17 @@ class PokemonPage:
             self.parse_response_data()
         return self.utils.validate_schema(self.last_response_data, ABILITY_SCHEMA)
     
+    def validate_streamed_entries(self, fields: list) -> Dict[str, Any]:
+        """Read the streamed list to the end, checking each entry as it is parsed"""
+        invalid = [index for index, entry in enumerate(self.list_stream)
+                   if self.utils.validate_field_presence(entry, fields)]
+        return {
+            "entries": self.list_stream.items_seen,
+            "invalid": invalid,
+            "count": self.list_stream.count,
+            "decoded_bytes": self.list_stream.decoded_bytes
+        }
+    
     def validate_pokemon_list_schema(self) -> bool:
         """Validate Pokemon list response against schema"""
         if not self.last_response_data:
@@ -81,15 +161,11 @@ class PokemonPage:
     
     def get_pokemon_name(self) -> str:
         """Get Pokemon name from last response"""
-        if not self.last_response_data:
-            self.parse_response_data()
-        return self.last_response_data.get("name", "")
+        return self._field("name", "")
     
     def get_pokemon_id(self) -> int:
         """Get Pokemon ID from last response"""
-        if not self.last_response_data:
-            self.parse_response_data()
-        return self.last_response_data.get("id", 0)
+        return self._field("id", 0)
     
     def get_pokemon_types(self) -> list:
         """Get Pokemon types from last response"""
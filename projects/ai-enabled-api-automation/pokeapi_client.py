@@ -7,11 +7,7 @@ class PokeAPIClient(APIClient):
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        super().__init__(
-            base_url=self.config["base_url"],
-            timeout=self.config["timeout"],
-            retry_count=self.config["retry_count"]
-        )
+        super().__init__(**APIClient.options_from_config(self.config))
         self.endpoints = self.config["endpoints"]
     
     def get_pokemon(self, identifier: str) -> Dict[str, Any]:
@@ -56,9 +52,11 @@ class PokeAPIClient(APIClient):
         response = self.get(endpoint)
         return response
     
-    def get_pokemon_list(self, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """Get list of Pokemon with pagination"""
+    def get_pokemon_list(self, limit: int = 20, offset: int = 0, stream: bool = False) -> Dict[str, Any]:
+        """Get list of Pokemon with pagination; stream=True returns a ListStream of the results"""
         endpoint = self.endpoints['pokemon']
         params = {"limit": limit, "offset": offset}
+        if stream:
+            return self.get_stream(endpoint, params=params)
         response = self.get(endpoint, params=params)
         return response
\ No newline at end of file
@@ -0,0 +1,172 @@
+import cProfile
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Set by run_tests.py / run_bdd_tests.py --profile; read by conftest.py and features/environment.py
+PROFILE_DIR_ENV = "TEST_PROFILE_DIR"
+
+
+class StackSampler:
+    """Samples the call stacks of every thread into collapsed-stack counts"""
+    
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+class ScenarioProfiler:
+    """Profiles one test or scenario at a time with cProfile, a stack sampler and tracemalloc.
+    
+    Each profile writes a collapsed-stack file for flame graphs
+    (flamegraph.pl, speedscope) and keeps a top-N table of hot functions and
+    allocation sites; write_summary() saves every table plus a combined
+    collapsed-stack file for the whole run.
+    """
+    
+    def __init__(self, output_dir: str = "reports/profile", top: int = 15, interval: float = 0.005):
+        self.output_dir = output_dir
+        self.top = top
+        self.interval = interval
+        self.results: List[Dict[str, Any]] = []
+        self.combined = Counter()
+        self._current: Optional[Dict[str, Any]] = None
+        os.makedirs(output_dir, exist_ok=True)
+    
+    @classmethod
+    def from_env(cls) -> Optional["ScenarioProfiler"]:
+        """Profiler for the directory in TEST_PROFILE_DIR, or None when profiling is off"""
+        output_dir = os.environ.get(PROFILE_DIR_ENV)
+        return cls(output_dir) if output_dir else None
+    
+    def start(self, name: str):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        sampler = StackSampler(self.interval)
+        profile = cProfile.Profile()
+        self._current = {
+            "name": name,
+            "sampler": sampler,
+            "profile": profile,
+            "snapshot": self._snapshot(),
+            "start": time.perf_counter()
+        }
+        sampler.start()
+        profile.enable()
+    
+    def stop(self) -> Optional[Dict[str, Any]]:
+        current, self._current = self._current, None
+        if current is None:
+            return None
+        current["profile"].disable()
+        duration = time.perf_counter() - current["start"]
+        current["sampler"].stop()
+        allocations = self._snapshot().compare_to(current["snapshot"], "lineno")
+        
+        stacks = current["sampler"].stacks
+        self.combined.update(stacks)
+        collapsed_file = os.path.join(self.output_dir, f"{self._slug(current['name'])}.collapsed")
+        self._write_collapsed(collapsed_file, stacks)
+        
+        result = {
+            "name": current["name"],
+            "duration": duration,
+            "samples": sum(stacks.values()),
+            "collapsed_stacks": collapsed_file,
+            "hot_functions": self._hot_functions(current["profile"]),
+            "allocations": [
+                {"site": str(stat.traceback[0]), "size_kb": stat.size_diff / 1024, "count": stat.count_diff}
+                for stat in allocations[:self.top]
+            ]
+        }
+        self.results.append(result)
+        return result
+    
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Allocation snapshot without the profiler's own bookkeeping"""
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, pstats.__file__)
+        ])
+    
+    def _hot_functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(profile)
+        rows = []
+        for (file_name, line, function), (_, calls, own_time, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{function} ({os.path.basename(file_name)}:{line})",
+                "calls": calls,
+                "own_time": own_time,
+                "cumulative": cumulative
+            })
+        rows.sort(key=lambda row: row["own_time"], reverse=True)
+        return rows[:self.top]
+    
+    @staticmethod
+    def _slug(name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")[:120] or "profile"
+    
+    @staticmethod
+    def _write_collapsed(path: str, stacks: Counter):
+        with open(path, 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+    
+    def write_summary(self) -> str:
+        """Save the per-scenario tables and the combined collapsed stacks"""
+        self._write_collapsed(os.path.join(self.output_dir, "all.collapsed"), self.combined)
+        with open(os.path.join(self.output_dir, "profile_report.txt"), 'w') as f:
+            f.write("\n\n".join(self.format_table(result) for result in self.results) + "\n")
+        summary_file = os.path.join(self.output_dir, "profile_summary.json")
+        with open(summary_file, 'w') as f:
+            json.dump(self.results, f, indent=2)
+        return summary_file
+    
+    @staticmethod
+    def format_table(result: Dict[str, Any], rows: int = 10) -> str:
+        """Render the top hot functions and allocation sites of one profile"""
+        lines = [f"⏱️ {result['name']} ({result['duration']:.3f}s, {result['samples']} samples)",
+                 f"   {'own s':>8} {'cum s':>8} {'calls':>8}  function"]
+        for row in result["hot_functions"][:rows]:
+            lines.append(f"   {row['own_time']:>8.4f} {row['cumulative']:>8.4f} {row['calls']:>8}  {row['function']}")
+        lines.append(f"   {'KiB':>8} {'blocks':>8}  allocation site")
+        for row in result["allocations"][:rows]:
+            lines.append(f"   {row['size_kb']:>8.1f} {row['count']:>8}  {row['site']}")
+        return "\n".join(lines)
\ No newline at end of file
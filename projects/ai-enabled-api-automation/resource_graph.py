@@ -0,0 +1,260 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import requests
+from deadline import propagate
+from reusable_functions import ReusableFunctions
+
+
+class ResourceNode:
+    """A fetched API resource and the linked resources resolved from it"""
+    
+    def __init__(self, url: Optional[str], response=None, data: Any = None):
+        self.url = url
+        self.response = response
+        self.data = data
+        self.links: Dict[str, "ResourceNode"] = {}
+    
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.response.status_code if self.response is not None else None
+    
+    def follow(self, *paths: str) -> "ResourceNode":
+        """Walk one link path per hop, e.g. follow("species.url", "evolution_chain.url")"""
+        node = self
+        for path in paths:
+            if path not in node.links:
+                raise KeyError(f"Link '{path}' was not resolved from {node.url or 'root payload'}")
+            node = node.links[path]
+        return node
+    
+    def __repr__(self):
+        return f"ResourceNode({self.url!r}, links={len(self.links)})"
+
+
+class ResourceGraph:
+    """Navigable graph of resources reached from a root payload"""
+    
+    def __init__(self, root: ResourceNode):
+        self.root = root
+        self.nodes: Dict[str, ResourceNode] = {}
+        self.levels = 0
+        self.resolved = 0
+    
+    def follow(self, *paths: str) -> ResourceNode:
+        """Walk link paths starting at the root"""
+        return self.root.follow(*paths)
+
+
+class LinkResolver:
+    """Resolves every ``url`` field of a payload, one parallel round trip per level.
+    
+    Links are deduplicated across the whole graph and through a cache that can
+    be shared between resolvers, so a resource is fetched at most once.
+    
+    With ``prefetch_paths`` (dot paths such as ``species.url``) each response
+    passed to prefetch() has those links fetched in the background, and each
+    prefetched resource has its own declared links requested before it is
+    handed over, so a chain of follow-up steps finds its data already in
+    flight.
+    fetch() waits for an in-flight prefetch instead of requesting again.
+    
+    With a ``retention`` policy the cache keeps what the policy retains of
+    each response rather than the response itself, and not its parsed body:
+    a cached resource fetched again is read back from the spill store.
+    """
+    
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    
+    def __init__(self, client, max_workers: int = 8, cache: Optional[Dict[str, Tuple[Any, Any]]] = None,
+                 prefetch_paths: Optional[Iterable[str]] = None, retention=None):
+        self.client = client
+        self.retention = retention
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else {}
+        self._cache_lock = threading.Lock()
+        self.prefetch_paths = list(prefetch_paths or [])
+        self.pending: Dict[str, Future] = {}
+        self.prefetched = set()
+        self.consumed = set()
+        self.prefetch_stats = Counter()
+        # Separate from _cache_lock, which is already held when a fetch counts a hit or miss
+        self._stats_lock = threading.Lock()
+    
+    @classmethod
+    def prefetch_executor(cls) -> ThreadPoolExecutor:
+        """Return the shared pool that runs background prefetches"""
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+            return cls._executor
+    
+    @staticmethod
+    def find_links(payload: Any, prefix: str = "") -> List[Tuple[str, str]]:
+        """Return (path, url) for every ``url`` string field, paths in dot notation"""
+        links = []
+        if isinstance(payload, dict):
+            for key, value in payload.items():
+                path = f"{prefix}{key}"
+                if key == "url" and isinstance(value, str):
+                    links.append((path, value))
+                elif isinstance(value, (dict, list)):
+                    links.extend(LinkResolver.find_links(value, f"{path}."))
+        elif isinstance(payload, list):
+            for index, value in enumerate(payload):
+                if isinstance(value, (dict, list)):
+                    links.extend(LinkResolver.find_links(value, f"{prefix}{index}."))
+        return links
+    
+    @staticmethod
+    def link_name(path: str) -> str:
+        """Name of the field holding a link, e.g. 'ability' for 'abilities.0.ability.url'"""
+        parts = path.split(".")
+        return parts[-2] if len(parts) > 1 else parts[-1]
+    
+    def fetch(self, url: str) -> Tuple[Any, Any]:
+        """GET a URL once, returning (response, parsed JSON or None)"""
+        with self._cache_lock:
+            cached = self.cache.get(url)
+            future = self.pending.get(url)
+            if self.prefetch_paths and url not in self.consumed:
+                self.consumed.add(url)
+                self._count_prefetch("hit" if url in self.prefetched else "miss")
+        if cached is not None:
+            return self._loaded(cached)
+        if future is not None:
+            try:
+                return future.result()
+            except requests.exceptions.RequestException:
+                pass  # Fetch again below so the failure is reported by the step that needs it
+        return self._get(url)
+    
+    @staticmethod
+    def _parse(response) -> Any:
+        try:
+            return response.json() if response.status_code == 200 else None
+        except ValueError:
+            return None
+    
+    def _loaded(self, entry: Tuple[Any, Any]) -> Tuple[Any, Any]:
+        """A cache entry with its parsed body, read back when only the retained response was kept"""
+        response, data = entry
+        if data is None:
+            data = self._parse(response)
+        return response, data
+    
+    def _get(self, url: str) -> Tuple[Any, Any]:
+        response = self.client.get_url(url)
+        data = self._parse(response)
+        kept = self.retention.retain(response) if self.retention else response
+        with self._cache_lock:
+            # A retained response holds its body on disk, so the parsed copy is not cached with it
+            entry = self.cache.setdefault(url, (kept, data if kept is response else None))
+        if entry[0] is kept:
+            return kept, data
+        return self._loaded(entry)
+    
+    def prefetch(self, response):
+        """Start fetching the declared links of a response in the background"""
+        if not self.prefetch_paths or response is None or response.status_code != 200:
+            return
+        try:
+            payload = response.json()
+        except ValueError:
+            return
+        self._prefetch_links(payload)
+    
+    def _prefetch_links(self, payload: Any):
+        for path in self.prefetch_paths:
+            url = ReusableFunctions.extract_nested_value(payload, path)
+            if not isinstance(url, str):
+                continue
+            with self._cache_lock:
+                if url in self.cache or url in self.pending:
+                    continue
+                self.prefetched.add(url)
+                self.pending[url] = self.prefetch_executor().submit(propagate(self._prefetch_url), url)
+            self._count_prefetch("issued")
+    
+    def _prefetch_url(self, url: str) -> Tuple[Any, Any]:
+        try:
+            response, data = self._get(url)
+        except requests.exceptions.RequestException:
+            self._count_prefetch("failed")
+            raise
+        finally:
+            # Once cached (or failed) the resource no longer needs its future
+            with self._cache_lock:
+                self.pending.pop(url, None)
+        if data is not None:
+            self._prefetch_links(data)
+        return response, data
+    
+    def _count_prefetch(self, outcome: str):
+        with self._stats_lock:
+            self.prefetch_stats[outcome] += 1
+        self.client.telemetry.increment(f"prefetch.{outcome}")
+    
+    def prefetch_summary(self) -> Dict[str, Any]:
+        """Issued, hit, missed and wasted prefetches with the hit rate"""
+        with self._stats_lock:
+            stats = Counter(self.prefetch_stats)
+        return prefetch_summary(stats)
+    
+    def resolve(self, payload: Any, depth: int = 1, follow: Optional[Iterable[str]] = None,
+                root_url: Optional[str] = None) -> ResourceGraph:
+        """Fetch linked resources breadth-first up to ``depth`` hops from the payload.
+        
+        ``follow`` limits traversal to links with the given field names
+        (see link_name); links to other hosts are never followed.
+        """
+        follow = set(follow) if follow is not None else None
+        graph = ResourceGraph(ResourceNode(root_url, data=payload))
+        if root_url:
+            graph.nodes[root_url] = graph.root
+        
+        frontier = [graph.root]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in range(depth):
+                pending: Dict[str, List[Tuple[ResourceNode, str]]] = {}
+                for node in frontier:
+                    for path, url in self.find_links(node.data):
+                        if not url.startswith(self.client.base_url):
+                            continue
+                        if follow is not None and self.link_name(path) not in follow:
+                            continue
+                        if url in graph.nodes:
+                            node.links[path] = graph.nodes[url]
+                        else:
+                            pending.setdefault(url, []).append((node, path))
+                if not pending:
+                    break
+                
+                urls = list(pending)
+                results = executor.map(propagate(self.fetch), urls)
+                frontier = []
+                for url, (response, data) in zip(urls, results):
+                    child = ResourceNode(url, response, data)
+                    graph.nodes[url] = child
+                    for parent, path in pending[url]:
+                        parent.links[path] = child
+                    if data is not None:
+                        frontier.append(child)
+                graph.levels += 1
+                graph.resolved += len(urls)
+        return graph
+
+
+def prefetch_summary(counts: Dict[str, int]) -> Dict[str, Any]:
+    """Summarise prefetch counters (issued, hit, miss, failed) with the hit rate"""
+    hits, misses, issued = counts.get("hit", 0), counts.get("miss", 0), counts.get("issued", 0)
+    return {
+        "issued": issued,
+        "hits": hits,
+        "misses": misses,
+        "wasted": max(issued - hits, 0),
+        "failed": counts.get("failed", 0),
+        "hit_rate": round(100 * hits / (hits + misses), 1) if hits + misses else None
+    }
\ No newline at end of file
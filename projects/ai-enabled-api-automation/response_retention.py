@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from requests.structures import CaseInsensitiveDict
+from reusable_functions import ReusableFunctions
+
+# Headers kept on a retained response; the rest are dropped with the body
+KEPT_HEADERS = ("Content-Type", "Content-Encoding", "ETag", "Last-Modified")
+
+
+class SpillStore:
+    """Response bodies on disk, one file per distinct body named by its hash"""
+    
+    def __init__(self, directory: Optional[str] = None):
+        self.temporary = not directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory or tempfile.mkdtemp(prefix="responses-")
+        self.stats = Counter()
+        self._digests = set()
+        self._lock = threading.Lock()
+    
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest)
+    
+    def put(self, digest: str, body: bytes):
+        """Write a body unless an identical one is already stored"""
+        path = self._path(digest)
+        with self._lock:
+            self.stats["spilled"] += 1
+            if digest in self._digests:
+                return
+            # Written under the lock so a later response with the same body never reads a partial file
+            with open(path, 'wb') as f:
+                f.write(body)
+            self._digests.add(digest)
+            self.stats["files"] += 1
+            self.stats["bytes"] += len(body)
+    
+    def get(self, digest: str) -> bytes:
+        with self._lock:
+            self.stats["loaded"] += 1
+        with open(self._path(digest), 'rb') as f:
+            return f.read()
+    
+    def cleanup(self):
+        """Delete the bodies written by this store (and its directory if it made it)"""
+        if self.temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            return
+        with self._lock:
+            digests, self._digests = self._digests, set()
+        for digest in digests:
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+
+
+class RetainedResponse:
+    """Compact stand-in for a requests.Response whose body lives in a SpillStore.
+    
+    Status, URL, elapsed time, a few headers, the body size and hash and the
+    projected fields stay in memory; ``content``, ``text`` and ``json()``
+    read the body back from disk each time they are used.
+    """
+    
+    def __init__(self, response, store: SpillStore, fields: Iterable[str] = ()):
+        content = response.content
+        self.status_code = response.status_code
+        # httpx responses (HTTP/2 transport) name the reason differently and carry a URL object
+        self.reason = getattr(response, "reason", None) or getattr(response, "reason_phrase", "")
+        self.url = str(response.url)
+        self.elapsed = response.elapsed
+        self.encoding = response.encoding
+        self.headers = CaseInsensitiveDict({name: response.headers[name] for name in KEPT_HEADERS
+                                            if name in response.headers})
+        self.decoded_bytes = getattr(response, "decoded_bytes", len(content))
+        self.wire_bytes = getattr(response, "wire_bytes", None)
+        self.digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self.fields = self._project(content, fields)
+        self._store = store
+        store.put(self.digest, content)
+    
+    def _project(self, content: bytes, fields: Iterable[str]) -> Dict[str, Any]:
+        """Values at the given dot paths of a JSON body"""
+        fields = list(fields)
+        if not fields or not content:
+            return {}
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return {}
+        missing = object()
+        projected = {}
+        for path in fields:
+            value = ReusableFunctions.extract_nested_value(data, path, missing)
+            if value is not missing:
+                projected[path] = value
+        return projected
+    
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+    
+    @property
+    def content(self) -> bytes:
+        return self._store.get(self.digest)
+    
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+    
+    def json(self, **kwargs) -> Any:
+        return json.loads(self.content, **kwargs)
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "status_code": self.status_code,
+            "url": self.url,
+            "elapsed": self.elapsed.total_seconds(),
+            "decoded_bytes": self.decoded_bytes,
+            "wire_bytes": self.wire_bytes,
+            "digest": self.digest,
+            "fields": self.fields
+        }
+    
+    def __repr__(self):
+        return f"<RetainedResponse [{self.status_code}] {self.decoded_bytes} bytes>"
+
+
+class RetentionPolicy:
+    """Decides what page objects and reports keep of each response.
+    
+    In ``summary`` mode a response is replaced by a RetainedResponse as soon
+    as it has been logged and its links prefetched, so only one small
+    summary per response stays in memory; ``full`` keeps responses as they
+    are. With attach_bodies set to ``failed`` response bodies are read back
+    for the report only when a scenario fails.
+    """
+    
+    def __init__(self, mode: str = "summary", fields: Iterable[str] = (), attach_bodies: str = "always",
+                 spill_dir: Optional[str] = None):
+        if mode not in ("summary", "full"):
+            raise ValueError(f"Unknown retention mode: {mode}")
+        self.mode = mode
+        self.fields = list(fields)
+        self.attach_bodies = attach_bodies
+        self.store = SpillStore(spill_dir) if mode == "summary" else None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["RetentionPolicy"]:
+        """Policy from config.json["retention"], or None when the section is absent"""
+        options = config.get("retention")
+        if not options:
+            return None
+        return cls(options.get("mode", "summary"), options.get("fields", ()),
+                   options.get("attach_bodies", "always"), options.get("spill_dir"))
+    
+    def retain(self, response):
+        """What to keep of a response; streamed responses hold no body and are kept as they are"""
+        if response is None or self.mode == "full" or getattr(response, "streamed", False) \
+                or isinstance(response, RetainedResponse):
+            return response
+        return RetainedResponse(response, self.store, self.fields)
+    
+    def attach_body(self, status: str) -> bool:
+        """Whether to read bodies back for the report of a scenario with this status"""
+        return self.attach_bodies == "always" or (self.attach_bodies == "failed" and status == "failed")
+    
+    def summary(self) -> Dict[str, Any]:
+        stats = self.store.stats if self.store else Counter()
+        return {
+            "mode": self.mode,
+            "responses": stats["spilled"],
+            "bodies_stored": stats["files"],
+            "bytes_spilled": stats["bytes"],
+            "bodies_loaded": stats["loaded"]
+        }
+    
+    def close(self):
+        """Remove spilled bodies once nothing will read them"""
+        if self.store:
+            self.store.cleanup()
\ No newline at end of file
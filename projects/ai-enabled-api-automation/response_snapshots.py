@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+# Hash tree nodes: {"#": hash, "c": {key: node}} for objects,
+# {"#": hash, "l": [node, ...]} for arrays and {"#": hash, "v": value} for leaves.
+# Stored trees drop leaf hashes, which are cheap to recompute from the value.
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def hash_tree(value: Any) -> Dict[str, Any]:
+    """Build a Merkle-style hash tree of a JSON document"""
+    if isinstance(value, dict):
+        children = {key: hash_tree(child) for key, child in value.items()}
+        parts = [f"{key}={children[key]['#']}" for key in sorted(children)]
+        return {"#": _digest("object", *parts), "c": children}
+    if isinstance(value, list):
+        items = [hash_tree(child) for child in value]
+        return {"#": _digest("array", *[item["#"] for item in items]), "l": items}
+    return {"#": _digest("leaf", json.dumps(value)), "v": value}
+
+
+def node_hash(node: Dict[str, Any]) -> str:
+    """Hash of a node, recomputing it for leaves loaded from storage"""
+    if "#" not in node:
+        node["#"] = _digest("leaf", json.dumps(node["v"]))
+    return node["#"]
+
+
+def compact_tree(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a hash tree without leaf hashes, for storage"""
+    if "c" in node:
+        return {"#": node["#"], "c": {key: compact_tree(child) for key, child in node["c"].items()}}
+    if "l" in node:
+        return {"#": node["#"], "l": [compact_tree(item) for item in node["l"]]}
+    return {"v": node["v"]}
+
+
+def tree_value(node: Dict[str, Any]) -> Any:
+    """Rebuild the JSON value a hash tree node was built from"""
+    if "c" in node:
+        return {key: tree_value(child) for key, child in node["c"].items()}
+    if "l" in node:
+        return [tree_value(item) for item in node["l"]]
+    return node["v"]
+
+
+def diff_trees(old: Dict[str, Any], new: Dict[str, Any], path: str = "") -> List[Dict[str, Any]]:
+    """List changes between two hash trees, descending only into subtrees whose hashes differ"""
+    if node_hash(old) == node_hash(new):
+        return []
+    if "c" in old and "c" in new:
+        changes = []
+        for key in old["c"].keys() | new["c"].keys():
+            child_path = f"{path}.{key}" if path else key
+            if key not in new["c"]:
+                changes.append({"path": child_path, "change": "removed", "old": tree_value(old["c"][key])})
+            elif key not in old["c"]:
+                changes.append({"path": child_path, "change": "added", "new": tree_value(new["c"][key])})
+            else:
+                changes.extend(diff_trees(old["c"][key], new["c"][key], child_path))
+        return sorted(changes, key=lambda change: change["path"])
+    if "l" in old and "l" in new and len(old["l"]) == len(new["l"]):
+        changes = []
+        for index, (old_item, new_item) in enumerate(zip(old["l"], new["l"])):
+            changes.extend(diff_trees(old_item, new_item, f"{path}.{index}" if path else str(index)))
+        return changes
+    return [{"path": path or "<root>", "change": "changed", "old": tree_value(old), "new": tree_value(new)}]
+
+
+class ResponseSnapshots:
+    """Per-resource snapshots of JSON responses stored as gzip-compressed hash trees.
+    
+    A small index of root hashes per resource type lets an unchanged response
+    be confirmed with one hash comparison; the stored tree is only opened to
+    find which subtrees changed.
+    """
+    
+    def __init__(self, directory: str = "snapshots"):
+        self.directory = directory
+        self._indexes: Dict[str, Dict[str, str]] = {}
+    
+    def _index_path(self, resource: str) -> str:
+        return os.path.join(self.directory, resource, "_index.json")
+    
+    def _snapshot_path(self, resource: str, key: str) -> str:
+        return os.path.join(self.directory, resource, f"{key}.json.gz")
+    
+    def index(self, resource: str) -> Dict[str, str]:
+        """Root hash of every stored snapshot of a resource type"""
+        if resource not in self._indexes:
+            path = self._index_path(resource)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    self._indexes[resource] = json.load(f)
+            else:
+                self._indexes[resource] = {}
+        return self._indexes[resource]
+    
+    def load(self, resource: str, key: str) -> Optional[Dict[str, Any]]:
+        """Load a stored hash tree, or None if there is no snapshot"""
+        path = self._snapshot_path(resource, key)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt') as f:
+            return json.load(f)
+    
+    def update(self, resource: str, key: str, data: Any, tree: Optional[Dict[str, Any]] = None):
+        """Store (or replace) the snapshot of one resource"""
+        tree = tree or hash_tree(data)
+        os.makedirs(os.path.join(self.directory, resource), exist_ok=True)
+        with gzip.open(self._snapshot_path(resource, key), 'wt') as f:
+            json.dump(compact_tree(tree), f, separators=(",", ":"))
+        self.index(resource)[str(key)] = tree["#"]
+    
+    def save_index(self, resource: Optional[str] = None):
+        """Write the root hash index of one or all loaded resource types"""
+        for name in [resource] if resource else list(self._indexes):
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
+            with open(self._index_path(name), 'w') as f:
+                json.dump(self._indexes[name], f, indent=0, sort_keys=True)
+    
+    def check(self, resource: str, key: str, data: Any, record_missing: bool = True) -> List[Dict[str, Any]]:
+        """Compare a response with its snapshot, returning the changed paths.
+        
+        A response without a snapshot is recorded as the baseline; its index
+        entry is only written by save_index(), so call it once after a batch.
+        """
+        key = str(key)
+        tree = hash_tree(data)
+        stored_hash = self.index(resource).get(key)
+        if stored_hash == tree["#"]:
+            return []
+        stored = self.load(resource, key) if stored_hash else None
+        if stored is None:
+            if record_missing:
+                self.update(resource, key, data, tree)
+            return []
+        return diff_trees(stored, tree)
+    
+    def assert_matches(self, resource: str, key: str, data: Any):
+        """Fail with the changed paths if a response drifted from its snapshot"""
+        changes = self.check(resource, key, data)
+        assert not changes, f"{resource}/{key} drifted from snapshot: " + \
+            ", ".join(f"{change['path']} ({change['change']})" for change in changes)
\ No newline at end of file
@@ -0,0 +1,388 @@
+import array
+import glob
+import json
+import math
+import os
+import re
+import sys
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from load_engine import LatencyHistogram
+from native_report import allure_result_paths, read_allure_result
+
+# One archive file per run. The default .rcol format needs only the standard library:
+#   b"RCOL1\n", an 8-byte little-endian header length, a JSON header
+#   {"run", "created", "rows", "byteorder", "columns": [{"name", "type", "offset", "length", "dictionary"}]}
+#   and then one zlib-compressed array per column. Strings are dictionary encoded
+#   (uint32 indices into the header's dictionary), so filters are evaluated once per
+#   distinct value and a query only reads and inflates the columns it uses.
+# With pyarrow installed, runs can be written as .parquet files instead.
+
+MAGIC = b"RCOL1\n"
+
+# Column name -> type; missing numbers are NaN for floats and -1 for integers
+COLUMNS = {
+    "scenario": "str",
+    "feature": "str",
+    "tags": "str",
+    "status": "str",
+    "framework": "str",
+    "endpoint": "str",
+    "duration": "f64",
+    "start": "f64",
+    "latency": "f64",
+    "status_code": "i64",
+    "wire_bytes": "i64",
+    "decoded_bytes": "i64"
+}
+
+TYPECODES = {"str": "I", "f64": "d", "i64": "q"}
+
+MISSING = {"str": "", "f64": math.nan, "i64": -1}
+
+
+def _missing(value: Any) -> bool:
+    return value is None or value == -1 or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def _load_json(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _pytest_rows(report: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """Rows from a pytest-json-report file"""
+    outcomes = {"passed": "passed", "failed": "failed", "skipped": "skipped", "error": "broken"}
+    created = report.get("created")
+    for test in report.get("tests", []):
+        nodeid = test["nodeid"]
+        duration = sum((test.get(stage) or {}).get("duration", 0) for stage in ("setup", "call", "teardown"))
+        yield {
+            "scenario": nodeid.split("::")[-1],
+            "feature": "::".join(nodeid.split("::")[:-1]) or nodeid,
+            "status": outcomes.get(test.get("outcome"), "unknown"),
+            "framework": "pytest",
+            "duration": duration,
+            "start": created
+        }
+
+
+def collect_run(results_dir: str = "reports/allure-results", metrics_file: str = "reports/test_metrics.json",
+                pytest_report: Optional[str] = "reports/report.json", test_cases_dir: Optional[str] = None,
+                whole_directory: bool = False) -> Tuple[Dict[str, List[Any]], Dict[str, Any]]:
+    """Gather one run's per-test rows as columns.
+    
+    Allure results accumulate across runs, so only those inside the run
+    window recorded in test_metrics.json are taken unless whole_directory is
+    set. Latency, endpoint and bytes are joined in from the metrics by
+    scenario name. Returns (columns, run info).
+    """
+    metrics = _load_json(metrics_file) or {}
+    window_start = metrics.get("start_time")
+    window_end = metrics.get("end_time")
+    performance = {entry["scenario"]: entry for entry in metrics.get("performance_data", [])}
+    
+    rows: List[Dict[str, Any]] = []
+    if test_cases_dir:
+        # Allure report test cases (reports/allure-report/data/test-cases)
+        paths = glob.glob(os.path.join(test_cases_dir, "*.json"))
+        for path in paths:
+            with open(path, 'r') as f:
+                case = json.load(f)
+            labels = case.get("labels", [])
+            timing = case.get("time", {})
+            rows.append({
+                "scenario": case.get("name"),
+                "feature": next((label["value"] for label in labels if label["name"] == "feature"), None),
+                "tags": ",".join(label["value"] for label in labels if label["name"] == "tag"),
+                "status": case.get("status"),
+                "framework": "behave",
+                "duration": timing.get("duration", 0) / 1000,
+                "start": timing.get("start", 0) / 1000 or None
+            })
+    else:
+        for path in allure_result_paths(results_dir):
+            result = read_allure_result(path)
+            if result is None:
+                continue
+            if not whole_directory and window_start and not (
+                    result["start"] and window_start <= result["start"] <= (window_end or math.inf)):
+                continue
+            rows.append({
+                "scenario": result["name"],
+                "feature": result["feature"],
+                "tags": ",".join(result["tags"]),
+                "status": result["status"],
+                "framework": "behave",
+                "duration": result["duration"],
+                "start": result["start"]
+            })
+    
+    pytest_data = _load_json(pytest_report)
+    if pytest_data:
+        rows.extend(_pytest_rows(pytest_data))
+    
+    for row in rows:
+        entry = performance.get(row["scenario"])
+        if entry:
+            row["endpoint"] = entry.get("endpoint")
+            row["latency"] = entry.get("response_time")
+            row["status_code"] = entry.get("status_code")
+            row["wire_bytes"] = entry.get("wire_bytes")
+            row["decoded_bytes"] = entry.get("decoded_bytes")
+    
+    columns = {name: [MISSING[kind] if row.get(name) is None else row[name] for row in rows]
+               for name, kind in COLUMNS.items()}
+    started = window_start or min((row["start"] for row in rows if row.get("start")), default=time.time())
+    return columns, {"started": started, "rows": len(rows)}
+
+
+def write_rcol(path: str, columns: Dict[str, List[Any]], run: str):
+    """Write columns as a dictionary-encoded, per-column compressed .rcol file"""
+    rows = len(next(iter(columns.values()), []))
+    specs, blocks, offset = [], [], 0
+    for name, kind in COLUMNS.items():
+        values = columns.get(name, [MISSING[kind]] * rows)
+        spec = {"name": name, "type": kind}
+        if kind == "str":
+            dictionary: Dict[str, int] = {}
+            encoded = array.array("I", (dictionary.setdefault(str(value), len(dictionary)) for value in values))
+            spec["dictionary"] = list(dictionary)
+        else:
+            encoded = array.array(TYPECODES[kind], values)
+        block = zlib.compress(encoded.tobytes(), 6)
+        spec.update(offset=offset, length=len(block))
+        offset += len(block)
+        specs.append(spec)
+        blocks.append(block)
+    
+    header = json.dumps({"run": run, "created": time.time(), "rows": rows, "byteorder": sys.byteorder,
+                         "columns": specs}).encode()
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+
+
+def write_parquet(path: str, columns: Dict[str, List[Any]], run: str):
+    """Write columns as Parquet with dictionary-encoded strings (needs pyarrow)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet as parquet
+    except ImportError:
+        raise ImportError("Parquet archives require pyarrow: pip install pyarrow")
+    arrays = {}
+    for name, kind in COLUMNS.items():
+        values = columns[name]
+        arrays[name] = pyarrow.array(values).dictionary_encode() if kind == "str" else pyarrow.array(values)
+    table = pyarrow.table(arrays).replace_schema_metadata({"run": run, "created": str(time.time())})
+    parquet.write_table(table, path)
+
+
+class ArchivedRun:
+    """Lazily reads the columns of one archived run"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as parquet
+            metadata = parquet.read_schema(path).metadata or {}
+            self.run = metadata.get(b"run", os.path.basename(path).encode()).decode()
+            self.created = float(metadata.get(b"created", b"0"))
+            self.rows = parquet.ParquetFile(path).metadata.num_rows
+            self.header = None
+        else:
+            with open(path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path} is not a results archive")
+                length = int.from_bytes(f.read(8), "little")
+                self.header = json.loads(f.read(length))
+                self.data_offset = len(MAGIC) + 8 + length
+            self.run = self.header["run"]
+            self.created = self.header["created"]
+            self.rows = self.header["rows"]
+    
+    def column(self, name: str) -> Tuple[Optional[List[str]], Sequence[Any]]:
+        """Return (dictionary, indices) for string columns and (None, values) for numbers"""
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown column '{name}', expected one of {sorted(COLUMNS)} or 'run'")
+        if self.header is None:
+            import pyarrow.parquet as parquet
+            chunked = parquet.read_table(self.path, columns=[name]).column(name).combine_chunks()
+            if COLUMNS[name] == "str":
+                encoded = chunked if hasattr(chunked, "dictionary") else chunked.dictionary_encode()
+                return encoded.dictionary.to_pylist(), encoded.indices.to_pylist()
+            return None, chunked.to_pylist()
+        
+        spec = next(spec for spec in self.header["columns"] if spec["name"] == name)
+        with open(self.path, 'rb') as f:
+            f.seek(self.data_offset + spec["offset"])
+            block = zlib.decompress(f.read(spec["length"]))
+        values = array.array(TYPECODES[spec["type"]])
+        values.frombytes(block)
+        if self.header["byteorder"] != sys.byteorder:
+            values.byteswap()
+        return spec.get("dictionary"), values
+
+
+def archive_paths(archive_dir: str) -> List[str]:
+    """Archived runs, oldest first"""
+    paths = glob.glob(os.path.join(archive_dir, "*.rcol")) + glob.glob(os.path.join(archive_dir, "*.parquet"))
+    return sorted(paths)
+
+
+FILTER = re.compile(r"^\s*(\w+)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$")
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda value, target: value == target,
+    "!=": lambda value, target: value != target,
+    ">": lambda value, target: value > target,
+    ">=": lambda value, target: value >= target,
+    "<": lambda value, target: value < target,
+    "<=": lambda value, target: value <= target,
+    "~": lambda value, target: str(target) in str(value)
+}
+
+
+def parse_filter(expression: str) -> Tuple[str, Callable[[Any], bool]]:
+    """Parse "column<op>value" (ops = != > >= < <= and ~ for substring) into (column, predicate)"""
+    match = FILTER.match(expression)
+    if not match:
+        raise ValueError(f"Cannot parse filter '{expression}', expected e.g. status=failed or duration>1.5")
+    name, operator, target = match.groups()
+    kind = "str" if name == "run" else COLUMNS.get(name)
+    if kind is None:
+        raise KeyError(f"Unknown column '{name}', expected one of {sorted(COLUMNS)} or 'run'")
+    if kind != "str" and operator != "~":
+        target = float(target)
+    compare = OPERATORS[operator]
+    return name, lambda value: not _missing(value) and compare(value, target)
+
+
+def parse_aggregate(expression: str) -> Tuple[str, Optional[str]]:
+    """Parse "count" or "function:column" (sum, mean, min, max, p50, p90, p95, p99)"""
+    function, _, column = expression.partition(":")
+    if function == "count":
+        return function, None
+    if function not in ("sum", "mean", "min", "max") and not re.fullmatch(r"p\d{1,2}(\.\d+)?", function):
+        raise ValueError(f"Unknown aggregate '{function}'")
+    if COLUMNS.get(column) not in ("f64", "i64"):
+        raise KeyError(f"Aggregate '{expression}' needs a numeric column")
+    return function, column
+
+
+class _Accumulator:
+    """Streaming count, sum, min, max and percentile histogram of one column in one group"""
+    
+    def __init__(self, histogram: bool):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.histogram = LatencyHistogram() if histogram else None
+    
+    def add_many(self, values: List[float]):
+        """Add the non-missing values of one group from one run"""
+        if not values:
+            return
+        self.count += len(values)
+        self.total += math.fsum(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        if self.histogram is not None:
+            for value in values:
+                self.histogram.record(value)
+    
+    def result(self, function: str) -> Optional[float]:
+        if not self.count:
+            return None
+        if function == "sum":
+            return self.total
+        if function == "mean":
+            return self.total / self.count
+        if function == "min":
+            return self.min
+        if function == "max":
+            return self.max
+        return self.histogram.percentile(float(function[1:]))
+
+
+def query(paths: Iterable[str], where: Sequence[str] = (), group_by: Sequence[str] = (),
+          aggregates: Sequence[str] = ("count",)) -> List[Dict[str, Any]]:
+    """Filter and aggregate rows across archived runs, one row per group.
+    
+    Only the columns named in filters, groups and aggregates are read.
+    Percentiles come from log-bucketed histograms (within 2%).
+    """
+    filters = [parse_filter(expression) for expression in where]
+    parsed = [parse_aggregate(expression) for expression in aggregates]
+    value_columns = sorted({column for _, column in parsed if column})
+    percentile_columns = {column for function, column in parsed if column and function.startswith("p")}
+    groups: Dict[Tuple, Dict[str, Any]] = {}
+    
+    for path in paths:
+        run = ArchivedRun(path)
+        if not run.rows:
+            continue
+        rows = range(run.rows)
+        selected = None
+        
+        for name, predicate in filters:
+            if name == "run":
+                if not predicate(run.run):
+                    selected = []
+                    break
+                continue
+            dictionary, values = run.column(name)
+            if dictionary is not None:
+                matching = {index for index, value in enumerate(dictionary) if predicate(value)}
+                keep = [row for row in (rows if selected is None else selected) if values[row] in matching]
+            else:
+                keep = [row for row in (rows if selected is None else selected) if predicate(values[row])]
+            selected = keep
+        if selected is None:
+            selected = rows
+        if not selected:
+            continue
+        
+        # Bucket rows by the dictionary indices of the group columns, decode each key once
+        keys, dictionaries = [], []
+        for name in group_by:
+            if name == "run":
+                dictionary, values = [run.run], [0] * run.rows
+            else:
+                dictionary, values = run.column(name)
+            keys.append(values)
+            dictionaries.append(dictionary)
+        buckets: Dict[Tuple, List[int]] = {}
+        if keys:
+            for row, key in zip(selected, zip(*[[column[row] for row in selected] for column in keys])):
+                buckets.setdefault(key, []).append(row)
+        else:
+            buckets[()] = list(selected)
+        numbers = {name: run.column(name)[1] for name in value_columns}
+        
+        for key, members in buckets.items():
+            key = tuple(value if dictionary is None else dictionary[value]
+                        for value, dictionary in zip(key, dictionaries))
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {"count": 0, "values": {name: _Accumulator(name in percentile_columns)
+                                                                for name in value_columns}}
+            group["count"] += len(members)
+            for name, column in numbers.items():
+                group["values"][name].add_many([value for value in map(column.__getitem__, members)
+                                                if value == value and value != -1])
+    
+    results = []
+    for key, group in groups.items():
+        row = dict(zip(group_by, key))
+        for (function, column), expression in zip(parsed, aggregates):
+            row[expression] = group["count"] if function == "count" else group["values"][column].result(function)
+        results.append(row)
+    return results
\ No newline at end of file
@@ -1,5 +1,6 @@
 import json
 import time
+from response_snapshots import hash_tree, diff_trees
 from typing import Dict, Any, List
 
 class ReusableFunctions:
@@ -57,4 +58,9 @@ class ReusableFunctions:
         for key, expected_value in expected.items():
             if key not in actual or actual[key] != expected_value:
                 return False
-        return True
\ No newline at end of file
+        return True
+    
+    @staticmethod
+    def diff_response_data(old: Any, new: Any) -> List[Dict[str, Any]]:
+        """List the changed paths between two responses using structural hashes"""
+        return diff_trees(hash_tree(old), hash_tree(new))
\ No newline at end of file
@@ -4,6 +4,10 @@ import sys
 import os
 import argparse
 from datetime import datetime
+from catalog import CATALOG_FEATURE
+from native_report import build_report
+from profiling import PROFILE_DIR_ENV
+from run_history import INCLUDE_QUARANTINED_ENV, HistoryScheduler
 
 def create_reports_dir():
     """Create reports directory if it doesn't exist"""
@@ -40,6 +44,22 @@ def run_integration_tests():
     cmd = [sys.executable, "-m", "behave", "--tags=@integration", "-f", "allure_behave.formatter:AllureFormatter", "-o", "reports/allure-results", "-f", "pretty"]
     return subprocess.run(cmd)
 
+def run_resilience_tests():
+    """Run resilience tests through the fault-injection proxy"""
+    print("🌩️ Running BDD Resilience Tests...")
+    cmd = [sys.executable, "-m", "behave", "--tags=@resilience", "-f", "allure_behave.formatter:AllureFormatter", "-o", "reports/allure-results", "-f", "pretty"]
+    return subprocess.run(cmd)
+
+def run_catalog_tests():
+    """Generate catalog scenarios and run them"""
+    print("📚 Running BDD Catalog Tests...")
+    generate = subprocess.run([sys.executable, "generate_catalog.py", "--output", CATALOG_FEATURE])
+    if generate.returncode != 0:
+        return generate
+    # features/ comes first so behave still finds its steps and environment
+    cmd = [sys.executable, "-m", "behave", "features", CATALOG_FEATURE, "--tags=@catalog", "-f", "allure_behave.formatter:AllureFormatter", "-o", "reports/allure-results", "-f", "pretty"]
+    return subprocess.run(cmd)
+
 def run_all_tests():
     """Run all BDD tests"""
     print("🚀 Running All BDD Tests...")
@@ -52,14 +72,54 @@ def run_specific_feature(feature_name):
     cmd = [sys.executable, "-m", "behave", f"features/{feature_name}.feature", "-f", "allure_behave.formatter:AllureFormatter", "-o", "reports/allure-results", "-f", "pretty"]
     return subprocess.run(cmd)
 
+def run_failed_scenarios():
+    """Rerun the scenarios that failed in their last run"""
+    locations = [location for location in HistoryScheduler.from_config().history.failed_locations()
+                 if ".feature:" in location]
+    if not locations:
+        print("✅ No failed scenarios in the last run")
+        return subprocess.CompletedProcess([], 0)
+    print(f"🔁 Rerunning {len(locations)} failed scenarios...")
+    cmd = [sys.executable, "-m", "behave"] + locations + ["-f", "allure_behave.formatter:AllureFormatter", "-o", "reports/allure-results", "-f", "pretty"]
+    return subprocess.run(cmd)
+
+def generate_native_report():
+    """Build the pure-Python HTML report"""
+    print("\n📈 Generating native HTML report...")
+    index_path = build_report()
+    print(f"✅ Native report generated: {index_path}")
+
+def generate_allure_report(fallback=True):
+    """Generate the Allure HTML report, falling back to the native report without the CLI"""
+    print("\n📈 Generating Allure HTML report...")
+    try:
+        allure_cmd = ["allure", "generate", "reports/allure-results", "-o", "reports/allure-report", "--clean"]
+        subprocess.run(allure_cmd, check=True)
+        print("✅ Allure report generated: reports/allure-report/index.html")
+        print("🔗 To serve report: allure serve reports/allure-results")
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        print("⚠️ Allure CLI not found. Install with: npm install -g allure-commandline")
+        if fallback:
+            generate_native_report()
+        else:
+            print("📁 Raw results available in: reports/allure-results")
+
 def main():
     parser = argparse.ArgumentParser(description="PokéAPI BDD Test Runner")
-    parser.add_argument("--suite", choices=["smoke", "negative", "performance", "validation", "integration", "all"], 
+    parser.add_argument("--suite", choices=["smoke", "negative", "performance", "validation", "integration", "resilience", "catalog", "all"], 
                        default="all", help="Test suite to run")
     parser.add_argument("--feature", help="Specific feature file to run (without .feature extension)")
     parser.add_argument("--install-deps", action="store_true", 
                        help="Install dependencies before running tests")
+    parser.add_argument("--profile", nargs="?", const="reports/profile",
+                       help="Profile each test (cProfile, stack sampling, tracemalloc) into this directory")
     parser.add_argument("--tags", help="Run tests with specific tags (e.g., @smoke,@negative)")
+    parser.add_argument("--rerun-failed", action="store_true",
+                       help="Only rerun the scenarios that failed in their last run")
+    parser.add_argument("--include-quarantined", action="store_true",
+                       help="Also run scenarios quarantined as flaky")
+    parser.add_argument("--report", choices=["auto", "allure", "native", "none"], default="auto",
+                       help="HTML report: Allure CLI with native fallback (auto), Allure only, native only, or none")
     
     args = parser.parse_args()
     
@@ -71,10 +131,21 @@ def main():
     # Create reports directory
     create_reports_dir()
     
+    # Test processes pick the profile directory up from the environment
+    if args.profile:
+        os.environ[PROFILE_DIR_ENV] = args.profile
+        print(f"⏱️ Profiling enabled, writing to {args.profile}")
+    
+    if args.include_quarantined:
+        os.environ[INCLUDE_QUARANTINED_ENV] = "1"
+    
     print(f"\n🎯 Starting BDD test execution at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # Rerun last run's failures if requested
+    if args.rerun_failed:
+        result = run_failed_scenarios()
     # Run specific feature if provided
-    if args.feature:
+    elif args.feature:
         result = run_specific_feature(args.feature)
     # Run tests with specific tags if provided
     elif args.tags:
@@ -92,22 +163,24 @@ def main():
         result = run_validation_tests()
     elif args.suite == "integration":
         result = run_integration_tests()
+    elif args.suite == "resilience":
+        result = run_resilience_tests()
+    elif args.suite == "catalog":
+        result = run_catalog_tests()
     else:
         result = run_all_tests()
     
     print(f"\n✅ BDD test execution completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"📊 Check reports/allure-results for test data")
     
-    # Generate Allure report
-    print("\n📈 Generating Allure HTML report...")
-    try:
-        allure_cmd = ["allure", "generate", "reports/allure-results", "-o", "reports/allure-report", "--clean"]
-        subprocess.run(allure_cmd, check=True)
-        print("✅ Allure report generated: reports/allure-report/index.html")
-        print("🔗 To serve report: allure serve reports/allure-results")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("⚠️ Allure CLI not found. Install with: npm install -g allure-commandline")
-        print("📁 Raw results available in: reports/allure-results")
+    # Generate HTML report
+    if args.report == "native":
+        generate_native_report()
+    elif args.report != "none":
+        generate_allure_report(fallback=args.report == "auto")
+    
+    if args.profile:
+        print(f"⏱️ Flame graph stacks and hot-function tables saved to {args.profile}")
     
     return result.returncode
 
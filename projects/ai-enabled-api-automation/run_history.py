@@ -0,0 +1,233 @@
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Set by the runners' --include-quarantined to run quarantined tests instead of skipping them
+INCLUDE_QUARANTINED_ENV = "TEST_INCLUDE_QUARANTINED"
+
+# Steps that assert on latency; only these scenarios are retried automatically when flaky
+LATENCY_STEP = re.compile(r"response time should be", re.IGNORECASE)
+# pytest tests named after response_time or marked @pytest.mark.latency
+LATENCY_TEST = re.compile(r"response_time")
+LATENCY_MARKER = "latency"
+
+
+class RunHistory:
+    """Recent outcomes of every test across runs, keyed by a stable test ID.
+    
+    Behave scenarios use "<feature>: <scenario>" and pytest tests their node
+    ID. Only the last `window` outcomes are kept per test.
+    """
+    
+    def __init__(self, path: str = "reports/test_history.json", window: int = 20):
+        self.path = path
+        self.window = window
+        self.tests = self._load()
+        self.updated = set()
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r') as f:
+            return json.load(f)
+    
+    def record(self, test_id: str, status: str, duration: float, location: Optional[str] = None):
+        self.updated.add(test_id)
+        entry = self.tests.setdefault(test_id, {"runs": []})
+        if location:
+            entry["location"] = location
+        entry["runs"].append({"time": time.time(), "status": status, "duration": round(duration, 3)})
+        del entry["runs"][:-self.window]
+    
+    def statuses(self, test_id: str) -> List[str]:
+        return [run["status"] for run in self.tests.get(test_id, {}).get("runs", [])]
+    
+    def last_failed(self, test_id: str) -> bool:
+        statuses = self.statuses(test_id)
+        return bool(statuses) and statuses[-1] == "failed"
+    
+    def failure_rate(self, test_id: str) -> float:
+        statuses = self.statuses(test_id)
+        return statuses.count("failed") / len(statuses) if statuses else 0.0
+    
+    def flips(self, test_id: str) -> int:
+        """How often the outcome changed between consecutive runs"""
+        statuses = self.statuses(test_id)
+        return sum(1 for previous, current in zip(statuses, statuses[1:]) if previous != current)
+    
+    def passed_streak(self, test_id: str) -> int:
+        streak = 0
+        for status in reversed(self.statuses(test_id)):
+            if status != "passed":
+                break
+            streak += 1
+        return streak
+    
+    def time_to_fail(self, test_id: str) -> float:
+        """Mean duration of the failing runs; long ones are started early so red builds show up sooner"""
+        durations = [run["duration"] for run in self.tests.get(test_id, {}).get("runs", []) if run["status"] == "failed"]
+        return sum(durations) / len(durations) if durations else 0.0
+    
+    def failed_locations(self) -> List[str]:
+        """Locations of the tests whose latest run failed"""
+        return [entry["location"] for test_id, entry in self.tests.items()
+                if entry.get("location") and self.last_failed(test_id)]
+    
+    def save(self):
+        """Write the tests recorded in this run over the file's current contents
+        
+        BDD and pytest runs share the file, so entries written by another run
+        since this one started are kept.
+        """
+        tests = self._load()
+        tests.update({test_id: self.tests[test_id] for test_id in self.updated})
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(tests, f, indent=1)
+
+
+class HistoryScheduler:
+    """Orders, retries and quarantines tests from their run history.
+    
+    Previously failed tests run first, then those that fail often and take
+    long to do so. A test is flaky when its recent outcomes both pass and
+    fail and flip at least flaky_min_flips times. Flaky latency checks are
+    retried up to retry_attempts times; if one still fails it is added to the
+    quarantine file and skipped until run with --include-quarantined and
+    released after release_after passes in a row.
+    """
+    
+    def __init__(self, history: RunHistory, quarantine_file: str = "quarantine.json", failed_first: bool = True,
+                 flaky_min_flips: int = 2, retry_attempts: int = 3, release_after: int = 5,
+                 include_quarantined: bool = False):
+        self.history = history
+        self.quarantine_file = quarantine_file
+        self.failed_first = failed_first
+        self.flaky_min_flips = flaky_min_flips
+        self.retry_attempts = retry_attempts
+        self.release_after = release_after
+        self.include_quarantined = include_quarantined
+        self.quarantine: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(quarantine_file):
+            with open(quarantine_file, 'r') as f:
+                self.quarantine = json.load(f)
+        self.retried: List[str] = []
+        self.quarantined: List[str] = []
+        self.released: List[str] = []
+    
+    @classmethod
+    def from_config(cls, config_path: str = "config.json") -> "HistoryScheduler":
+        with open(config_path, 'r') as f:
+            options = json.load(f).get("scheduler", {})
+        history = RunHistory(options.get("history_file", "reports/test_history.json"), options.get("window", 20))
+        return cls(
+            history,
+            quarantine_file=options.get("quarantine_file", "quarantine.json"),
+            failed_first=options.get("failed_first", True),
+            flaky_min_flips=options.get("flaky_min_flips", 2),
+            retry_attempts=options.get("retry_attempts", 3),
+            release_after=options.get("release_after", 5),
+            include_quarantined=os.environ.get(INCLUDE_QUARANTINED_ENV) == "1"
+        )
+    
+    def is_flaky(self, test_id: str) -> bool:
+        statuses = self.history.statuses(test_id)
+        return "passed" in statuses and "failed" in statuses and self.history.flips(test_id) >= self.flaky_min_flips
+    
+    def classify(self, test_id: str) -> str:
+        """quarantined, flaky, failing, passing or new"""
+        if test_id in self.quarantine:
+            return "quarantined"
+        if self.is_flaky(test_id):
+            return "flaky"
+        if self.history.last_failed(test_id):
+            return "failing"
+        return "passing" if self.history.statuses(test_id) else "new"
+    
+    def priority(self, test_ids: Iterable[str]) -> Tuple[int, float, float]:
+        """Sort key for a test (or a group of tests such as a feature): lower runs earlier"""
+        keys = [(0 if self.history.last_failed(test_id) else 1, -self.history.failure_rate(test_id),
+                 -self.history.time_to_fail(test_id)) for test_id in test_ids]
+        return min(keys, default=(1, 0.0, 0.0))
+    
+    def order(self, items: List[Any], test_ids) -> List[Any]:
+        """Stable-sort items in place by the priority of their test IDs (test_ids(item) -> iterable)"""
+        if self.failed_first:
+            items.sort(key=lambda item: self.priority(test_ids(item)))
+        return items
+    
+    def skip_reason(self, test_id: str) -> Optional[str]:
+        if test_id in self.quarantine and not self.include_quarantined:
+            return f"Quarantined: {self.quarantine[test_id]['reason']}"
+        return None
+    
+    def attempts_for(self, test_id: str, latency_check: bool) -> int:
+        """How many times a test may run before its failure counts"""
+        if latency_check and self.is_flaky(test_id):
+            self.retried.append(test_id)
+            return self.retry_attempts
+        return 1
+    
+    def record(self, test_id: str, status: str, duration: float, location: Optional[str] = None,
+               latency_check: bool = False):
+        """Record an outcome and update the quarantine"""
+        if status not in ("passed", "failed"):
+            return
+        self.history.record(test_id, status, duration, location)
+        if test_id in self.quarantine:
+            if self.history.passed_streak(test_id) >= self.release_after:
+                del self.quarantine[test_id]
+                self.released.append(test_id)
+        elif status == "failed" and latency_check and self.is_flaky(test_id):
+            self.quarantine[test_id] = {
+                "reason": f"flaky latency check ({self.history.flips(test_id)} flips in "
+                          f"{len(self.history.statuses(test_id))} runs)",
+                "since": time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            self.quarantined.append(test_id)
+    
+    def save(self):
+        self.history.save()
+        if not self.quarantined and not self.released:
+            return
+        quarantine = {}
+        if os.path.exists(self.quarantine_file):
+            with open(self.quarantine_file, 'r') as f:
+                quarantine = json.load(f)
+        quarantine.update({test_id: self.quarantine[test_id] for test_id in self.quarantined})
+        for test_id in self.released:
+            quarantine.pop(test_id, None)
+        with open(self.quarantine_file, 'w') as f:
+            json.dump(quarantine, f, indent=2)
+    
+    def summary(self) -> List[str]:
+        lines = []
+        flaky = [test_id for test_id in self.history.tests if self.is_flaky(test_id)]
+        if flaky:
+            lines.append(f"Flaky tests ({len(flaky)}): " + ", ".join(sorted(flaky)))
+        if self.retried:
+            lines.append(f"Auto-retried flaky latency checks: {', '.join(self.retried)}")
+        if self.quarantined:
+            lines.append(f"Quarantined: {', '.join(self.quarantined)}")
+        if self.released:
+            lines.append(f"Released from quarantine: {', '.join(self.released)}")
+        return lines
+
+
+def scenario_id(feature_name: str, scenario_name: str) -> str:
+    return f"{feature_name}: {scenario_name}"
+
+
+def has_latency_check(scenario) -> bool:
+    """True if a behave scenario (or any example of an outline) asserts on response time"""
+    steps = list(getattr(scenario, "steps", []))
+    for example in getattr(scenario, "scenarios", []):
+        steps.extend(example.steps)
+    return any(LATENCY_STEP.search(step.name) for step in steps)
+
+
+def is_latency_test(nodeid: str, keywords: Iterable[str] = ()) -> bool:
+    """True for pytest tests that assert on response time (keywords: the item's or report's keywords)"""
+    return LATENCY_MARKER in keywords or bool(LATENCY_TEST.search(nodeid.rpartition("::")[2]))
\ No newline at end of file
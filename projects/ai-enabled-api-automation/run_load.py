@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Distributed Load Runner
+Coordinates load worker processes on this or other hosts and merges their latency histograms
+"""
+
+import argparse
+import json
+import os
+import sys
+from load_cluster import Coordinator, run_worker
+
+def load_config():
+    """Read config.json from the current directory"""
+    with open("config.json", 'r') as f:
+        return json.load(f)
+
+def parse_address(address):
+    """Split host:port"""
+    host, _, port = address.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+def build_plan(args, config):
+    """Workload plan from config.json["load"] with command line overrides"""
+    load_options = config.get("load", {})
+    endpoints = load_options.get("endpoints", {"/pokemon/25": 1})
+    if args.endpoint:
+        endpoints = {}
+        for item in args.endpoint:
+            path, _, weight = item.partition("=")
+            endpoints[path] = float(weight or 1)
+    return {
+        "base_url": args.base_url or config["base_url"],
+        "endpoints": endpoints,
+        "duration": args.duration or load_options.get("duration", 30),
+        "concurrency": args.concurrency or load_options.get("concurrency", 8),
+        "timeout": config.get("timeout", 10)
+    }
+
+def run_coordinator(args):
+    config = load_config()
+    plan = build_plan(args, config)
+    workers = max(args.workers, args.local_workers)
+    if not workers:
+        print("❌ Set --workers and/or --local-workers")
+        return 2
+    
+    coordinator = Coordinator(plan, workers, listen=parse_address(args.listen),
+                              report_interval=config.get("load", {}).get("report_interval", 1.0))
+    host, port = coordinator.address
+    print(f"🎯 Coordinator listening on {host}:{port}, waiting for {workers} workers")
+    print(f"   Plan: {plan['concurrency']} threads per worker for {plan['duration']}s against {plan['base_url']}")
+    processes = coordinator.spawn_local_workers(args.local_workers) if args.local_workers else []
+    
+    def progress(requests, elapsed):
+        if elapsed > 0:
+            print(f"   {elapsed:6.1f}s  {requests:>10,} requests  {requests / elapsed:>10,.0f} req/s")
+    
+    try:
+        report = coordinator.run(on_progress=progress)
+    except TimeoutError as e:
+        print(f"❌ {e}")
+        return 1
+    for process in processes:
+        process.wait()
+    
+    latency = report["latency"]
+    print(f"\n📊 {report['requests']:,} requests from {report['workers']} workers, "
+          f"{report['throughput']:,.0f} req/s")
+    if latency["count"]:
+        print(f"   p50 {latency['p50'] * 1000:.1f}ms  p90 {latency['p90'] * 1000:.1f}ms  "
+              f"p99 {latency['p99'] * 1000:.1f}ms  max {latency['max'] * 1000:.1f}ms")
+    if report["errors"]:
+        print(f"⚠️ Errors: {report['errors']}")
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📁 Report saved to {args.output}")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed load generation")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    coordinator = commands.add_parser("coordinator", help="Hand out the plan and merge worker results")
+    coordinator.add_argument("--listen", default="0.0.0.0:7788", help="Address workers connect to (host:port)")
+    coordinator.add_argument("--workers", type=int, default=0, help="Total workers to wait for")
+    coordinator.add_argument("--local-workers", type=int, default=0,
+                             help="Worker processes to start on this machine")
+    coordinator.add_argument("--base-url", help="API base URL (default: config.json)")
+    coordinator.add_argument("--endpoint", action="append", help="Path to load, optionally path=weight (repeatable)")
+    coordinator.add_argument("--duration", type=float, help="Seconds of load")
+    coordinator.add_argument("--concurrency", type=int, help="Threads per worker")
+    coordinator.add_argument("--output", default="reports/load_report.json", help="Merged JSON report")
+    
+    worker = commands.add_parser("worker", help="Generate load for a coordinator")
+    worker.add_argument("--connect", required=True, help="Coordinator address (host:port)")
+    
+    args = parser.parse_args()
+    if args.command == "worker":
+        run_worker(*parse_address(args.connect))
+        return 0
+    return run_coordinator(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Soak Test Runner
+Loops BDD scenarios for a duration and fails on sustained memory, fd or socket growth
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from leak_monitor import LeakMonitor
+from run_suites import run_selection
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test BDD scenarios and detect resource leaks")
+    parser.add_argument("--tags", default="@smoke", help="Scenarios to loop (behave tag expression)")
+    parser.add_argument("--duration", type=float, default=600, help="Soak duration in seconds")
+    parser.add_argument("--warmup", type=float, default=60, help="Seconds excluded from the growth trend")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between resource samples")
+    parser.add_argument("--max-rss-slope", type=float, default=512, help="Allowed RSS growth in KiB/min")
+    parser.add_argument("--max-traced-slope", type=float, default=256, help="Allowed Python heap growth in KiB/min")
+    parser.add_argument("--max-fd-slope", type=float, default=1, help="Allowed open file descriptor growth per minute")
+    parser.add_argument("--max-socket-slope", type=float, default=1, help="Allowed open socket growth per minute")
+    parser.add_argument("--output", default="reports/soak_report.json", help="JSON soak report")
+    
+    args = parser.parse_args()
+    
+    # Per-request INFO logs would flood a long soak run
+    logging.disable(logging.INFO)
+    
+    print(f"🔁 Soaking {args.tags} for {args.duration:.0f}s (warm-up {args.warmup:.0f}s)")
+    monitor = LeakMonitor(warmup=args.warmup)
+    monitor.sample(0)
+    
+    iteration = 0
+    failed_iterations = 0
+    next_sample = time.monotonic() + args.interval
+    end_time = time.monotonic() + args.duration
+    while time.monotonic() < end_time:
+        iteration += 1
+        passed, _ = run_selection("soak", args.tags, report=False)
+        if not passed:
+            failed_iterations += 1
+        if time.monotonic() >= next_sample:
+            sample = monitor.sample(iteration)
+            next_sample += args.interval
+            print(f"   {sample['elapsed']:7.0f}s  iter {iteration:>5}  rss {sample['rss_kb'] / 1024:7.1f} MiB  "
+                  f"heap {sample['traced_kb'] / 1024:6.1f} MiB  fds {sample['fds']:>4}  sockets {sample['sockets']:>3}")
+    monitor.sample(iteration)
+    
+    result = monitor.evaluate({
+        "rss_kb": args.max_rss_slope,
+        "traced_kb": args.max_traced_slope,
+        "fds": args.max_fd_slope,
+        "sockets": args.max_socket_slope
+    })
+    result.update({"iterations": iteration, "failed_iterations": failed_iterations, "tags": args.tags})
+    
+    print(f"\n📊 {iteration} iterations, {failed_iterations} with failures")
+    for metric, slope in result["slopes_per_minute"].items():
+        print(f"   {metric:<10} {slope:+10.2f}/min")
+    if result["passed"]:
+        print("✅ No sustained resource growth")
+    else:
+        print("❌ Sustained resource growth detected:")
+        for failure in result["failures"]:
+            print(f"   - {failure}")
+        print("   Top growing allocation sites:")
+        for site in result["growing_sites"]:
+            print(f"   {site['size_kb']:>10.1f} KiB {site['count']:>+8}  {site['site']}")
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"📁 Report saved to {args.output}")
+    return 0 if result["passed"] and not failed_iterations else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
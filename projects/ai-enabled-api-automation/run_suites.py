@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+In-Process Suite Runner
+Runs several BDD suites or tag selections in one interpreter and builds one report
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from behave.configuration import Configuration
+from behave.runner import Runner
+from behave.step_registry import registry
+from catalog import CATALOG_FEATURE
+from native_report import build_report
+from utils.bdd_utils import BDDUtils
+
+SUITES = {
+    "smoke": "@smoke",
+    "negative": "@negative",
+    "performance": "@performance",
+    "validation": "@validation",
+    "integration": "@integration",
+    "resilience": "@resilience",
+    "catalog": "@catalog",
+}
+
+# Suites whose scenarios live outside features/; features/ stays first for its steps and environment
+SUITE_PATHS = {
+    "catalog": ["features", CATALOG_FEATURE],
+}
+
+METRICS_FILE = "reports/test_metrics.json"
+
+def reset_step_registry():
+    """Empty the step registry so the next run can load the step modules again"""
+    for step_definitions in registry.steps.values():
+        del step_definitions[:]
+
+def run_selection(name, tags, results_dir="reports/allure-results", report=True, paths=None):
+    """Run one tag selection in this interpreter, returning (passed, seconds).
+    
+    With report=False nothing is written (no Allure results, JUnit or console output).
+    paths replaces the feature paths from behave.ini.
+    """
+    try:
+        import allure_commons
+        plugins_before = set(allure_commons.plugin_manager.get_plugins())
+    except ImportError:
+        allure_commons = None
+    
+    if report:
+        args = [f"--tags={tags}", "-f", "allure_behave.formatter:AllureFormatter", "-o", results_dir,
+                "-f", "progress", f"--junit-directory=reports/junit/{name}"]
+    else:
+        args = [f"--tags={tags}", "-f", "null", "--no-junit", "--no-summary"]
+    config = Configuration(args + (paths or []))
+    reset_step_registry()
+    root_handlers = logging.root.handlers[:]
+    start_time = time.time()
+    try:
+        failed = Runner(config).run()
+    finally:
+        # Handlers added by environment.py would otherwise echo every later run's logs
+        logging.root.handlers[:] = root_handlers
+        # Each run's Allure listeners stay registered globally unless removed
+        if allure_commons:
+            for plugin in set(allure_commons.plugin_manager.get_plugins()) - plugins_before:
+                allure_commons.plugin_manager.unregister(plugin)
+    return not failed, time.time() - start_time
+
+def merge_metrics(combined, name, metrics):
+    """Add one suite's test_metrics.json to the metrics of the whole run"""
+    combined.setdefault("scenarios", []).extend(metrics.get("scenarios", []))
+    combined.setdefault("performance_data", []).extend(metrics.get("performance_data", []))
+    starts = [started for started in (combined.get("start_time"), metrics.get("start_time")) if started is not None]
+    combined["start_time"] = min(starts) if starts else None
+    combined["end_time"] = metrics.get("end_time") or combined.get("end_time")
+    # Telemetry is shared by every run in this process, so the latest snapshot (and the prefetch
+    # rate computed from it) already covers all suites so far
+    for key in ("telemetry", "prefetch"):
+        if key in metrics:
+            combined[key] = metrics[key]
+    if "retention" in metrics:
+        retention = combined.setdefault("retention", {})
+        for key, value in metrics["retention"].items():
+            retention[key] = retention.get(key, 0) + value if isinstance(value, int) else value
+    combined.setdefault("suites", {})[name] = {"scenarios": len(metrics.get("scenarios", [])),
+                                              "budget": metrics.get("budget")}
+    # Each suite has its own budget, so a single suite budget only applies to single-suite runs
+    budgets = [suite["budget"] for suite in combined["suites"].values() if suite["budget"]]
+    combined.pop("budget", None)
+    if len(combined["suites"]) == 1 and budgets:
+        combined["budget"] = budgets[0]
+
+def run_suites(selections, results_dir="reports/allure-results", metrics_file=METRICS_FILE):
+    """Run (name, tags) selections one after another, returning {name: (passed, seconds)}.
+    
+    Every run rewrites metrics_file, so each suite's metrics are merged as it
+    finishes and the combined metrics are written back once all have run.
+    """
+    results = {}
+    combined = {}
+    for name, tags in selections:
+        print(f"\n🏷️ Running {name} ({tags})...")
+        if os.path.exists(metrics_file):
+            os.remove(metrics_file)
+        results[name] = run_selection(name, tags, results_dir, paths=SUITE_PATHS.get(name))
+        if os.path.exists(metrics_file):
+            with open(metrics_file, 'r') as f:
+                merge_metrics(combined, name, json.load(f))
+    if combined:
+        BDDUtils.save_metrics(combined, metrics_file)
+    return results
+
+def generate_report(results_dir="reports/allure-results", report_dir="reports/allure-report", native=False):
+    """Generate the HTML report once for every suite that ran; the native report is the fallback"""
+    if not native:
+        print("\n📈 Generating Allure HTML report...")
+        try:
+            subprocess.run(["allure", "generate", results_dir, "-o", report_dir, "--clean"], check=True)
+            print(f"✅ Allure report generated: {report_dir}/index.html")
+            return
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print("⚠️ Allure CLI not found, building the native report instead")
+    print("\n📈 Generating native HTML report...")
+    print(f"✅ Native report generated: {build_report(results_dir)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several BDD suites in one process")
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES), default=["smoke"],
+                       help="Suites to run, in order")
+    parser.add_argument("--tags", action="append", default=[],
+                       help="Extra tag selection to run (repeatable, e.g. --tags @smoke,@negative)")
+    parser.add_argument("--no-report", action="store_true", help="Skip HTML report generation")
+    parser.add_argument("--native-report", action="store_true",
+                       help="Build the pure-Python report instead of calling the Allure CLI")
+    
+    args = parser.parse_args()
+    selections = [(suite, SUITES[suite]) for suite in args.suites]
+    selections += [(tags.replace("@", "").replace(",", "-"), tags) for tags in args.tags]
+    
+    os.makedirs("reports", exist_ok=True)
+    print(f"🎯 Starting in-process run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if "catalog" in args.suites:
+        import generate_catalog
+        generate_catalog.main(["--output", CATALOG_FEATURE])
+    
+    start_time = time.time()
+    results = run_suites(selections)
+    
+    print("\n📊 Suite results:")
+    for name, (passed, seconds) in results.items():
+        print(f"   {'✅' if passed else '❌'} {name:<20} {seconds:6.2f}s")
+    print(f"   Total: {time.time() - start_time:.2f}s")
+    
+    if not args.no_report:
+        generate_report(native=args.native_report)
+    
+    return 0 if all(passed for passed, _ in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
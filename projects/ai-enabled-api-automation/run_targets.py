@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Multi-Target Comparison
+Replays the suite's requests against several base URLs concurrently and compares latency, throughput and responses
+"""
+
+import argparse
+import json
+import os
+import sys
+from api_client import APIClient
+from multi_target import MultiTargetRun, parse_targets, suite_paths
+
+def load_config():
+    """Read config.json from the current directory"""
+    with open("config.json", 'r') as f:
+        return json.load(f)
+
+def request_paths(args, config):
+    """Paths from --path, else the last suite run, else the load plan"""
+    if args.path:
+        return args.path
+    paths = suite_paths(args.metrics)
+    if not paths:
+        print(f"⚠️ No recorded requests in {args.metrics}, using the load plan endpoints")
+        paths = list(config.get("load", {}).get("endpoints", {"/pokemon/25": 1}))
+    return paths[:args.max_paths] if args.max_paths else paths
+
+def milliseconds(value):
+    return f"{value * 1000:.1f}" if value is not None else "-"
+
+def print_report(report):
+    """Side-by-side tables: one column group per target"""
+    names = list(report["targets"])
+    print(f"\n📊 {report['paths']} requests x {report['repeat']} against {len(names)} targets "
+          f"(baseline: {report['baseline']})")
+    print(f"   {'target':<16}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}  errors")
+    for name, target in report["targets"].items():
+        latency = target["latency"]
+        print(f"   {name:<16}{target['requests']:>10,}{target['throughput'] or 0:>10,.1f}"
+              f"{milliseconds(latency['p50']):>10}{milliseconds(latency['p90']):>10}"
+              f"{milliseconds(latency['p99']):>10}  {target['errors'] or ''}")
+    
+    print(f"\n   {'endpoint p50 / p90 ms':<28}" + "".join(f"{name:>20}" for name in names))
+    for endpoint, targets in sorted(report["endpoints"].items()):
+        cells = []
+        for name in names:
+            summary = targets.get(name)
+            cells.append(f"{milliseconds(summary['p50'])} / {milliseconds(summary['p90'])}" if summary else "-")
+        print(f"   {endpoint:<28}" + "".join(f"{cell:>20}" for cell in cells))
+    
+    if report["diffs"]:
+        print(f"\n⚠️ {len(report['diffs'])} requests differ from {report['baseline']}")
+        for endpoint, counts in sorted(report["mismatches"].items()):
+            print(f"   {endpoint}: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+        for path, targets in list(report["diffs"].items())[:10]:
+            for name, diff in targets.items():
+                if "status" in diff:
+                    print(f"   {path} [{name}]: status {diff['status'][0]} -> {diff['status'][1]}")
+                else:
+                    print(f"   {path} [{name}]: {', '.join(change['path'] for change in diff['changes'][:5])}"
+                          f"{' ...' if diff['changed'] > 5 else ''}")
+    else:
+        print("\n✅ All targets returned the same responses")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare several API deployments with the suite's requests")
+    parser.add_argument("--target", action="append",
+                        help="Base URL to compare, as name=url (repeatable; the first is the baseline)")
+    parser.add_argument("--path", action="append", help="Request path to send instead of the recorded ones (repeatable)")
+    parser.add_argument("--metrics", default="reports/test_metrics.json",
+                        help="Metrics file of the suite run whose requests are replayed")
+    parser.add_argument("--max-paths", type=int, help="Replay at most this many of the most frequent requests")
+    parser.add_argument("--repeat", type=int, help="Times each request is sent to every target")
+    parser.add_argument("--workers", type=int, help="Concurrent requests per target")
+    parser.add_argument("--output", default="reports/target_comparison.json", help="JSON comparison report")
+    
+    args = parser.parse_args()
+    
+    config = load_config()
+    options = config.get("multi_target", {})
+    targets = parse_targets(args.target) if args.target else options.get("targets", {"default": config["base_url"]})
+    if len(targets) < 2:
+        print("⚠️ Only one target configured; add more with --target name=url")
+    paths = request_paths(args, config)
+    
+    run = MultiTargetRun(targets, paths, APIClient.options_from_config(config),
+                         repeat=args.repeat or options.get("repeat", 1),
+                         workers=args.workers or options.get("workers", 8))
+    print(f"🎯 Sending {len(paths)} requests to {', '.join(targets)}")
+    report = run.run()
+    print_report(report)
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📁 Report saved to {args.output}")
+    return 1 if report["diffs"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -4,6 +4,8 @@ import sys
 import os
 import argparse
 from datetime import datetime
+from profiling import PROFILE_DIR_ENV
+from run_history import INCLUDE_QUARANTINED_ENV
 
 def create_reports_dir():
     """Create reports directory if it doesn't exist"""
@@ -28,18 +30,36 @@ def run_performance_tests():
     cmd = ["pytest", "test_performance.py", "-v"]
     return subprocess.run(cmd)
 
+def run_unit_tests():
+    """Run offline unit tests that need no API"""
+    print("🧩 Running Unit Tests...")
+    cmd = ["pytest", "test_offline.py", "-v"]
+    return subprocess.run(cmd)
+
 def run_all_tests():
     """Run all tests"""
     print("🚀 Running All Tests...")
     cmd = ["pytest", "-v"]
     return subprocess.run(cmd)
 
+def run_failed_tests():
+    """Rerun only the tests that failed last time"""
+    print("🔁 Rerunning Failed Tests...")
+    cmd = ["pytest", "--last-failed", "--last-failed-no-failures", "none", "-v"]
+    return subprocess.run(cmd)
+
 def main():
     parser = argparse.ArgumentParser(description="PokéAPI Test Runner")
-    parser.add_argument("--suite", choices=["smoke", "regression", "performance", "all"], 
+    parser.add_argument("--suite", choices=["smoke", "regression", "performance", "unit", "all"], 
                        default="all", help="Test suite to run")
     parser.add_argument("--install-deps", action="store_true", 
                        help="Install dependencies before running tests")
+    parser.add_argument("--rerun-failed", action="store_true",
+                       help="Only rerun the tests that failed last time")
+    parser.add_argument("--include-quarantined", action="store_true",
+                       help="Also run tests quarantined as flaky")
+    parser.add_argument("--profile", nargs="?", const="reports/profile",
+                       help="Profile each test (cProfile, stack sampling, tracemalloc) into this directory")
     
     args = parser.parse_args()
     
@@ -51,21 +71,36 @@ def main():
     # Create reports directory
     create_reports_dir()
     
+    # Test processes pick the profile directory up from the environment
+    if args.profile:
+        os.environ[PROFILE_DIR_ENV] = args.profile
+        print(f"⏱️ Profiling enabled, writing to {args.profile}")
+    
+    if args.include_quarantined:
+        os.environ[INCLUDE_QUARANTINED_ENV] = "1"
+    
     # Run selected test suite
     print(f"\n🎯 Starting test execution at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    if args.suite == "smoke":
+    if args.rerun_failed:
+        result = run_failed_tests()
+    elif args.suite == "smoke":
         result = run_smoke_tests()
     elif args.suite == "regression":
         result = run_regression_tests()
     elif args.suite == "performance":
         result = run_performance_tests()
+    elif args.suite == "unit":
+        result = run_unit_tests()
     else:
         result = run_all_tests()
     
     print(f"\n✅ Test execution completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"📊 Check reports/ directory for detailed results")
     
+    if args.profile:
+        print(f"⏱️ Flame graph stacks and hot-function tables saved to {args.profile}")
+    
     return result.returncode
 
 if __name__ == "__main__":
@@ -85,4 +85,11 @@ POKEMON_LIST_SCHEMA = {
             }
         }
     }
+}
+
+# Schemas by resource name, used by bulk validation of crawled payloads
+SCHEMAS = {
+    "pokemon": POKEMON_SCHEMA,
+    "ability": ABILITY_SCHEMA,
+    "pokemon_list": POKEMON_LIST_SCHEMA
 }
\ No newline at end of file
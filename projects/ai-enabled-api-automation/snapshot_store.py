@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import zlib
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class SnapshotStore:
+    """Compact local copy of API resources for offline runs.
+    
+    Bodies are kept zlib-compressed in SQLite, keyed by (resource, id) with a
+    unique (resource, name) index, and the database is memory-mapped so
+    lookups by ID or name are a single indexed read without network I/O.
+    """
+    
+    def __init__(self, path: str, mmap_size: int = 1 << 30):
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS resources (
+                resource TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                name TEXT,
+                body BLOB NOT NULL,
+                PRIMARY KEY (resource, id)
+            ) WITHOUT ROWID;
+            CREATE UNIQUE INDEX IF NOT EXISTS resources_by_name ON resources (resource, name);
+            CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT);
+        """)
+    
+    def put(self, resource: str, resource_id: int, name: Optional[str], body: bytes):
+        """Store the raw JSON body of one resource"""
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO resources (resource, id, name, body) VALUES (?, ?, ?, ?)",
+                (resource, resource_id, name, zlib.compress(body, 6))
+            )
+    
+    def commit(self):
+        with self._lock:
+            self.connection.commit()
+    
+    def get(self, resource: str, identifier: str) -> Optional[bytes]:
+        """Return the JSON body of a resource by ID or name, or None"""
+        if identifier.isdigit():
+            query = "SELECT body FROM resources WHERE resource = ? AND id = ?"
+            key: Any = int(identifier)
+        else:
+            query = "SELECT body FROM resources WHERE resource = ? AND name = ?"
+            key = identifier
+        with self._lock:
+            row = self.connection.execute(query, (resource, key)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+    
+    def page(self, resource: str, limit: int, offset: int) -> Tuple[int, List[Tuple[int, Optional[str]]]]:
+        """Return (total count, [(id, name), ...]) for a slice of a resource listing"""
+        with self._lock:
+            total = self.connection.execute(
+                "SELECT COUNT(*) FROM resources WHERE resource = ?", (resource,)
+            ).fetchone()[0]
+            rows = self.connection.execute(
+                "SELECT id, name FROM resources WHERE resource = ? ORDER BY id LIMIT ? OFFSET ?",
+                (resource, limit, offset)
+            ).fetchall()
+        return total, rows
+    
+    def iter_bodies(self, resource: Optional[str] = None,
+                    batch_size: int = 500) -> Iterator[Tuple[str, int, bytes]]:
+        """Yield (resource, id, JSON body) for every stored resource, in key order"""
+        query = "SELECT resource, id, body FROM resources WHERE (resource, id) > (?, ?)"
+        if resource:
+            query += " AND resource = ?"
+        query += " ORDER BY resource, id LIMIT ?"
+        last: Tuple[str, int] = ("", -1)
+        while True:
+            # Read in key-ordered batches so the lock is never held while the caller works on a row
+            params = last + ((resource,) if resource else ()) + (batch_size,)
+            with self._lock, closing(self.connection.execute(query, params)) as cursor:
+                rows = cursor.fetchall()
+            for resource_name, resource_id, body in rows:
+                yield resource_name, resource_id, zlib.decompress(body)
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][0], rows[-1][1]
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of stored resources per resource type"""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT resource, COUNT(*) FROM resources GROUP BY resource"
+            ).fetchall()
+        return dict(rows)
+    
+    def set_metadata(self, key: str, value: str):
+        with self._lock:
+            self.connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value))
+    
+    def get_metadata(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.connection.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def close(self):
+        with self._lock:
+            self.connection.close()
\ No newline at end of file
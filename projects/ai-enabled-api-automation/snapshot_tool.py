@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Snapshot Tool
+Crawls every endpoint in config.json into a local SnapshotStore for offline runs
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from api_client import APIClient
+from snapshot_store import SnapshotStore
+
+def iter_listing(client, endpoint, page_size):
+    """Yield every {name, url} entry of a paginated listing"""
+    response = client.get(endpoint, params={"limit": page_size, "offset": 0})
+    while True:
+        response.raise_for_status()
+        data = response.json()
+        yield from data["results"]
+        if not data.get("next"):
+            return
+        response = client.get_url(data["next"])
+
+def fetch_resource(client, url):
+    """GET one resource, returning (url, response)"""
+    return url, client.get_url(url)
+
+def crawl_endpoint(client, store, endpoint, page_size, workers, limit=None):
+    """Copy one endpoint's resources into the store, returning how many were saved"""
+    resource = endpoint.strip("/")
+    urls = []
+    for entry in iter_listing(client, endpoint, page_size):
+        urls.append(entry["url"])
+        if limit and len(urls) >= limit:
+            break
+    
+    saved = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, response in executor.map(lambda url: fetch_resource(client, url), urls):
+            if response.status_code != 200:
+                print(f"   ⚠️ {url} returned {response.status_code}, skipped")
+                continue
+            data = response.json()
+            store.put(resource, data["id"], data.get("name"), response.content)
+            saved += 1
+            if saved % 500 == 0:
+                store.commit()
+                print(f"   {resource}: {saved}/{len(urls)}")
+    store.commit()
+    return saved
+
+def crawl(args, config):
+    """Crawl the selected endpoints into the snapshot database"""
+    snapshot_config = config.get("snapshot", {})
+    options = APIClient.options_from_config(config)
+    options.update(transport="requests", transport_options=None)
+    client = APIClient(**options)
+    store = SnapshotStore(args.db)
+    
+    endpoints = args.endpoints or list(config["endpoints"])
+    page_size = args.page_size or snapshot_config.get("page_size", 500)
+    workers = args.workers or snapshot_config.get("workers", 8)
+    
+    start_time = time.time()
+    for name in endpoints:
+        print(f"📥 Crawling {name}...")
+        saved = crawl_endpoint(client, store, config["endpoints"][name], page_size, workers, args.limit)
+        print(f"✅ {name}: {saved} resources")
+    
+    store.set_metadata("base_url", config["base_url"])
+    store.set_metadata("created_at", datetime.now().isoformat())
+    store.commit()
+    store.close()
+    print(f"\n📁 Snapshot saved to {args.db} in {time.time() - start_time:.1f}s")
+    
+    counters = client.telemetry.snapshot()["counters"]
+    if counters.get("bytes.wire"):
+        print(f"📶 {counters['bytes.wire'] / 1e6:.1f} MB transferred for {counters['bytes.decoded'] / 1e6:.1f} MB "
+              f"of responses ({counters['bytes.decoded'] / counters['bytes.wire']:.1f}x)")
+
+def info(args):
+    """Print what a snapshot database contains"""
+    store = SnapshotStore(args.db)
+    print(f"📊 Snapshot {args.db}")
+    print(f"   Source: {store.get_metadata('base_url')}")
+    print(f"   Created: {store.get_metadata('created_at')}")
+    for resource, count in sorted(store.counts().items()):
+        print(f"   {resource:<20} {count:>8,}")
+    store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="PokéAPI offline snapshot tool")
+    parser.add_argument("command", choices=["crawl", "info"], help="Crawl the API or inspect a snapshot")
+    parser.add_argument("--config", default="config.json", help="Config file with base_url and endpoints")
+    parser.add_argument("--db", help="Snapshot database path (default: snapshot.path from config)")
+    parser.add_argument("--endpoints", nargs="+", help="Endpoint names from config.json to crawl (default: all)")
+    parser.add_argument("--page-size", type=int, help="Listing page size")
+    parser.add_argument("--workers", type=int, help="Parallel resource fetches")
+    parser.add_argument("--limit", type=int, help="Crawl at most this many resources per endpoint")
+    
+    args = parser.parse_args()
+    
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    args.db = args.db or config.get("snapshot", {}).get("path", "data/snapshot.sqlite")
+    
+    if args.command == "crawl":
+        crawl(args, config)
+    else:
+        info(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
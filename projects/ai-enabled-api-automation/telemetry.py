@@ -0,0 +1,51 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Any
+
+
+class Telemetry:
+    """Thread-safe counters and per-endpoint totals for API client traffic"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.endpoints = defaultdict(lambda: defaultdict(float))
+        self.paths = defaultdict(int)
+    
+    def increment(self, name: str, amount: int = 1):
+        """Increment a named counter"""
+        with self._lock:
+            self.counters[name] += amount
+    
+    def record(self, endpoint: str, **values: float):
+        """Add values to the running totals of an endpoint"""
+        with self._lock:
+            totals = self.endpoints[endpoint]
+            totals["calls"] += 1
+            for name, value in values.items():
+                totals[name] += value
+    
+    def record_path(self, path: str):
+        """Count a GET by its path and query relative to the base URL, so a run can be replayed"""
+        with self._lock:
+            self.paths[path] += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a plain copy of all counters and endpoint totals"""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "endpoints": {endpoint: dict(totals) for endpoint, totals in self.endpoints.items()},
+                "paths": dict(self.paths)
+            }
+    
+    def reset(self):
+        """Clear all counters and endpoint totals"""
+        with self._lock:
+            self.counters.clear()
+            self.endpoints.clear()
+            self.paths.clear()
+
+
+# Shared by every client in the process so a run can be reported as a whole
+default_telemetry = Telemetry()
\ No newline at end of file
@@ -0,0 +1,550 @@
+import gzip
+import json
+import math
+import os
+import pytest
+import threading
+import time
+import zlib
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib3.util.retry import Retry
+from api_client import APIClient
+from api_collections.pokemon_api import PokemonAPICollection
+from bulk_validation import BulkValidationReport, payloads_from_client, validate_payloads
+from catalog import CatalogEntry
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from compression import DecodedSizeExceeded, StreamingDecoder
+from deadline import DeadlineExceeded, deadline_scope
+from fault_proxy import FaultProxy
+from json_stream import JSONListParser, ListStream
+from load_cluster import Coordinator
+from load_engine import LatencyHistogram
+from native_report import ReportData, update_report
+from pages.pokemon_page import PokemonPage
+from run_history import HistoryScheduler, RunHistory, is_latency_test
+from results_archive import ArchivedRun, query, write_rcol
+from snapshot_store import SnapshotStore
+from telemetry import Telemetry
+from transports import HTTP2Transport, SnapshotTransport
+from test_utils import StubResponse, StubTransport
+
+def write_allure_result(directory, uuid, feature, name, status, start=1000):
+    """Write one minimal Allure *-result.json file"""
+    path = os.path.join(str(directory), f"{uuid}-result.json")
+    with open(path, 'w') as f:
+        json.dump({"historyId": uuid, "name": name, "status": status, "start": start * 1000, "stop": start * 1000 + 250,
+                   "labels": [{"name": "feature", "value": feature}]}, f)
+    return path
+
+
+def write_junit(path, feature, names):
+    """Write one JUnit file with a passed testcase per name"""
+    cases = "".join(f'<testcase classname="features.{feature}" name="{name}" time="0.5"/>' for name in names)
+    with open(str(path), 'w') as f:
+        f.write(f'<testsuite name="{feature}">{cases}</testsuite>')
+    return str(path)
+
+
+class TestOffline:
+    """Unit tests against stubs, fake clocks and local files; none of them reach the API"""
+    
+    def test_streamed_items_split_across_chunks(self):
+        """Test list items split across arbitrary chunk boundaries parse the same"""
+        body = '{"count": 2, "next": null, "results": [{"name": "a", "n": 10}, {"name": "b", "n": 2.5}]}'
+        parser = JSONListParser()
+        items = []
+        for i in range(0, len(body), 3):
+            items.extend(parser.feed(body[i:i + 3]))
+        items.extend(parser.feed("", final=True))
+        assert items == [{"name": "a", "n": 10}, {"name": "b", "n": 2.5}]
+        assert parser.fields == {"count": 2, "next": None}
+    
+    def test_deadline_caps_retries(self):
+        """Test a time budget shrinks timeouts, suppresses retries and refuses calls once spent"""
+        client = APIClient("http://127.0.0.1:9", timeout=30, retry_count=3, telemetry=Telemetry())
+        
+        with deadline_scope(1.0, "unreachable host") as deadline:
+            start_time = time.time()
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.get("/pokemon/1")
+            assert time.time() - start_time < 1.5, "Retries should stop when the budget cannot cover the backoff"
+            
+            time.sleep(max(deadline.remaining(), 0) + 0.01)
+            with pytest.raises(DeadlineExceeded):
+                client.map(lambda pokemon_id: client.get(f"/pokemon/{pokemon_id}"), [1, 2])
+        
+        assert client.telemetry.snapshot()["counters"]["deadline.exceeded"] >= 1
+        assert deadline.usage()["exceeded"]
+    
+    def test_streamed_numbers_split_one_byte_at_a_time(self):
+        """Test ints, floats and literals split at every byte are not accepted before they end"""
+        body = ('{"count": 12, "ratio": -0.5e-3, "results": [1, 23, -4.5, 6e2, 0.125, 7E+1, -0, 89.0e-1, '
+                'true, null, {"n": 10.75}, [1.5, 2]], "next": null}')
+        parser = JSONListParser()
+        items = []
+        for char in body:
+            items.extend(parser.feed(char))
+        items.extend(parser.feed("", final=True))
+        expected = json.loads(body)
+        assert items == expected["results"]
+        assert parser.fields == {"count": 12, "ratio": -0.5e-3, "next": None}
+    
+    def test_hedge_fires_and_wins_offline(self):
+        """Test a primary slower than the hedge delay fires a hedge that wins and closes the loser"""
+        transport = StubTransport(body={"name": "pikachu"}, delays=[0.5])
+        client = APIClient("http://hedge-stub.test/api/v2", transport=transport, telemetry=Telemetry(),
+                           hedging={"enabled": True, "percentile": 50, "min_samples": 3})
+        policy = client.hedging_policy("http://hedge-stub.test/api/v2/pokemon/pikachu")
+        for _ in range(3):
+            policy.observe(0.01)
+        
+        response = client.get("/pokemon/pikachu")
+        assert response.json()["name"] == "pikachu"
+        
+        counters = client.telemetry.snapshot()["counters"]
+        assert counters["hedge.fired"] == 1
+        assert counters["hedge.won"] == 1
+        assert transport.calls == 2
+        deadline = time.time() + 2
+        while not any(candidate.closed for candidate in transport.responses) and time.time() < deadline:
+            time.sleep(0.05)
+        loser = next(candidate for candidate in transport.responses if candidate is not response)
+        assert loser.closed and not response.closed
+    
+    def test_hedging_policy_per_endpoint(self):
+        """Test each endpoint keeps its own hedging window and conflicting options are rejected"""
+        client = APIClient("http://hedge-keys.test/api/v2", transport=StubTransport(body={}), telemetry=Telemetry(),
+                           hedging={"enabled": True, "percentile": 50, "min_samples": 3})
+        detail = client.hedging_policy("http://hedge-keys.test/api/v2/pokemon/1")
+        assert client.hedging_policy("http://hedge-keys.test/api/v2/pokemon/pikachu") is detail
+        assert client.hedging_policy("http://hedge-keys.test/api/v2/pokemon/") is not detail
+        
+        other = APIClient("http://hedge-keys.test/api/v2", transport=StubTransport(body={}), telemetry=Telemetry(),
+                          hedging={"enabled": True, "percentile": 90, "min_samples": 3})
+        with pytest.raises(ValueError):
+            other.hedging_policy("http://hedge-keys.test/api/v2/pokemon/1")
+    
+    def test_circuit_breaker_state_machine(self):
+        """Test closed -> open -> half-open -> closed (and back to open on a failed probe) with a fake clock"""
+        now = [0.0]
+        breaker = CircuitBreaker("breaker.test", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        
+        assert breaker.before_request() is False
+        breaker.record_failure("HTTP 503")
+        assert breaker.state == CLOSED
+        breaker.record_failure("HTTP 503")
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        
+        now[0] = 10
+        assert breaker.state == HALF_OPEN
+        assert breaker.before_request() is True
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        breaker.record_failure("HTTP 503")
+        assert breaker.state == OPEN
+        
+        now[0] = 20
+        assert breaker.before_request() is True
+        breaker.record_success()
+        assert breaker.state == CLOSED and breaker.failures == 0
+        
+        # A probe handed back without an outcome lets the next request probe
+        breaker.record_failure("HTTP 503")
+        breaker.record_failure("HTTP 503")
+        now[0] = 30
+        assert breaker.before_request() is True
+        breaker.release_probe()
+        assert breaker.state == HALF_OPEN
+        assert breaker.before_request() is True
+    
+    def test_circuit_probe_released_on_unexpected_error(self):
+        """Test a half-open probe that raises a non-HTTP error does not wedge the host"""
+        transport = StubTransport(body={"name": "pikachu"}, failures=[ValueError("decode failed")])
+        client = APIClient("http://probe-stub.test/api/v2", transport=transport, telemetry=Telemetry(),
+                           circuit_breaker={"enabled": True, "failure_threshold": 1, "reset_timeout": 0})
+        client.circuit_breaker.record_failure("HTTP 503")
+        
+        with pytest.raises(ValueError):
+            client.get("/pokemon/pikachu")
+        assert client.get("/pokemon/pikachu").status_code == 200
+        assert client.circuit_breaker.state == CLOSED
+    
+    def test_spent_deadline_leaves_half_open_probe(self, monkeypatch):
+        """Test a call refused by a spent deadline never takes the half-open probe"""
+        transport = StubTransport(body={"name": "pikachu"})
+        client = APIClient("http://deadline-probe-stub.test/api/v2", transport=transport, telemetry=Telemetry(),
+                           circuit_breaker={"enabled": True, "failure_threshold": 1, "reset_timeout": 0})
+        breaker = client.circuit_breaker
+        breaker.record_failure("HTTP 503")
+        assert breaker.state == HALF_OPEN
+        probes = []
+        before_request = breaker.before_request
+        monkeypatch.setattr(breaker, "before_request", lambda: probes.append(before_request()) or probes[-1])
+        
+        with deadline_scope(0.01, "spent"):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                client.get("/pokemon/pikachu")
+        assert probes == [] and transport.calls == 0
+        assert breaker.state == HALF_OPEN
+        
+        assert client.get("/pokemon/pikachu").status_code == 200
+        assert probes == [True] and breaker.state == CLOSED
+    
+    def test_http2_transport_headers_and_status_retries(self):
+        """Test the HTTP/2 transport forwards headers and retries 5xx statuses and resets like the requests transport"""
+        httpx = pytest.importorskip("httpx")
+        seen = []
+        
+        def handler(request):
+            seen.append(request.headers.get("X-Trace"))
+            return httpx.Response(503 if len(seen) == 1 else 200, json={"name": "pikachu"})
+        
+        retry = Retry(total=2, backoff_factor=0, status_forcelist=[503])
+        transport = HTTP2Transport(retry=retry, httpx_transport=httpx.MockTransport(handler))
+        response = transport.request("GET", "http://h2-stub.test/pokemon/pikachu", timeout=5, headers={"X-Trace": "abc"})
+        assert response.status_code == 200 and response.json()["name"] == "pikachu"
+        assert seen == ["abc", "abc"]
+        
+        always_down = HTTP2Transport(retry=retry, httpx_transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        with pytest.raises(requests.exceptions.RetryError):
+            always_down.request("GET", "http://h2-stub.test/pokemon/pikachu", timeout=5)
+        
+        resets = []
+        
+        def reset_once(request):
+            resets.append(request)
+            if len(resets) == 1:
+                raise httpx.ReadError("Connection reset by peer", request=request)
+            return httpx.Response(200, json={"name": "pikachu"})
+        
+        flaky = HTTP2Transport(retry=retry, httpx_transport=httpx.MockTransport(reset_once))
+        assert flaky.request("GET", "http://h2-stub.test/pokemon/pikachu", timeout=5).status_code == 200
+        assert len(resets) == 2
+        
+        # Streamed lists are parsed from the body as it arrives
+        listing = httpx.ByteStream(b'{"count": 2, "results": [{"name": "bulbasaur"}, {"name": "ivysaur"}]}')
+        lister = HTTP2Transport(retry=retry, httpx_transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, headers={"Content-Type": "application/json"}, stream=listing)))
+        stream = ListStream(*lister.stream("GET", "http://h2-stub.test/pokemon/", timeout=5))
+        assert [entry["name"] for entry in stream] == ["bulbasaur", "ivysaur"] and stream.count == 2
+        lister.close()
+        transport.close()
+        always_down.close()
+        flaky.close()
+    
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate", "br", "zstd"])
+    def test_decompression_bomb_refused(self, encoding):
+        """Test every codec stops decoding a highly compressed body just past the decoded limit"""
+        body = b"\0" * (64 * 1024 * 1024)
+        if encoding == "br":
+            bomb = pytest.importorskip("brotli").compress(body)
+        elif encoding == "zstd":
+            bomb = pytest.importorskip("zstandard").ZstdCompressor().compress(body)
+        else:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS)
+            bomb = compressor.compress(body) + compressor.flush()
+        del body
+        
+        decoder = StreamingDecoder(encoding, max_bytes=1024 * 1024)
+        with pytest.raises(DecodedSizeExceeded):
+            for start in range(0, len(bomb), 4096):
+                decoder.feed(bomb[start:start + 4096])
+            decoder.finish()
+        assert decoder.decoded_bytes <= 1024 * 1024 + 128 * 1024
+    
+    def test_snapshot_iter_bodies_batches(self, tmp_path):
+        """Test snapshot bodies are read in key order across batches while writes continue"""
+        store = SnapshotStore(str(tmp_path / "snapshot.sqlite"))
+        for resource_id in range(1, 8):
+            store.put("pokemon", resource_id, f"pokemon-{resource_id}", f'{{"id": {resource_id}}}'.encode())
+        store.put("ability", 1, "stench", b'{"id": 1}')
+        store.commit()
+        
+        seen = []
+        for resource, resource_id, body in store.iter_bodies("pokemon", batch_size=3):
+            seen.append(resource_id)
+            store.put("ability", resource_id + 1, None, body)
+            store.commit()
+        assert seen == list(range(1, 8))
+        assert [key[:2] for key in store.iter_bodies(batch_size=2)][:2] == [("ability", 1), ("ability", 2)]
+        assert store.counts() == {"ability": 8, "pokemon": 7}
+        store.close()
+    
+    def test_snapshot_transport_path(self, tmp_path):
+        """Test the snapshot transport refuses a missing store and defaults to the configured snapshot path"""
+        path = str(tmp_path / "snapshot.sqlite")
+        with pytest.raises(FileNotFoundError):
+            SnapshotTransport(path)
+        assert not (tmp_path / "snapshot.sqlite").exists()
+        
+        store = SnapshotStore(path)
+        store.put("pokemon", 25, "pikachu", b'{"id": 25, "name": "pikachu"}')
+        store.commit()
+        store.close()
+        config = {"base_url": "http://snapshot.test/api/v2", "timeout": 5, "retry_count": 0,
+                  "transport": "snapshot", "snapshot": {"path": path}}
+        client = APIClient(**APIClient.options_from_config(config), telemetry=Telemetry())
+        assert client.get("/pokemon/pikachu").json()["id"] == 25
+    
+    def test_bulk_validation_groups_errors_by_schema_path(self):
+        """Test known-bad payloads validated across worker processes are grouped by schema path"""
+        good = json.dumps({"id": 1, "name": "stench", "is_main_series": True}).encode()
+        payloads = [("ability", f"good-{index}", good) for index in range(25)]
+        payloads += [("ability", f"no-name-{index}", b'{"id": 2, "is_main_series": true}') for index in range(4)]
+        payloads += [("ability", "string-id", b'{"id": "3", "name": "drizzle", "is_main_series": false}'),
+                     ("ability", "truncated", b'{"id": 4, "name"')]
+        report = validate_payloads(iter(payloads), workers=2, chunk_size=5)
+        
+        result = report.to_dict()
+        assert result["validated"] == 31
+        assert result["invalid_payloads"] == 6
+        groups = {(group["schema"], group["schema_path"]): group for group in result["errors"]}
+        assert groups[("ability", "required")]["count"] == 4
+        assert len(groups[("ability", "required")]["examples"]) == 3
+        assert groups[("ability", "properties/id/type")]["examples"] == [
+            {"payload": "string-id", "message": "'3' is not of type 'integer'"}]
+        assert groups[("ability", "<json>")]["examples"][0]["payload"] == "truncated"
+        assert not report.passed
+    
+    def test_bulk_validation_reports_fetch_errors_apart(self):
+        """Test non-200 API responses are counted by status and never schema-validated"""
+        class Client:
+            def get_url(self, url):
+                if url.endswith("/404/"):
+                    return StubResponse(404, {"detail": "Not found"}, url)
+                return StubResponse(200, {"id": 1, "name": "stench", "is_main_series": True}, url)
+        
+        entries = [CatalogEntry(index, f"ability-{index}", f"http://bulk.test/ability/{index}/") for index in (1, 404, 2)]
+        report = BulkValidationReport()
+        payloads = list(payloads_from_client(Client(), entries, "ability", report))
+        
+        assert [key for _, key, _ in payloads] == ["http://bulk.test/ability/1/", "http://bulk.test/ability/2/"]
+        validate_payloads(payloads, workers=1, report=report)
+        assert report.to_dict()["fetch_errors"] == [{"status": 404, "count": 1, "examples": ["http://bulk.test/ability/404/"]}]
+        assert report.validated == 2 and not report.counts and not report.passed
+    
+    def test_load_cluster_timeline_buckets(self):
+        """Test worker intervals land in the timeline second they started in"""
+        coordinator = Coordinator({"duration": 3}, workers=1, listen=("127.0.0.1", 0), report_interval=1.0)
+        coordinator.start_at = 1000.0
+        histogram = LatencyHistogram().to_dict()
+        messages = [{"type": "interval", "time": 1000.0 + end, "requests": requests, "errors": {}, "histogram": histogram}
+                    for end, requests in ((1.0, 5), (2.003, 7), (3.0, 11))]
+        coordinator._collect("worker", [json.dumps(message) for message in messages + [{"type": "done"}]])
+        coordinator.server.close()
+        assert coordinator.report()["timeline"] == [5, 7, 11]
+    
+    def test_load_cluster_accept_timeout_stops_local_workers(self):
+        """Test a coordinator whose workers never all connect raises and terminates the ones it spawned"""
+        coordinator = Coordinator({"duration": 1}, workers=2, listen=("127.0.0.1", 0))
+        processes = coordinator.spawn_local_workers(1)
+        with pytest.raises(TimeoutError):
+            coordinator.run(accept_timeout=3)
+        assert processes[0].wait(timeout=10) != 0
+    
+    def test_fault_proxy_forwards_headers_and_keeps_encoding(self):
+        """Test the fault proxy forwards end-to-end headers and re-encodes rewritten bodies as the target sent them"""
+        seen = []
+        
+        class Upstream(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                seen.append(dict(self.headers))
+                origin = f"http://127.0.0.1:{self.server.server_address[1]}"
+                body = json.dumps({"url": f"{origin}/api/v2/pokemon/1/"}).encode()
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_response(200)
+                    self.send_header("Content-Encoding", "gzip")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        proxy = FaultProxy(f"http://127.0.0.1:{server.server_address[1]}/api/v2")
+        try:
+            response = requests.get(f"{proxy.base_url}/pokemon/1/", headers={"Accept-Encoding": "gzip", "X-Trace": "t1"})
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert response.json()["url"] == f"{proxy.origin}/api/v2/pokemon/1/"
+            assert seen[0]["Accept-Encoding"] == "gzip" and seen[0]["X-Trace"] == "t1"
+            
+            identity = requests.get(f"{proxy.base_url}/pokemon/1/", headers={"Accept-Encoding": "identity"})
+            assert "Content-Encoding" not in identity.headers
+            assert identity.json()["url"].startswith(proxy.origin)
+        finally:
+            proxy.stop()
+            server.shutdown()
+            server.server_close()
+    
+    def test_fault_profile_uses_separate_client(self):
+        """Test a fault profile routes the page through its own client and leaves the shared one on the target"""
+        page = PokemonPage()
+        shared = PokemonAPICollection.shared()
+        proxy = page.use_fault_profile({"latency_ms": 1})
+        try:
+            assert page.api is not shared and page.fault_proxy is proxy
+            assert page.api.client.base_url == proxy.base_url
+            assert page.api.client.host != shared.client.host
+            assert shared.client.base_url == shared.config["base_url"].rstrip('/')
+            assert page.resolver.client is page.api.client
+        finally:
+            page.clear_fault_profile()
+        assert page.api is shared and page.resolver.client is shared.client and page.fault_proxy is None
+    
+    def test_native_report_rebuilds_only_changed_features(self, tmp_path):
+        """Test a rebuild reads only changed or removed result files and rewrites only their feature pages"""
+        results, output = tmp_path / "allure-results", tmp_path / "native-report"
+        results.mkdir()
+        write_allure_result(results, "a1", "Feature A", "first", "passed")
+        write_allure_result(results, "b1", "Feature B", "second", "passed")
+        metrics = str(tmp_path / "missing_metrics.json")
+        pages = output / "features"
+        
+        _, data = update_report(str(results), [], metrics, str(output))
+        assert data.changes["new"] == 2 and data.changes["pages"] == 2
+        assert sorted(path.name for path in pages.iterdir()) == ["feature-a.html", "feature-b.html"]
+        
+        # Unchanged inputs: nothing is re-read and no page is rewritten
+        os.utime(pages / "feature-a.html", (1, 1))
+        os.utime(pages / "feature-b.html", (1, 1))
+        _, data = update_report(str(results), [], metrics, str(output))
+        assert not data.changes["new"] and not data.changes["changed"] and data.changes["pages"] == 0
+        assert os.stat(pages / "feature-a.html").st_mtime == 1
+        
+        # One changed file: only its row and its feature's page change
+        before = ReportData.load(str(output)).results
+        write_allure_result(results, "a1", "Feature A", "first", "failed", start=2000)
+        _, data = update_report(str(results), [], metrics, str(output))
+        assert data.changes["changed"] == 1 and data.changes["pages"] == 1
+        assert data.results["a1"]["status"] == "failed" and data.results["b1"] == before["b1"]
+        assert "failed" in (pages / "feature-a.html").read_text()
+        assert os.stat(pages / "feature-b.html").st_mtime == 1
+        
+        # A removed file drops its rows and its feature's page
+        os.remove(results / "b1-result.json")
+        _, data = update_report(str(results), [], metrics, str(output))
+        assert data.changes["removed"] == 1 and set(data.results) == {"a1"}
+        assert not (pages / "feature-b.html").exists()
+        assert ReportData.load(str(output)).summaries.keys() == {"Feature A"}
+    
+    def test_native_report_junit_fills_gaps_left_by_allure(self, tmp_path):
+        """Test JUnit testcases already covered by an Allure result are not counted twice"""
+        results, output = tmp_path / "allure-results", tmp_path / "native-report"
+        results.mkdir()
+        write_allure_result(results, "a1", "Feature A", "first", "failed")
+        junit = write_junit(tmp_path / "TESTS-a.xml", "Feature A", ["first", "second"])
+        metrics = str(tmp_path / "missing_metrics.json")
+        
+        _, data = update_report(str(results), [junit], metrics, str(output))
+        assert set(data.results) == {"a1", "Feature A::second"}
+        assert data.summaries["Feature A"].counts == {"failed": 1, "passed": 1}
+        
+        write_junit(tmp_path / "TESTS-a.xml", "Feature A", ["first", "second", "third"])
+        _, data = update_report(str(results), [junit], metrics, str(output))
+        assert data.changes["changed"] == 1
+        assert set(data.results) == {"a1", "Feature A::second", "Feature A::third"}
+        assert data.results["a1"]["status"] == "failed"
+    
+    def test_results_archive_query_filters_and_aggregates(self, tmp_path):
+        """Test archived runs are filtered by string, number and run and aggregated per group"""
+        paths = []
+        for run, durations in (("run-1", [1.0, 2.0, 4.0]), ("run-2", [3.0, 5.0, 6.0])):
+            columns = {"scenario": ["s1", "s2", "s3"], "feature": ["Pokemon", "Pokemon", "Ability"],
+                       "status": ["passed", "failed", "passed"], "duration": durations,
+                       "latency": [0.1, math.nan, 0.3], "status_code": [200, -1, 200]}
+            paths.append(str(tmp_path / f"{run}.rcol"))
+            write_rcol(paths[-1], columns, run)
+        assert ArchivedRun(paths[0]).rows == 3
+        
+        assert query(paths) == [{"count": 6}]
+        assert query(paths, where=["status=failed"], aggregates=["count", "sum:duration"]) == [
+            {"count": 2, "sum:duration": 7.0}]
+        assert query(paths, where=["run=run-2", "duration>=5"]) == [{"count": 2}]
+        assert query(paths, where=["feature~Poke", "status!=failed"]) == [{"count": 2}]
+        
+        by_feature = {row["feature"]: row for row in query(paths, group_by=["feature"],
+                                                              aggregates=["count", "mean:duration", "max:latency"])}
+        assert by_feature["Pokemon"] == {"feature": "Pokemon", "count": 4, "mean:duration": 2.75, "max:latency": 0.1}
+        assert by_feature["Ability"]["max:latency"] == 0.3
+        
+        # Missing latencies are skipped by aggregates and filters alike
+        assert query(paths, where=["latency<1"], group_by=["run"], aggregates=["count", "p50:latency"])[0]["count"] == 2
+        assert abs(query(paths, aggregates=["p50:latency"])[0]["p50:latency"] - 0.1) < 0.01
+    
+    def test_run_history_classifies_and_orders_tests(self, tmp_path):
+        """Test new, passing, failing and flaky classification and the failed-first ordering key"""
+        scheduler = HistoryScheduler(RunHistory(str(tmp_path / "history.json")), str(tmp_path / "quarantine.json"))
+        for status, duration in (("passed", 1.0), ("passed", 1.0)):
+            scheduler.record("steady", status, duration)
+        for status, duration in (("passed", 1.0), ("failed", 4.0)):
+            scheduler.record("broke", status, duration)
+        for status, duration in (("failed", 2.0), ("passed", 1.0), ("failed", 2.0), ("passed", 1.0)):
+            scheduler.record("flaky", status, duration)
+        scheduler.record("slow_fail", "failed", 9.0)
+        scheduler.record("ignored", "skipped", 0.0)
+        
+        assert [scheduler.classify(test_id) for test_id in ("steady", "broke", "flaky", "unseen", "ignored")] == [
+            "passing", "failing", "flaky", "new", "new"]
+        assert scheduler.history.flips("flaky") == 3 and scheduler.history.passed_streak("flaky") == 1
+        # Last run failed first, then by failure rate, then by how long failing takes
+        items = ["steady", "flaky", "broke", "slow_fail", "unseen"]
+        assert scheduler.order(items, lambda item: [item]) == ["slow_fail", "broke", "flaky", "steady", "unseen"]
+        assert scheduler.priority(["steady", "broke"]) == scheduler.priority(["broke"])
+        assert is_latency_test("test_performance.py::TestPerformance::test_response_time_single_pokemon")
+        assert not is_latency_test("test_performance.py::TestPerformance::test_hedged_requests")
+        assert is_latency_test("test_performance.py::TestPerformance::test_large_response_performance", {"latency"})
+    
+    def test_run_history_quarantines_and_releases(self, tmp_path):
+        """Test a flaky latency failure is quarantined, skipped, retried and released after enough passes"""
+        history_file, quarantine_file = str(tmp_path / "history.json"), str(tmp_path / "quarantine.json")
+        scheduler = HistoryScheduler(RunHistory(history_file), quarantine_file, release_after=2)
+        for status in ("passed", "failed", "passed"):
+            scheduler.record("latency", status, 1.0, latency_check=True)
+            scheduler.record("functional", status, 1.0)
+        assert scheduler.attempts_for("latency", latency_check=True) == 3
+        assert scheduler.attempts_for("functional", latency_check=False) == 1
+        scheduler.record("latency", "failed", 1.0, latency_check=True)
+        scheduler.record("functional", "failed", 1.0)
+        scheduler.save()
+        
+        scheduler = HistoryScheduler(RunHistory(history_file), quarantine_file, release_after=2)
+        assert scheduler.classify("latency") == "quarantined" and scheduler.classify("functional") == "flaky"
+        assert scheduler.skip_reason("latency").startswith("Quarantined: flaky latency check")
+        assert scheduler.skip_reason("functional") is None
+        
+        included = HistoryScheduler(RunHistory(history_file), quarantine_file, release_after=2, include_quarantined=True)
+        assert included.skip_reason("latency") is None
+        included.record("latency", "passed", 1.0, latency_check=True)
+        assert included.released == []
+        included.record("latency", "passed", 1.0, latency_check=True)
+        assert included.released == ["latency"]
+        included.save()
+        with open(quarantine_file) as f:
+            assert json.load(f) == {}
+    
+    def test_run_history_save_merges_concurrent_runs(self, tmp_path):
+        """Test saving keeps tests another run wrote to the shared history file since this one loaded it"""
+        path = str(tmp_path / "reports" / "history.json")
+        behave_run, pytest_run = RunHistory(path, window=3), RunHistory(path, window=3)
+        for _ in range(5):
+            behave_run.record("Feature: Scenario", "passed", 0.5)
+        pytest_run.record("test_api.py::test_one", "failed", 0.25, location="test_api.py::test_one")
+        behave_run.save()
+        pytest_run.save()
+        
+        merged = RunHistory(path)
+        assert set(merged.tests) == {"Feature: Scenario", "test_api.py::test_one"}
+        assert len(merged.statuses("Feature: Scenario")) == 3
+        assert merged.failed_locations() == ["test_api.py::test_one"]
\ No newline at end of file
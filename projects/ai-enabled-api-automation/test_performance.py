@@ -1,7 +1,12 @@
 import pytest
 import time
-import concurrent.futures
+from urllib3.exceptions import EmptyPoolError
+from api_client import APIClient
+from compression import DecodedSizeExceeded
+from load_engine import LatencyHistogram, LoadGenerator
+from multi_target import MultiTargetRun
 from pokeapi_client import PokeAPIClient
+from telemetry import Telemetry
 from test_utils import TestUtils
 
 class TestPerformance:
@@ -38,6 +43,7 @@ class TestPerformance:
         avg_time = total_time / len(pokemon_list)
         assert avg_time < 2.0, f"Average response time {avg_time}s exceeds 2s limit"
     
+    @pytest.mark.latency
     def test_concurrent_requests(self):
         """Test concurrent API requests"""
         pokemon_list = ["pikachu", "charizard", "blastoise", "venusaur", "mewtwo"]
@@ -49,24 +55,70 @@ class TestPerformance:
             return {
                 "name": name,
                 "status_code": response.status_code,
+                "body_name": response.json()["name"],
                 "response_time": end_time - start_time
             }
         
         start_time = time.time()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(fetch_pokemon, name) for name in pokemon_list]
-            results = [future.result() for future in concurrent.futures.as_completed(futures)]
+        results = self.client.map(fetch_pokemon, pokemon_list, workers=5)
         
         total_time = time.time() - start_time
         
-        # Validate all requests succeeded
+        # Validate all requests succeeded and each answer belongs to its request
+        assert [result["name"] for result in results] == pokemon_list
         for result in results:
             assert result["status_code"] == 200
+            assert result["body_name"] == result["name"]
             assert result["response_time"] < 5.0
         
         # Concurrent requests should be faster than sequential
         assert total_time < 10.0, f"Concurrent requests took {total_time}s, too slow"
     
+    def test_thread_local_sessions(self):
+        """Test concurrent mode gives each thread its own session over one shared pool"""
+        options = APIClient.options_from_config(self.client.config)
+        options["concurrency"] = {"enabled": True, "workers": 16}
+        options["transport"] = "requests"
+        options["transport_options"] = {"pool_size": 4}
+        options["telemetry"] = Telemetry()
+        client = APIClient(**options)
+        ids = list(range(1, 33))
+        
+        def fetch(pokemon_id):
+            response = client.get(f"{self.client.endpoints['pokemon']}{pokemon_id}")
+            return id(client.session), response.status_code, response.json()["id"]
+        
+        results = client.map(fetch, ids)
+        client.close()
+        
+        assert [result[2] for result in results] == ids
+        assert all(result[1] == 200 for result in results)
+        assert len({result[0] for result in results}) == client.transport.sessions_created > 1
+        assert client.telemetry.snapshot()["counters"]["requests"] == len(ids)
+    
+    def test_pool_wait_bounded_by_timeout(self):
+        """Test workers beyond pool_size give up after the timeout when no pooled connection frees up"""
+        options = APIClient.options_from_config(self.client.config)
+        options["concurrency"] = {"enabled": True, "workers": 4}
+        options["transport"] = "requests"
+        options["transport_options"] = {"pool_size": 1}
+        options["timeout"] = 1
+        options["retry_count"] = 0
+        options["telemetry"] = Telemetry()
+        client = APIClient(**options)
+        
+        # An unread streamed response holds the only pooled connection
+        held = client.get_stream(self.client.endpoints['pokemon'], params={"limit": 1})
+        start_time = time.time()
+        with pytest.raises(EmptyPoolError):
+            client.map(lambda pokemon_id: client.get(f"{self.client.endpoints['pokemon']}{pokemon_id}"), [1, 2, 3, 4])
+        assert time.time() - start_time < 5
+        
+        assert len(list(held)) == 1
+        assert client.get(f"{self.client.endpoints['pokemon']}1").status_code == 200
+        client.close()
+    
+    @pytest.mark.latency
     @pytest.mark.parametrize("endpoint_method,identifier", [
         ("get_pokemon", "1"),
         ("get_ability", "1"),
@@ -86,6 +138,7 @@ class TestPerformance:
         response_time = end_time - start_time
         assert response_time < 3.0, f"{endpoint_method} response time {response_time}s exceeds 3s limit"
     
+    @pytest.mark.latency
     def test_large_response_performance(self):
         """Test performance with larger response payloads"""
         # Get Pokemon list with larger limit
@@ -98,4 +151,117 @@ class TestPerformance:
         
         response_time = end_time - start_time
         assert response_time < 5.0, f"Large response time {response_time}s exceeds 5s limit"
-        assert len(data["results"]) == 100
\ No newline at end of file
+        assert len(data["results"]) == 100
+    
+    def test_streamed_pokemon_list(self):
+        """Test a streamed list yields every entry without buffering the body"""
+        options = APIClient.options_from_config(self.client.config)
+        options["telemetry"] = Telemetry()
+        client = APIClient(**options)
+        
+        stream = client.get_stream(self.client.endpoints['pokemon'], params={"limit": 100000, "offset": 0})
+        self.utils.validate_response_status(stream, 200)
+        total = stream.count
+        entries = [entry for entry in stream if entry["name"] and entry["url"]]
+        
+        assert len(entries) == total
+        assert stream.next is None
+        assert not getattr(stream.response, "_content", None)
+        totals = client.telemetry.snapshot()["endpoints"]["/pokemon"]
+        assert totals["decoded_bytes"] == stream.decoded_bytes > 0
+    
+    
+    def test_unread_stream_close_drops_connection(self):
+        """Test closing a stream before its end never pools the connection with unread body on it"""
+        options = APIClient.options_from_config(self.client.config)
+        options["telemetry"] = Telemetry()
+        options["transport"] = "requests"
+        options["transport_options"] = {"pool_size": 1}
+        # A retry would quietly replace a broken connection
+        options["retry_count"] = 0
+        client = APIClient(**options)
+        
+        for _ in range(10):
+            client.get_stream(self.client.endpoints['pokemon'], params={"limit": 1}).close()
+            response = client.get(f"{self.client.endpoints['pokemon']}1")
+            assert response.status_code == 200 and response.json()["id"] == 1
+        client.close()
+    
+    def test_hedged_requests(self):
+        """Test hedged GETs still return correct data and record hedge telemetry"""
+        options = APIClient.options_from_config(self.client.config)
+        options["hedging"] = {"enabled": True, "percentile": 50, "min_samples": 3}
+        options["telemetry"] = Telemetry()
+        client = APIClient(**options)
+        
+        for _ in range(10):
+            response = client.get(f"{self.client.endpoints['pokemon']}pikachu")
+            self.utils.validate_response_status(response, 200)
+            assert response.json()["name"] == "pikachu"
+        
+        counters = client.telemetry.snapshot()["counters"]
+        assert counters["requests"] == 10
+        assert counters.get("hedge.won", 0) <= counters.get("hedge.fired", 0)
+    
+    def test_compression_byte_accounting(self):
+        """Test negotiated compression records wire and decoded bytes and enforces the decoded limit"""
+        options = APIClient.options_from_config(self.client.config)
+        options["compression"] = {"enabled": True}
+        options["telemetry"] = Telemetry()
+        client = APIClient(**options)
+        
+        response = client.get(f"{self.client.endpoints['pokemon']}pikachu")
+        self.utils.validate_response_status(response, 200)
+        assert response.json()["name"] == "pikachu"
+        if response.headers.get("Content-Encoding"):
+            assert response.wire_bytes < len(response.content)
+        
+        totals = client.telemetry.snapshot()["endpoints"]["/pokemon/{id}"]
+        assert totals["wire_bytes"] == response.wire_bytes
+        assert totals["decoded_bytes"] == len(response.content)
+        
+        options["compression"] = {"enabled": True, "max_decoded_bytes": 100}
+        with pytest.raises(DecodedSizeExceeded):
+            APIClient(**options).get(f"{self.client.endpoints['pokemon']}pikachu")
+    
+    def test_load_generator_histograms_merge(self):
+        """Test load generator intervals merge into one histogram with consistent counts"""
+        plan = {
+            "base_url": self.client.base_url,
+            "endpoints": {f"{self.client.endpoints['pokemon']}pikachu": 1},
+            "duration": 1,
+            "concurrency": 2
+        }
+        intervals = []
+        LoadGenerator(plan, seed=0).run(on_report=intervals.append, report_interval=0.25)
+        
+        merged = LatencyHistogram()
+        for interval in intervals:
+            merged.merge(LatencyHistogram.from_dict(interval["histogram"].to_dict()))
+        requests = sum(interval["requests"] for interval in intervals)
+        errors = sum(sum(interval["errors"].values()) for interval in intervals)
+        
+        assert requests > 0
+        assert merged.count == requests - errors
+        assert merged.min <= merged.percentile(50) <= merged.percentile(99) <= merged.max
+    
+    def test_multi_target_comparison(self):
+        """Test a multi-target run compares every target's latency and responses with the baseline"""
+        paths = [f"{self.client.endpoints['pokemon']}pikachu", f"{self.client.endpoints['ability']}1"]
+        targets = {"primary": self.client.base_url, "mirror": self.client.base_url + "/"}
+        run = MultiTargetRun(targets, paths, APIClient.options_from_config(self.client.config), repeat=2, workers=2)
+        report = run.run()
+        
+        assert report["baseline"] == "primary"
+        for target in report["targets"].values():
+            assert target["requests"] == len(paths) * 2
+            assert target["throughput"] > 0
+        assert set(report["endpoints"]) == {"/pokemon/{id}", "/ability/{id}"}
+        assert report["diffs"] == {}
+        
+        # A changed field is reported against the baseline by endpoint and path
+        run.results["mirror"].trees[paths[0]]["c"]["name"] = {"v": "raichu"}
+        run.results["mirror"].trees[paths[0]]["#"] = "changed"
+        report = run.report()
+        assert report["mismatches"] == {"/pokemon/{id}": {"mirror": 1}}
+        assert report["diffs"][paths[0]]["mirror"]["changes"][0]["path"] == "name"
\ No newline at end of file
@@ -1,6 +1,9 @@
 import pytest
 import json
 from pokeapi_client import PokeAPIClient
+from resource_graph import LinkResolver
+from response_retention import RetainedResponse, RetentionPolicy
+from response_snapshots import ResponseSnapshots
 from test_utils import TestUtils
 from schemas import POKEMON_SCHEMA, ABILITY_SCHEMA, POKEMON_LIST_SCHEMA
 
@@ -55,6 +58,18 @@ class TestPokemonAPI:
         response = self.client.get_pokemon(invalid_name)
         self.utils.validate_response_status(response, 404)
     
+    @pytest.mark.catalog
+    def test_catalog_pokemon_by_id(self, catalog_pokemon):
+        """Test every catalog Pokemon is retrievable by ID and matches its listing entry"""
+        response = self.client.get_pokemon(catalog_pokemon.id)
+        
+        self.utils.validate_response_status(response, 200)
+        data = self.utils.validate_json_response(response)
+        self.utils.validate_json_schema(data, POKEMON_SCHEMA)
+        
+        assert data["id"] == catalog_pokemon.id
+        assert data["name"] == catalog_pokemon.name
+    
     def test_pokemon_required_fields(self):
         """Test that Pokemon response contains all required fields"""
         response = self.client.get_pokemon("pikachu")
@@ -131,4 +146,104 @@ class TestPokemonAPI:
         evolution_data = self.utils.validate_json_response(evolution_response)
         
         assert "chain" in evolution_data
-        assert "species" in evolution_data["chain"]
\ No newline at end of file
+        assert "species" in evolution_data["chain"]
+    
+    def test_linked_resource_graph(self):
+        """Test resolving Pokemon -> species -> evolution chain in one round trip per level"""
+        response = self.client.get_pokemon("pikachu")
+        data = self.utils.validate_json_response(response)
+        
+        resolver = LinkResolver(self.client)
+        graph = resolver.resolve(data, depth=2, follow=["species", "evolution_chain"])
+        
+        assert graph.levels == 2
+        species = graph.follow("species.url")
+        assert species.status_code == 200
+        assert species.data["name"] == "pikachu"
+        chain = graph.follow("species.url", "evolution_chain.url")
+        assert "chain" in chain.data
+        
+        # A second resolve is served from the shared cache
+        assert resolver.resolve(data, depth=2, follow=["species", "evolution_chain"]).resolved == graph.resolved
+    
+    def test_linked_resource_prefetch(self):
+        """Test declared links are prefetched hop by hop and served to later fetches"""
+        response = self.client.get_pokemon("pikachu")
+        resolver = LinkResolver(self.client, prefetch_paths=["species.url", "evolution_chain.url"])
+        resolver.prefetch(response)
+        
+        _, species = resolver.fetch(response.json()["species"]["url"])
+        assert species["name"] == "pikachu"
+        _, chain = resolver.fetch(species["evolution_chain"]["url"])
+        assert "chain" in chain
+        
+        summary = resolver.prefetch_summary()
+        assert summary["issued"] == 2
+        assert summary["hits"] == 2 and summary["hit_rate"] == 100.0
+        assert resolver.pending == {}
+    
+    def test_linked_resource_cache_retention(self, tmp_path):
+        """Test the resolver cache keeps only retained responses and reads bodies back from the spill store"""
+        policy = RetentionPolicy(fields=["name"], spill_dir=str(tmp_path))
+        resolver = LinkResolver(self.client, retention=policy, prefetch_paths=["species.url"])
+        resolver.prefetch(self.client.get_pokemon("pikachu"))
+        url = self.client.get_pokemon("pikachu").json()["species"]["url"]
+        
+        response, species = resolver.fetch(url)
+        assert isinstance(response, RetainedResponse) and species["name"] == "pikachu"
+        assert resolver.pending == {}
+        cached_response, cached_data = resolver.cache[url]
+        assert cached_response is response and cached_data is None
+        
+        loaded = policy.summary()["bodies_loaded"]
+        assert resolver.fetch(url) == (response, species)
+        assert policy.summary()["bodies_loaded"] == loaded + 1
+        policy.close()
+    
+    def test_response_retention_http2(self, tmp_path):
+        """Test responses of the HTTP/2 transport can be retained"""
+        httpx = pytest.importorskip("httpx")
+        from transports import HTTP2Transport
+        body = httpx.ByteStream(json.dumps({"id": 25, "name": "pikachu"}).encode())
+        transport = HTTP2Transport(httpx_transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, headers={"Content-Type": "application/json"}, stream=body)))
+        policy = RetentionPolicy(fields=["name"], spill_dir=str(tmp_path))
+        
+        retained = policy.retain(transport.request("GET", "http://h2-stub.test/api/v2/pokemon/25", timeout=5))
+        assert retained.reason == "OK" and retained.url == "http://h2-stub.test/api/v2/pokemon/25"
+        assert retained.fields == {"name": "pikachu"} and retained.json()["id"] == 25
+        transport.close()
+        policy.close()
+    
+    def test_response_retention(self, tmp_path):
+        """Test retained responses keep a summary in memory and read the spilled body back on demand"""
+        response = self.client.get_pokemon("pikachu")
+        policy = RetentionPolicy(fields=["id", "name", "species.name"], spill_dir=str(tmp_path))
+        retained = policy.retain(response)
+        
+        assert isinstance(retained, RetainedResponse)
+        assert retained.status_code == 200 and retained.elapsed == response.elapsed
+        assert retained.decoded_bytes == len(response.content)
+        assert retained.fields == {"id": 25, "name": "pikachu", "species.name": "pikachu"}
+        assert retained.json() == response.json()
+        assert policy.retain(self.client.get_pokemon("pikachu")).digest == retained.digest
+        
+        summary = policy.summary()
+        assert summary["responses"] == 2 and summary["bodies_stored"] == 1 and summary["bodies_loaded"] == 1
+        assert policy.attach_body("failed") and policy.attach_body("passed")
+        policy.close()
+        assert not list(tmp_path.iterdir())
+    
+    def test_response_snapshot_drift(self, tmp_path):
+        """Test structural-hash snapshots detect exactly the changed paths"""
+        response = self.client.get_pokemon("pikachu")
+        data = self.utils.validate_json_response(response)
+        
+        snapshots = ResponseSnapshots(str(tmp_path))
+        assert snapshots.check("pokemon", data["id"], data) == []
+        snapshots.save_index()
+        assert ResponseSnapshots(str(tmp_path)).check("pokemon", data["id"], data) == []
+        
+        data["weight"] += 1
+        changes = snapshots.check("pokemon", data["id"], data)
+        assert [change["path"] for change in changes] == ["weight"]
\ No newline at end of file
@@ -1,7 +1,11 @@
 import json
 import jsonschema
-from typing import Dict, Any, List
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Any, List, Optional
 import logging
+import requests
 
 class TestUtils:
     @staticmethod
@@ -55,4 +59,55 @@ class TestUtils:
                 value = value[key]
             else:
                 return None
-        return value
\ No newline at end of file
+        return value
+
+
+class StubResponse(requests.Response):
+    """A requests.Response built in memory that records whether it was closed"""
+    
+    def __init__(self, status_code: int = 200, body: Any = None, url: str = ""):
+        super().__init__()
+        self.status_code = status_code
+        self._content = json.dumps(body if body is not None else {}).encode()
+        self.headers["Content-Type"] = "application/json"
+        self.url = url
+        self.elapsed = timedelta(0)
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+class StubTransport:
+    """Offline transport for APIClient: answers every request with a StubResponse.
+    
+    `delays` holds seconds to sleep for the first calls in order (later calls
+    answer at once) and `failures` exceptions to raise for the first calls.
+    """
+    
+    def __init__(self, body: Any = None, status_code: int = 200, delays: Optional[List[float]] = None,
+                 failures: Optional[List[Exception]] = None):
+        self.body = body
+        self.status_code = status_code
+        self.delays = list(delays or [])
+        self.failures = list(failures or [])
+        self.responses: List[StubResponse] = []
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def request(self, method: str, url: str, timeout: float, **kwargs):
+        with self._lock:
+            self.calls += 1
+            delay = self.delays.pop(0) if self.delays else 0
+            failure = self.failures.pop(0) if self.failures else None
+        if delay:
+            time.sleep(delay)
+        if failure:
+            raise failure
+        response = StubResponse(self.status_code, self.body, url)
+        with self._lock:
+            self.responses.append(response)
+        return response
+    
+    def close(self):
+        pass
\ No newline at end of file
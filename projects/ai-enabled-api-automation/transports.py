@@ -0,0 +1,348 @@
+import json
+import os
+import threading
+import time
+import requests
+from datetime import timedelta
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse, parse_qs, urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+from urllib3.util.retry import Retry
+from compression import DEFAULT_MAX_DECODED_BYTES, accept_encoding, decode_stream, iter_decoded
+from snapshot_store import SnapshotStore
+
+
+def _closing(response, chunks):
+    """Yield body chunks, releasing the connection when the body ends or the consumer stops"""
+    try:
+        yield from chunks
+    finally:
+        response.close()
+
+
+def _compression_headers(compression: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Request headers with the negotiated Accept-Encoding added"""
+    headers = dict(headers or {})
+    headers.setdefault("Accept-Encoding", accept_encoding(compression["encodings"]))
+    return headers
+
+
+class _BoundedWaitMixin:
+    """Waits for a free pooled connection no longer than the request's connect timeout"""
+    
+    def urlopen(self, *args, **kwargs):
+        if kwargs.get("pool_timeout") is None:
+            timeout = kwargs.get("timeout")
+            wait = getattr(timeout, "connect_timeout", timeout)
+            if isinstance(wait, (int, float)):
+                kwargs["pool_timeout"] = wait
+        return super().urlopen(*args, **kwargs)
+
+
+class _BoundedWaitHTTPConnectionPool(_BoundedWaitMixin, HTTPConnectionPool):
+    pass
+
+
+class _BoundedWaitHTTPSConnectionPool(_BoundedWaitMixin, HTTPSConnectionPool):
+    pass
+
+
+class _BoundedWaitAdapter(HTTPAdapter):
+    """HTTPAdapter whose blocking pools raise EmptyPoolError instead of waiting forever"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _BoundedWaitHTTPConnectionPool,
+                                                   "https": _BoundedWaitHTTPSConnectionPool}
+
+
+class RequestsTransport:
+    """Default HTTP/1.1 transport backed by a pooled requests.Session.
+    
+    With compression options the body is read undecoded from the socket and
+    decompressed here, so response.wire_bytes holds what crossed the wire
+    and oversized bodies are refused while they are being decoded.
+    
+    With thread_local each thread sends through its own Session, so cookies
+    and headers are never shared between threads, while all sessions mount
+    one adapter: the connection pool and its size limit stay global, and
+    threads wait for a free connection instead of opening extra ones. The
+    wait is bounded by the request's connect timeout, after which urllib3's
+    EmptyPoolError is raised, so more workers than pool_size (or a leaked
+    streamed response) cannot block a thread forever.
+    """
+    
+    name = "requests"
+    
+    def __init__(self, retry_strategy: Retry, pool_size: int = 10, compression: Optional[Dict[str, Any]] = None,
+                 thread_local: bool = False):
+        self.compression = compression
+        self.thread_local = thread_local
+        self.adapter = _BoundedWaitAdapter(max_retries=retry_strategy, pool_connections=pool_size, pool_maxsize=pool_size,
+                                   pool_block=thread_local)
+        self.sessions_created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shared_session = None if thread_local else self._new_session()
+    
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's Session (the single shared one unless thread_local)"""
+        if self._shared_session is not None:
+            return self._shared_session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+    
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        with self._lock:
+            self.sessions_created += 1
+        return session
+    
+    def request(self, method: str, url: str, timeout: float, **kwargs):
+        """Send a request and return the requests.Response"""
+        if not self.compression:
+            return self.session.request(method, url, timeout=timeout, **kwargs)
+        
+        kwargs["headers"] = _compression_headers(self.compression, kwargs.get("headers"))
+        response = self.session.request(method, url, timeout=timeout, stream=True, **kwargs)
+        try:
+            body, wire_bytes = decode_stream(response.raw.stream(65536, decode_content=False),
+                                             response.headers.get("Content-Encoding"),
+                                             self.compression.get("max_decoded_bytes", DEFAULT_MAX_DECODED_BYTES))
+        except Exception:
+            response.close()
+            raise
+        response._content = body
+        response._content_consumed = True
+        response.wire_bytes = wire_bytes
+        response.close()
+        return response
+    
+    def stream(self, method: str, url: str, timeout: float, **kwargs):
+        """Send a request and return the response with an iterator over its decoded body chunks"""
+        if self.compression:
+            kwargs["headers"] = _compression_headers(self.compression, kwargs.get("headers"))
+        response = self.session.request(method, url, timeout=timeout, stream=True, **kwargs)
+        if not self.compression:
+            return response, _closing(response, response.raw.stream(65536, decode_content=True))
+        return response, iter_decoded(response, response.raw.stream(65536, decode_content=False),
+                                      self.compression.get("max_decoded_bytes", DEFAULT_MAX_DECODED_BYTES))
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.adapter.close()
+
+
+class _RetryResponse:
+    """The parts of a urllib3 response that Retry reads, over an httpx.Response"""
+    
+    def __init__(self, response):
+        self.status = response.status_code
+        self.headers = response.headers
+    
+    def get_redirect_location(self):
+        return False
+
+
+class HTTP2Transport:
+    """HTTP/2 transport that multiplexes concurrent requests over a few connections.
+    
+    Uses httpx with the h2 extra. Servers that do not negotiate HTTP/2 via ALPN
+    are spoken to over HTTP/1.1. Transport errors are re-raised as their
+    requests equivalents. Failed connections are retried by httpx; read errors
+    and statuses in the retry strategy's status_forcelist (429, 5xx) are
+    retried here with the same urllib3 Retry the requests transport mounts,
+    including its backoff, Retry-After handling and deadline checks, and an
+    exhausted status retry raises requests.exceptions.RetryError as requests
+    does.
+    """
+    
+    name = "http2"
+    
+    def __init__(self, retry_count: int = 3, max_connections: int = 4, compression: Optional[Dict[str, Any]] = None,
+                 retry: Optional[Retry] = None, httpx_transport=None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HTTP/2 transport requires httpx with h2: pip install 'httpx[http2]'")
+        
+        self._httpx = httpx
+        self.compression = compression
+        self.retry = retry or Retry(total=retry_count, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=httpx_transport or httpx.HTTPTransport(http2=True, retries=retry_count)
+        )
+    
+    def _headers(self, headers: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+        return _compression_headers(self.compression, headers) if self.compression else headers
+    
+    def _send(self, method: str, url: str, build, stream: bool):
+        """Send build()'s request, retrying retryable statuses under the retry strategy"""
+        retry = self.retry
+        while True:
+            try:
+                response = self.client.send(build(), stream=stream)
+            except (self._httpx.ReadTimeout, self._httpx.ReadError, self._httpx.RemoteProtocolError) as e:
+                # Reads that fail after the request went out are retried for idempotent methods, as urllib3 does
+                error = ReadTimeoutError(None, url, str(e)) if isinstance(e, self._httpx.ReadTimeout) else ProtocolError(str(e))
+                try:
+                    retry = retry.increment(method, url, error=error)
+                except (MaxRetryError, ProtocolError, ReadTimeoutError):
+                    if isinstance(e, self._httpx.TimeoutException):
+                        raise requests.exceptions.Timeout(str(e)) from e
+                    raise requests.exceptions.ConnectionError(str(e)) from e
+                retry.sleep()
+                continue
+            except self._httpx.TimeoutException as e:
+                raise requests.exceptions.Timeout(str(e)) from e
+            except self._httpx.TransportError as e:
+                raise requests.exceptions.ConnectionError(str(e)) from e
+            if not retry.is_retry(method, response.status_code, "Retry-After" in response.headers):
+                return response
+            try:
+                retry = retry.increment(method, url, response=_RetryResponse(response))
+            except MaxRetryError as e:
+                if retry.raise_on_status:
+                    response.close()
+                    raise requests.exceptions.RetryError(e) from e
+                return response
+            response.close()
+            retry.sleep(_RetryResponse(response))
+    
+    def request(self, method: str, url: str, timeout: float, params: Optional[Dict] = None,
+                data: Optional[Any] = None, json: Optional[Any] = None, headers: Optional[Dict[str, str]] = None,
+                **kwargs):
+        """Send a request and return the httpx.Response"""
+        headers = self._headers(headers)
+        
+        def build():
+            return self.client.build_request(method, url, params=params, data=data, json=json,
+                                             headers=headers, timeout=timeout)
+        if not self.compression:
+            return self._send(method, url, build, stream=False)
+        
+        response = self._send(method, url, build, stream=True)
+        try:
+            body, wire_bytes = decode_stream(self._translated(response.iter_raw()), response.headers.get("Content-Encoding"),
+                                             self.compression.get("max_decoded_bytes", DEFAULT_MAX_DECODED_BYTES))
+        finally:
+            response.close()
+        response._content = body
+        response.wire_bytes = wire_bytes
+        return response
+    
+    def stream(self, method: str, url: str, timeout: float, params: Optional[Dict] = None,
+               headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Send a request and return the httpx.Response with an iterator over its decoded body chunks"""
+        headers = self._headers(headers)
+        response = self._send(method, url, lambda: self.client.build_request(
+            method, url, params=params, headers=headers, timeout=timeout), stream=True)
+        if not self.compression:
+            return response, self._translated(_closing(response, response.iter_bytes()))
+        return response, self._translated(iter_decoded(response, response.iter_raw(),
+                                                       self.compression.get("max_decoded_bytes", DEFAULT_MAX_DECODED_BYTES)))
+    
+    def _translated(self, chunks):
+        """Re-raise httpx errors met while reading a streamed body as their requests equivalents"""
+        try:
+            yield from chunks
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+    
+    def close(self):
+        """Close all multiplexed connections"""
+        self.client.close()
+
+
+class SnapshotTransport:
+    """Serves GETs from a local SnapshotStore instead of the network.
+    
+    Resource URLs (``.../<resource>/<id or name>/``) are looked up by key and
+    listing URLs (``.../<resource>/?limit=&offset=``) are paged from the store,
+    so suites run unchanged against an offline copy of the API.
+    """
+    
+    name = "snapshot"
+    
+    def __init__(self, path: str = "data/snapshot.sqlite"):
+        # Opening a missing path would silently create an empty store that answers 404 to everything
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No snapshot at {path}; create one with 'python3 snapshot_tool.py crawl'")
+        self.store = SnapshotStore(path)
+        self.resources = set(self.store.counts())
+    
+    def request(self, method: str, url: str, timeout: float, params: Optional[Dict] = None, **kwargs):
+        """Answer a request from the store with a requests.Response"""
+        start_time = time.perf_counter()
+        parsed = urlparse(url)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        query.update({key: str(value) for key, value in (params or {}).items()})
+        segments = [segment for segment in parsed.path.split("/") if segment]
+        
+        status, body = 404, {"detail": "Not found"}
+        if method != "GET":
+            status, body = 405, {"detail": f"{method} is not supported by the snapshot transport"}
+        elif len(segments) >= 2 and segments[-2] in self.resources:
+            raw = self.store.get(segments[-2], segments[-1])
+            if raw is not None:
+                status, body = 200, raw
+        elif segments and segments[-1] in self.resources:
+            status, body = 200, self._listing(parsed, segments[-1], query)
+        
+        response = requests.Response()
+        response.status_code = status
+        response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        response.headers["Content-Type"] = "application/json; charset=utf-8"
+        response.encoding = "utf-8"
+        response.url = f"{url}?{urlencode(params)}" if params else url
+        response.reason = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+        response.elapsed = timedelta(seconds=time.perf_counter() - start_time)
+        return response
+    
+    def _listing(self, parsed, resource: str, query: Dict[str, str]) -> Dict[str, Any]:
+        """Build a paginated listing payload like the live API returns"""
+        limit = int(query.get("limit", 20))
+        offset = int(query.get("offset", 0))
+        total, rows = self.store.page(resource, limit, offset)
+        base = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rstrip('/')}/"
+        return {
+            "count": total,
+            "next": f"{base}?offset={offset + limit}&limit={limit}" if offset + limit < total else None,
+            "previous": f"{base}?offset={max(0, offset - limit)}&limit={limit}" if offset > 0 else None,
+            "results": [{"name": name, "url": f"{base}{resource_id}/"} for resource_id, name in rows]
+        }
+    
+    def close(self):
+        self.store.close()
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    HTTP2Transport.name: HTTP2Transport,
+    SnapshotTransport.name: SnapshotTransport
+}
+
+
+def build_transport(name: str, retry_strategy: Retry, compression: Optional[Dict[str, Any]] = None,
+                    thread_local: bool = False, **options):
+    """Create a transport by name from config.json"""
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{name}', expected one of {sorted(TRANSPORTS)}")
+    if name == HTTP2Transport.name:
+        return HTTP2Transport(retry_count=retry_strategy.total, compression=compression, retry=retry_strategy, **options)
+    if name == SnapshotTransport.name:
+        return SnapshotTransport(**options)
+    # Only requests.Session needs one instance per thread; an httpx.Client is shared safely and the
+    # snapshot store serializes every use of its SQLite connection behind its own lock
+    return RequestsTransport(retry_strategy, compression=compression, thread_local=thread_local, **options)
\ No newline at end of file
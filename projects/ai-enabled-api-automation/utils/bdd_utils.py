@@ -1,7 +1,8 @@
 import json
 import jsonschema
 import logging
-from typing import Dict, Any, List, Optional
+import os
+from typing import Dict, Any, List, Optional, Tuple
 from requests import Response
 
 class BDDUtils:
@@ -62,4 +63,51 @@ class BDDUtils:
         self.logger.info(f"Endpoint: {endpoint}")
         self.logger.info(f"Status Code: {response.status_code}")
         self.logger.info(f"Response Time: {response.elapsed.total_seconds():.2f}s")
-        self.logger.info(f"Response Size: {len(response.content)} bytes")
\ No newline at end of file
+        for line in self.describe_size(response):
+            self.logger.info(line)
+    
+    @staticmethod
+    def decoded_size(response: Response) -> int:
+        """Decoded body size without reading a body that is streamed or spilled to disk"""
+        decoded_bytes = getattr(response, "decoded_bytes", None)
+        return len(response.content) if decoded_bytes is None else decoded_bytes
+    
+    @staticmethod
+    def describe_size(response: Response) -> List[str]:
+        """Decoded body size and, when the client measured it, what crossed the wire"""
+        # Streamed bodies are parsed as they arrive and not kept; the stream counts their size
+        decoded_bytes = BDDUtils.decoded_size(response)
+        lines = [f"Response Size: {decoded_bytes} bytes" + (" (streamed)" if getattr(response, "streamed", False) else "")]
+        wire_bytes = getattr(response, "wire_bytes", None)
+        if wire_bytes is not None:
+            encoding = response.headers.get("Content-Encoding") or "identity"
+            ratio = f", {decoded_bytes / wire_bytes:.1f}x" if wire_bytes else ""
+            lines.append(f"Wire Size: {wire_bytes} bytes ({encoding}{ratio})")
+        return lines
+    
+    @staticmethod
+    def build_response_attachments(response: Response, include_body: bool = True) -> List[Tuple[str, str, str]]:
+        """Build the (body, name, type) report attachments for a response"""
+        attachments = [(
+            f"Status Code: {response.status_code}\n"
+            f"Response Time: {response.elapsed.total_seconds():.3f}s\n" +
+            "\n".join(BDDUtils.describe_size(response)),
+            "API Response Details",
+            "text"
+        )]
+        
+        # Attach response body if it's JSON
+        if not include_body or getattr(response, "streamed", False):
+            return attachments
+        try:
+            attachments.append((json.dumps(response.json(), indent=2), "Response Body", "json"))
+        except ValueError:
+            attachments.append((response.text, "Response Body", "text"))
+        return attachments
+    
+    @staticmethod
+    def save_metrics(metrics: Dict[str, Any], metrics_file: str = "reports/test_metrics.json"):
+        """Save collected test metrics for report generation"""
+        os.makedirs(os.path.dirname(metrics_file) or ".", exist_ok=True)
+        with open(metrics_file, 'w') as f:
+            json.dump(metrics, f, indent=2)
\ No newline at end of file
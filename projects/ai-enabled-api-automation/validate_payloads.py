@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Bulk Schema Validation
+Validates thousands of crawled payloads against schemas.py across all cores
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from bulk_validation import (BulkValidationReport, validate_payloads, payloads_from_jsonl,
+                             payloads_from_directory, payloads_from_snapshot, payloads_from_client)
+from schemas import SCHEMAS
+
+def build_source(args, report):
+    """Create the payload stream selected on the command line"""
+    if args.snapshot:
+        from snapshot_store import SnapshotStore
+        return payloads_from_snapshot(SnapshotStore(args.snapshot), [args.schema] if args.schema else None)
+    if args.jsonl:
+        return payloads_from_jsonl(args.jsonl, args.schema)
+    if args.directory:
+        return payloads_from_directory(args.directory, args.schema)
+    
+    from catalog import catalog_cases
+    from pokeapi_client import PokeAPIClient
+    client = PokeAPIClient()
+    entries = catalog_cases(client, client.config, max_cases=args.max_cases)
+    return payloads_from_client(client, entries, args.schema, report)
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate payloads in bulk against JSON schemas")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--snapshot", help="Validate every resource in a snapshot database")
+    source.add_argument("--jsonl", help="Validate a JSON-lines file, one payload per line")
+    source.add_argument("--directory", help="Validate every *.json file in a directory")
+    source.add_argument("--from-api", action="store_true", help="Fetch catalog payloads from the API (default)")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), help="Schema for file and API sources")
+    parser.add_argument("--max-cases", type=int, help="Catalog payloads to fetch with --from-api (0 for all)")
+    parser.add_argument("--workers", type=int, help="Validation processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Payloads per worker task")
+    parser.add_argument("--output", default="reports/schema_validation.json", help="JSON report file")
+    
+    args = parser.parse_args()
+    if not args.snapshot and not args.schema:
+        parser.error("--schema is required unless validating a snapshot")
+    
+    start_time = time.time()
+    report = BulkValidationReport()
+    validate_payloads(build_source(args, report), workers=args.workers, chunk_size=args.chunk_size, report=report)
+    elapsed = time.time() - start_time
+    
+    result = report.to_dict()
+    print(f"🔍 Validated {result['validated']:,} payloads in {elapsed:.1f}s "
+          f"({result['validated'] / max(elapsed, 1e-9):,.0f}/s)")
+    if report.passed:
+        print("✅ All payloads match their schemas")
+    else:
+        print(f"❌ {result['invalid_payloads']:,} invalid payloads")
+        for group in result["errors"]:
+            print(f"   {group['count']:>7,}  {group['schema']}: {group['schema_path']}")
+            print(f"            e.g. {group['examples'][0]['payload']}: {group['examples'][0]['message']}")
+        for group in result["fetch_errors"]:
+            print(f"   {group['count']:>7,}  not fetched: HTTP {group['status']} (e.g. {group['examples'][0]})")
+    
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"📁 Report saved to {args.output}")
+    return 0 if report.passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -88,6 +88,20 @@ def open_static_report():
         print(f"📁 Manual path: {abs_path}")
         return False
 
+def open_native_report():
+    """Build the pure-Python report (no Allure CLI needed) and open it in browser"""
+    if not os.path.exists("reports/allure-results"):
+        print("❌ No Allure results found!")
+        print("💡 Run tests first: python3 run_bdd_tests.py --suite smoke")
+        return False
+    
+    from native_report import build_report
+    print("📊 Building native HTML report...")
+    report_path = build_report()
+    print(f"🌐 Opening native report: {report_path}")
+    webbrowser.open(f"file://{os.path.abspath(report_path)}")
+    return True
+
 def list_available_results():
     """List available Allure results"""
     results_dir = "reports/allure-results"
@@ -126,6 +140,8 @@ def main():
         elif command == "--open":
             if check_allure_installation():
                 open_static_report()
+        elif command == "--native":
+            open_native_report()
         elif command == "--list":
             list_available_results()
         elif command == "--help":
@@ -133,6 +149,7 @@ def main():
             print("   --serve     Start Allure server (recommended)")
             print("   --generate  Generate static HTML report")
             print("   --open      Open static report in browser")
+            print("   --native    Build and open the native report (no Allure CLI needed)")
             print("   --list      List available result files")
             print("   --help      Show this help message")
         else:
@@ -143,7 +160,7 @@ def main():
         if check_allure_installation():
             serve_allure_report()
         else:
-            list_available_results()
+            open_native_report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file